@@ -4,8 +4,27 @@ API Structure Builder v3 - Modular version with bug fixes
 Builds API structure with nested support using separate modules
 """
 
+import sys
 import json
+import logging
+import functools
 from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import cysimdjson
+except ImportError:
+    cysimdjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
 
 # Import modules
 from utils.path_utils import PathUtils
@@ -14,6 +33,130 @@ from parsers.rules_extractor import RulesExtractor
 from parsers.nested_builder import NestedSchemaBuilder
 from parsers.trait_rules import TraitRules
 
+log = logging.getLogger('astparser')
+
+
+if msgspec is not None:
+    # Output schema of api_structure.json - checked on save, encoded in C
+    class PathParameter(msgspec.Struct):
+        """Path parameter of an endpoint"""
+        type: str
+        required: bool
+        in_: str = msgspec.field(name='in')
+        description: str
+
+    class EndpointRequest(msgspec.Struct, omit_defaults=True):
+        """Request part of an endpoint - only the keys that were set"""
+        query_parameters: Optional[dict] = None
+        request_class: Optional[str] = None
+        path_parameters: Optional[Dict[str, PathParameter]] = None
+
+    class Endpoint(msgspec.Struct):
+        """Single API endpoint"""
+        path: str
+        method: str
+        controller: str
+        action: str
+        description: str
+        request: EndpointRequest
+
+    class APIStructure(msgspec.Struct):
+        """Root of api_structure.json"""
+        endpoints: List[Endpoint]
+
+
+# Nodes that can contain a class declaration - statement bodies are never entered
+CLASS_CONTAINER_TYPES = {'program', 'namespace_definition', 'compound_statement'}
+
+
+def find_class_node(ast_node):
+    """
+    Find first class_declaration in AST
+
+    Walks only program/namespace structure and stops at the first match.
+    """
+    stack = [ast_node]
+    while stack:
+        node = stack.pop()
+        node_type = node.get('type')
+        if node_type == 'class_declaration':
+            return node
+        if node_type in CLASS_CONTAINER_TYPES:
+            stack.extend(reversed(node.get('children', [])))
+    return None
+
+
+def find_class_method(class_node, method_name):
+    """
+    Find method_declaration by name among class members
+
+    Looks only at declaration_list children - method bodies are never walked.
+    """
+    for child in class_node.get('children', []):
+        if child.get('type') != 'declaration_list':
+            continue
+        for member in child.get('children', []):
+            if member.get('type') != 'method_declaration':
+                continue
+            for part in member.get('children', []):
+                if part.get('type') == 'name':
+                    if part.get('text') == method_name:
+                        return member
+                    break
+    return None
+
+
+@functools.lru_cache(maxsize=512)
+def load_request_ast(ast_file_path):
+    """
+    Load a Request AST file and locate its class and rules() nodes - once per file
+
+    Requests shared by several controllers (or pulled in via traits) hit
+    the cache instead of re-reading and re-walking the same JSON.
+
+    Args:
+        ast_file_path: Absolute path to AST file (str, used as cache key)
+
+    Returns:
+        tuple: (class_node, rules_method), or None if the AST can't be loaded
+    """
+    ast_data = ASTReader.load_ast_file(Path(ast_file_path))
+    if not ast_data:
+        return None
+
+    class_node = find_class_node(ast_data['ast'])
+    rules_method = find_class_method(class_node, 'rules') if class_node else None
+    return class_node, rules_method
+
+
+class LazyIndexSections(dict):
+    """
+    'index' section of api_index.json parsed with cysimdjson
+
+    Each sub-section (controllers, requests, enums, ...) is converted to
+    Python objects on first access; untouched sections stay in the simdjson buffer.
+    """
+
+    def __init__(self, element):
+        super().__init__()
+        self._element = element
+
+    def __missing__(self, key):
+        try:
+            value = self._element.at_pointer(f'/{key}')
+        except Exception:
+            raise KeyError(key)
+        if hasattr(value, 'export'):
+            value = value.export()
+        self[key] = value
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
 
 class APIStructureBuilderV3:
     """Build API structure from api_index.json with nested structures support"""
@@ -22,6 +165,10 @@ class APIStructureBuilderV3:
         self.api_index_file = Path(api_index_file)
         self.ast_dir = self.api_index_file.parent / 'AST'
         self.api_index = None
+        self._json_parser = None
+        self._controllers = {}
+        self._requests = {}
+        self._rules_cache = {}
         self.api_structure = {
             'endpoints': []
         }
@@ -29,8 +176,35 @@ class APIStructureBuilderV3:
     def load_api_index(self):
         """Load api_index.json"""
         print(f"Loading API index: {self.api_index_file}")
-        with open(self.api_index_file, 'r', encoding='utf-8') as f:
-            self.api_index = json.load(f)
+        if cysimdjson is not None:
+            # Keep parser alive - parsed document references its buffer
+            self._json_parser = cysimdjson.JSONParser()
+            with open(self.api_index_file, 'rb') as f:
+                doc = self._json_parser.parse(f.read())
+            # Missing sections read as {} - same as .get(..., {}) on a fully parsed index
+            try:
+                statistics = doc.at_pointer('/statistics').export()
+            except KeyError:
+                statistics = {}
+            try:
+                index = LazyIndexSections(doc.at_pointer('/index'))
+            except KeyError:
+                index = {}
+            self.api_index = {
+                'statistics': statistics,
+                'index': index
+            }
+        elif orjson is not None:
+            with open(self.api_index_file, 'rb') as f:
+                self.api_index = orjson.loads(f.read())
+        else:
+            with open(self.api_index_file, 'r', encoding='utf-8') as f:
+                self.api_index = json.load(f)
+
+        # Snapshot hot sections once - avoids chained lookups per endpoint
+        index = self.api_index.get('index', {})
+        self._controllers = index.get('controllers', {})
+        self._requests = index.get('requests', {})
 
         stats = self.api_index.get('statistics', {})
         print(f"  Controllers: {stats.get('controllers', 0)}")
@@ -55,11 +229,27 @@ class APIStructureBuilderV3:
         if not request_class_name:
             return {}
 
-        requests = self.api_index['index'].get('requests', {})
-        if request_class_name not in requests:
+        # Many endpoints share one Request class - extract its rules once
+        cached = self._rules_cache.get(request_class_name)
+        if cached is not None:
+            return cached
+
+        rules = self._extract_validation_rules(request_class_name)
+        self._rules_cache[request_class_name] = rules
+        return rules
+
+    def _extract_validation_rules(self, request_class_name):
+        """Uncached part of parse_validation_rules_from_ast"""
+        request_info = self._requests.get(request_class_name)
+        if request_info is None:
             return {}
 
-        request_info = requests[request_class_name]
+        # Fast path: rules() AST stored in api_index, no traits to resolve
+        rules_ast = request_info.get('rules_ast')
+        if rules_ast and not request_info.get('traits'):
+            rules_dict = RulesExtractor.extract_rules_from_method(rules_ast, ASTReader)
+            log.debug("      Found %d validation rules from api_index", len(rules_dict))
+            return rules_dict
 
         # FIX: Normalize path (handles both AST/ and AST\\ prefixes)
         ast_file_path = PathUtils.normalize_ast_file_path(
@@ -68,43 +258,39 @@ class APIStructureBuilderV3:
         )
 
         if not ast_file_path.exists():
-            print(f"      [WARNING] AST file not found: {ast_file_path}")
+            log.warning("      [WARNING] AST file not found: %s", ast_file_path)
             return {}
 
-        print(f"      Reading AST: {ast_file_path.name}")
+        log.debug("      Reading AST: %s", ast_file_path.name)
 
-        # Load AST file
-        ast_data = ASTReader.load_ast_file(ast_file_path)
-        if not ast_data:
+        # Load AST file (cached per file) with class_declaration and rules() nodes
+        loaded = load_request_ast(str(ast_file_path.resolve()))
+        if not loaded:
             return {}
 
-        # Find class_declaration in AST
-        class_node = ASTReader.find_node_by_type(ast_data['ast'], 'class_declaration')
+        class_node, rules_method = loaded
 
         # Extract trait rules
         trait_rules = {}
         if class_node:
             trait_rules = TraitRules.extract_all_trait_rules(class_node, ASTReader)
             if trait_rules:
-                print(f"      Found {len(trait_rules)} rules from traits")
-
-        # Find rules() method in AST
-        rules_method = ASTReader.find_method_by_name(ast_data['ast'], 'rules')
+                log.debug("      Found %d rules from traits", len(trait_rules))
 
         if not rules_method:
-            print(f"      [WARNING] rules() method not found in AST")
+            log.warning("      [WARNING] rules() method not found in AST")
             # Return only trait rules if no rules() method
             return trait_rules
 
         # Extract rules from method (supports array_merge)
         rules_dict = RulesExtractor.extract_rules_from_method(rules_method, ASTReader)
 
-        print(f"      Found {len(rules_dict)} validation rules from rules() method")
+        log.debug("      Found %d validation rules from rules() method", len(rules_dict))
 
         # Merge trait rules with method rules (method rules override trait rules)
         combined_rules = {**trait_rules, **rules_dict}
 
-        print(f"      Total rules: {len(combined_rules)}")
+        log.debug("      Total rules: %d", len(combined_rules))
 
         return combined_rules
 
@@ -115,14 +301,12 @@ class APIStructureBuilderV3:
         print("=" * 80)
         print()
 
-        controllers = self.api_index['index'].get('controllers', {})
-
-        for controller_name, controller_info in controllers.items():
-            print(f"Processing: {controller_name}")
+        for controller_name, controller_info in self._controllers.items():
+            log.debug("Processing: %s", controller_name)
 
             # Generate path from controller name
             base_path = PathUtils.controller_to_path(controller_name)
-            print(f"  Base path: /{base_path}")
+            log.debug("  Base path: /%s", base_path)
 
             methods = controller_info.get('methods', {})
 
@@ -135,7 +319,7 @@ class APIStructureBuilderV3:
                     method_info
                 )
                 self.api_structure['endpoints'].append(endpoint)
-                print(f"    ✓ GET /{base_path}")
+                log.debug("    ✓ GET /%s", base_path)
 
             # Process show method (GET /resource/{id})
             if 'show' in methods:
@@ -146,9 +330,9 @@ class APIStructureBuilderV3:
                     method_info
                 )
                 self.api_structure['endpoints'].append(endpoint)
-                print(f"    ✓ GET /{base_path}/{{id}}")
+                log.debug("    ✓ GET /%s/{id}", base_path)
 
-            print()
+            log.debug("")
 
     def build_index_endpoint(self, controller_name, base_path, method_info):
         """Build index endpoint with nested structure support"""
@@ -163,7 +347,7 @@ class APIStructureBuilderV3:
         # Parse validation rules from AST
         rules_dict = {}
         if request_class:
-            print(f"      Request class: {request_class}")
+            log.debug("      Request class: %s", request_class)
             rules_dict = self.parse_validation_rules_from_ast(request_class)
 
         # Build nested schema from rules with enum resolution
@@ -215,8 +399,18 @@ class APIStructureBuilderV3:
         print(f"Total GET endpoints: {len(self.api_structure['endpoints'])}")
         print("=" * 80)
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.api_structure, f, indent=2, ensure_ascii=False)
+        if msgspec is not None:
+            # Validate endpoint shape against the Structs, then encode
+            structure = msgspec.convert(self.api_structure, APIStructure)
+            output_file.write_bytes(
+                msgspec.json.format(msgspec.json.encode(structure), indent=2)
+            )
+        elif orjson is not None:
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(self.api_structure, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(self.api_structure, f, indent=2, ensure_ascii=False)
 
         print(f"\n✓ Saved to: {output_file}")
 
@@ -244,6 +438,14 @@ class APIStructureBuilderV3:
 
 
 def main():
+    # -v / --verbose - per-controller and per-request details
+    verbose = any(arg in ('-v', '--verbose') for arg in sys.argv[1:])
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        format='%(message)s',
+        stream=sys.stdout
+    )
+
     script_dir = Path(__file__).parent
     api_index_file = script_dir / 'api_index.json'
 
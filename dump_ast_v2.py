@@ -7,102 +7,154 @@ AST Dump v2 - Generic tree-sitter to JSON converter
 from pathlib import Path
 from tree_sitter import Language, Parser, Node
 import tree_sitter_php
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import logging
+import os
+import re
 import sys
 import json
+from sys import intern
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+log = logging.getLogger('astparser')
 
 # Ініціалізація парсера
 PHP_LANGUAGE = Language(tree_sitter_php.language_php())
 parser = Parser(PHP_LANGUAGE)
 
+# --api-only: підкаталоги app/, з яких linker-и беруть controllers/requests/resources/transformers
+API_PATH_PARTS = {'Http', 'Transformers'}
+# 'use ...;' на початку рядка (trait use в класах має відступ): App\X, App\X as Y, App\X\{A, B as C}, A, B
+USE_RE = re.compile(rb'^use\s+([^;]+);', re.MULTILINE)
+USE_ITEM_RE = re.compile(r'\\?([\w\\]+)(?:\s+as\s+\w+)?')
 
-def node_to_dict_with_cursor(cursor, code: bytes) -> dict:
-    """
-    ПОВНА конвертація через TreeCursor - отримує ВСІ ноди (named + unnamed)
-    """
-    node = cursor.node
-
-    result = {
-        'type': node.type,
-        'start_line': node.start_point[0] + 1,
-        'end_line': node.end_point[0] + 1,
-        'start_byte': node.start_byte,
-        'end_byte': node.end_byte,
-        'is_named': node.is_named,
-    }
-
-    # Додати текст
-    text = code[node.start_byte:node.end_byte].decode('utf-8', errors='ignore')
-    if len(text) <= 500:
-        result['text'] = text
-    else:
-        result['text_preview'] = text[:200] + '...'
-        result['text_length'] = len(text)
-
-    # Використовувати cursor для отримання ВСІХ дітей
-    if cursor.goto_first_child():
-        children = []
-
-        while True:
-            child_dict = node_to_dict_with_cursor(cursor, code)
-
-            # Додати field name через node
-            field_name = cursor.field_name
-            if field_name:
-                child_dict['field'] = field_name
-
-            children.append(child_dict)
-
-            if not cursor.goto_next_sibling():
-                break
+# Довші ноди гарантовано мають > 500 символів (UTF-8 - до 4 байт на символ)
+TEXT_MAX_BYTES_DECODE = 2000
 
-        cursor.goto_parent()
-        result['children'] = children
-
-    return result
 
+def node_to_dict_with_cursor(cursor, code: bytes, full: bool = False) -> dict:
+    """
+    ПОВНА конвертація через TreeCursor - отримує ВСІ ноди (named + unnamed)
+    Ітеративно: стек батьківських dict замість рекурсії на кожну ноду
 
-def node_to_dict(node: Node, code: bytes) -> dict:
+    full=False - тільки поля, які читають linker-и (type, start_line, is_named, text, field);
+    full=True - також end_line, start_byte, end_byte
+    """
+    top = {'children': []}
+    stack = [top]
+
+    # Локальні посилання на методи - без пошуку атрибутів на кожній ноді
+    goto_first_child = cursor.goto_first_child
+    goto_next_sibling = cursor.goto_next_sibling
+    goto_parent = cursor.goto_parent
+    push = stack.append
+    pop = stack.pop
+
+    while True:
+        node = cursor.node
+
+        start_byte = node.start_byte
+        end_byte = node.end_byte
+
+        result = {
+            'type': intern(node.type),
+            'start_line': node.start_point[0] + 1,
+            'is_named': node.is_named,
+        }
+        if full:
+            result['end_line'] = node.end_point[0] + 1
+            result['start_byte'] = start_byte
+            result['end_byte'] = end_byte
+
+        # Додати текст - декодувати тільки те, що зберігається
+        span = end_byte - start_byte
+        text = None
+        if span <= TEXT_MAX_BYTES_DECODE:
+            text = code[start_byte:end_byte].decode('utf-8', errors='ignore')
+        if text is not None and len(text) <= 500:
+            result['text'] = text
+        else:
+            # 200 символів UTF-8 займають не більше 800 байт
+            preview = code[start_byte:min(end_byte, start_byte + 800)].decode('utf-8', errors='ignore')
+            result['text_preview'] = preview[:200] + '...'
+            result['text_length'] = span
+
+        # Додати field name через cursor (type/field - кілька десятків значень на весь AST → intern)
+        field_name = cursor.field_name
+        if field_name:
+            result['field'] = intern(field_name)
+
+        stack[-1]['children'].append(result)
+
+        # Спуститись до першої дитини
+        if goto_first_child():
+            result['children'] = []
+            push(result)
+            continue
+
+        if len(stack) == 1:
+            break
+
+        # Перейти до наступного сусіда, піднімаючись вгору поки його немає
+        while not goto_next_sibling():
+            goto_parent()
+            pop()
+            if len(stack) == 1:
+                return top['children'][0]
+
+    return top['children'][0]
+
+
+def node_to_dict(node: Node, code: bytes, full: bool = False) -> dict:
     """Wrapper для node_to_dict_with_cursor"""
     cursor = node.walk()
-    return node_to_dict_with_cursor(cursor, code)
+    return node_to_dict_with_cursor(cursor, code, full)
 
 
 def extract_specific_nodes(root_dict: dict, node_types: list) -> list:
     """
     Знайти всі ноди певного типу в дереві
-    Рекурсивний пошук по dict структурі
+    Ітеративний обхід по 'children' (в порядку документа)
     """
+    wanted = set(node_types)
     results = []
 
-    if isinstance(root_dict, dict):
-        if root_dict.get('type') in node_types:
-            results.append(root_dict)
+    stack = list(reversed(root_dict)) if isinstance(root_dict, list) else [root_dict]
+    pop = stack.pop
+    extend = stack.extend
+    append = results.append
 
-        # Рекурсивно по дітях
-        for child in root_dict.get('children', []):
-            results.extend(extract_specific_nodes(child, node_types))
+    while stack:
+        node = pop()
+        if not isinstance(node, dict):
+            continue
 
-        # Рекурсивно по полях
-        for field_value in root_dict.get('fields', {}).values():
-            results.extend(extract_specific_nodes(field_value, node_types))
+        if node.get('type') in wanted:
+            append(node)
 
-    elif isinstance(root_dict, list):
-        for item in root_dict:
-            results.extend(extract_specific_nodes(item, node_types))
+        children = node.get('children')
+        if children:
+            extend(reversed(children))
 
     return results
 
 
 def process_file(file_path: Path, full_ast: bool = False) -> dict:
     """Обробити один PHP файл - конвертувати AST в JSON"""
-    with open(file_path, 'rb') as f:
+    # Без Python-буферизації: весь файл читається одним read()
+    with open(os.fspath(file_path), 'rb', buffering=0) as f:
         code = f.read()
 
     tree = parser.parse(code)
 
     # Generic конвертація AST → dict - БЕЗ ЖОДНИХ ФІЛЬТРІВ
-    ast_dict = node_to_dict(tree.root_node, code)
+    ast_dict = node_to_dict(tree.root_node, code, full=full_ast)
 
     # Просто зберегти AST і все
     return {
@@ -111,12 +163,108 @@ def process_file(file_path: Path, full_ast: bool = False) -> dict:
     }
 
 
+def _init_worker():
+    """Ініціалізація воркера - кожен процес має власний Parser"""
+    global parser
+    parser = Parser(PHP_LANGUAGE)
+
+
+def _process_file_safe(file_path: Path, full_ast: bool = False) -> tuple:
+    """process_file для воркера: помилка повертається, а не зупиняє весь map"""
+    try:
+        return process_file(file_path, full_ast), None
+    except Exception as e:
+        return None, str(e)
+
+
+def use_app_names(code: bytes) -> list:
+    """
+    Імена класів App\\... з 'use' рядків файлу, без App\\ на початку
+    Аліаси (as Y) відкидаються, групові імпорти (App\\X\\{A, B}) розгортаються; use function/const пропускаються
+    """
+    names = []
+    for match in USE_RE.finditer(code):
+        body = match.group(1).decode('utf-8', errors='ignore')
+        if body.startswith(('function ', 'const ')):
+            continue
+        prefix, brace, group = body.partition('{')
+        if brace:
+            prefix = prefix.strip()
+            items = [prefix + item.strip() for item in group.rstrip().rstrip('}').split(',') if item.strip()]
+        else:
+            items = body.split(',')
+        for item in items:
+            item_match = USE_ITEM_RE.fullmatch(item.strip())
+            if item_match and item_match.group(1).startswith('App\\'):
+                names.append(item_match.group(1)[4:])
+    return names
+
+
+def select_api_files(app_dir: Path, php_files: list) -> list:
+    """
+    Відібрати файли для --api-only без парсингу:
+    app/**/Http/**, app/**/Transformers/** + все, на що вони посилаються через 'use App\\...;'
+    """
+    all_files = set(php_files)
+    selected = {p for p in php_files if API_PATH_PARTS.intersection(p.relative_to(app_dir).parts)}
+    queue = list(selected)
+
+    while queue:
+        try:
+            code = queue.pop().read_bytes()
+        except OSError:
+            continue
+
+        for name in use_app_names(code):
+            parts = name.split('\\')
+            dep_file = app_dir.joinpath(*parts[:-1], parts[-1] + '.php')
+            if dep_file in all_files and dep_file not in selected:
+                selected.add(dep_file)
+                queue.append(dep_file)
+
+    # Зберегти початковий порядок файлів
+    return [p for p in php_files if p in selected]
+
+
+def dump_json_bytes(data, indent: bool = True) -> bytes:
+    """
+    JSON → bytes - через orjson якщо встановлений, інакше stdlib json
+    indent=False - компактний вивід для проміжних файлів, які читають тільки скрипти
+
+    orjson не серіалізує вкладеність глибше ~128 рівнів (довгі конкатенації '.' і т.п.) -
+    тоді той самий вивід дає stdlib json
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2) if indent else orjson.dumps(data)
+        except orjson.JSONEncodeError:
+            pass
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def save_json(data, output_file):
+    """Зберегти JSON у файл"""
+    with open(output_file, 'wb') as f:
+        f.write(dump_json_bytes(data))
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python dump_ast_v2.py <path_to_laravel_project>")
+    logging.basicConfig(level=logging.INFO, format='%(message)s', stream=sys.stdout)
+
+    # --full - також end_line/start_byte/end_byte для кожної ноди
+    # --api-only - тільки Http/Transformers файли та їх залежності з app/
+    flags = {a for a in sys.argv[1:] if a.startswith('--')}
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    full_ast = '--full' in flags
+    api_only = '--api-only' in flags
+
+    if not args:
+        print("Usage: python dump_ast_v2.py <path_to_laravel_project> [--full] [--api-only]")
         sys.exit(1)
 
-    project_path = Path(sys.argv[1])
+    project_path = Path(args[0])
 
     if not project_path.exists():
         print(f"Error: {project_path} not found")
@@ -125,12 +273,11 @@ def main():
     # Якщо це файл - обробити один файл
     if project_path.is_file():
         print(f"[*] Parsing single file: {project_path}...")
-        file_data = process_file(project_path)
+        file_data = process_file(project_path, full_ast)
 
         output_file = 'ast_generic.json'
         print(f"[*] Saving FULL AST (pure tree-sitter output)...")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(file_data, f, indent=2, ensure_ascii=False)
+        save_json(file_data, output_file)
 
         print(f"\n[+] Done! Output: {output_file}")
         print(f"    File size: {Path(output_file).stat().st_size / 1024:.1f} KB")
@@ -146,6 +293,11 @@ def main():
     print(f"[*] Scanning PHP files in {app_dir}...")
     php_files = list(app_dir.rglob('*.php'))
 
+    if api_only:
+        total = len(php_files)
+        php_files = select_api_files(app_dir, php_files)
+        print(f"[*] --api-only: {len(php_files)}/{total} app files")
+
     # Додати routes файли
     routes_dir = project_path / 'routes'
     if routes_dir.exists():
@@ -155,26 +307,39 @@ def main():
 
     print(f"[*] Total PHP files: {len(php_files)}")
 
-    print("[*] Processing files...")
-    all_data = []
-
-    for i, php_file in enumerate(php_files, 1):
-        if i % 100 == 0:
-            print(f"    Processed {i}/{len(php_files)}...")
-        try:
-            # ПОВНИЙ AST для ВСІХ файлів - чистий tree-sitter вивід
-            file_data = process_file(php_file)
-            all_data.append(file_data)
-        except Exception as e:
-            print(f"    Error processing {php_file}: {e}")
-
-    print(f"\n[*] Processed {len(all_data)} files")
-
-    # Зберегти в JSON
+    # Зберегти в JSON - потоково, файл за файлом: {"files": [...]} без списку всіх AST в пам'яті
     output_file = 'ast_full.json'
-    print(f"\n[*] Saving to {output_file}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump({'files': all_data}, f, indent=2, ensure_ascii=False)
+    print(f"[*] Processing files (streaming to {output_file})...")
+    processed = 0
+
+    # ast_full.json читають тільки linker-и - компактно, з великим буфером запису
+    with open(output_file, 'wb', buffering=1 << 20) as out:
+        out.write(b'{"files": [\n')
+
+        # ПОВНИЙ AST для ВСІХ файлів - чистий tree-sitter вивід, файли незалежні → паралельно
+        with ProcessPoolExecutor(initializer=_init_worker) as executor:
+            worker = functools.partial(_process_file_safe, full_ast=full_ast)
+            results = executor.map(worker, php_files, chunksize=8)
+            for i, (php_file, (file_data, error)) in enumerate(zip(php_files, results), 1):
+                if i % 100 == 0:
+                    log.info("    Processed %d/%d...", i, len(php_files))
+                if error is not None:
+                    log.warning("    Error processing %s: %s", php_file, error)
+                    continue
+                # Серіалізувати до запису - помилка одного файлу не лишає обірваний ast_full.json
+                try:
+                    data = dump_json_bytes(file_data, indent=False)
+                except (RecursionError, ValueError, TypeError) as e:
+                    log.warning("    Error processing %s: %s", php_file, e)
+                    continue
+                if processed:
+                    out.write(b',\n')
+                out.write(data)
+                processed += 1
+
+        out.write(b'\n]}\n')
+
+    print(f"\n[*] Processed {processed} files")
 
     print(f"\n[+] Done! Output: {output_file}")
 
@@ -7,20 +7,52 @@ Extracts GET API endpoints with validation rules and response structures
 import json
 import re
 import os
+import bisect
+import functools
+import operator
+import threading
+from sys import intern
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Iterator
 from dataclasses import dataclass, asdict, field
 
 try:
     import tree_sitter_php as tsphp
-    from tree_sitter import Language, Parser, Query, Node
+    from tree_sitter import Language, Parser, Query, QueryCursor, Node
 except ImportError:
     print("ERROR: Required packages not installed.")
     print("Install with: pip install tree-sitter tree-sitter-php")
     exit(1)
 
+# Optional: orjson for fast JSON output (falls back to json)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: Hyperscan for bulk route parameter scanning (falls back to re)
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+PHP_LANGUAGE = Language(tsphp.language_php())
+
+# One Parser per thread (and so per worker process), shared by all extractor instances
+_thread_local = threading.local()
+
+
+def _get_parser() -> Parser:
+    """Lazily created thread-local PHP parser"""
+    parser = getattr(_thread_local, 'parser', None)
+    if parser is None:
+        parser = Parser(PHP_LANGUAGE)
+        _thread_local.parser = parser
+    return parser
+
 
-@dataclass
+@dataclass(slots=True)
 class RouteParameter:
     """Route parameter definition"""
     name: str
@@ -28,7 +60,7 @@ class RouteParameter:
     type: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationRule:
     """Validation rule with details"""
     rule_name: str
@@ -40,7 +72,7 @@ class ValidationRule:
     default_value: Optional[Any] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FieldValidation:
     """Field validation specification"""
     field_name: str
@@ -56,7 +88,7 @@ class FieldValidation:
     default_value: Optional[Any] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ResponseField:
     """Response field structure"""
     field_name: str
@@ -67,7 +99,7 @@ class ResponseField:
     description: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class APIEndpoint:
     """Complete API endpoint definition"""
     http_method: str
@@ -85,38 +117,233 @@ class APIEndpoint:
     line_number: Optional[int] = None
 
 
+# Pipe separator of a rule string, surrounding whitespace included: 'required | string|max:255'
+_RULE_SPLIT = re.compile(rb'\s*\|\s*')
+
+
+# Route path parameter: {param} / {param?} (group 2 = optional marker)
+_ROUTE_PARAM_RE = re.compile(r'\{([a-zA-Z_][a-zA-Z0-9_]*)(\??)\}')
+
+# Hyperscan database for _ROUTE_PARAM_RE, compiled on first use
+_route_param_db = None
+
+
+def _route_param_database():
+    """Compiled Hyperscan database (leftmost start offsets) for route parameters"""
+    global _route_param_db
+    if _route_param_db is None:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[_ROUTE_PARAM_RE.pattern.encode('ascii')],
+            ids=[0],
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST]
+        )
+        _route_param_db = db
+    return _route_param_db
+
+
+# Columnar (SoA) validation table of one FormRequest: one list per column, one row per rules() key.
+# FieldValidation/ValidationRule objects are only built in to_field_validations() for linked endpoints
+VALIDATION_COLUMNS = ('field_path', 'field_type', 'required', 'nullable', 'enum_values', 'min_value', 'max_value', 'rules')
+
+
+def new_validation_table() -> Dict[str, list]:
+    """Empty validation table - {column: []}"""
+    return {column: [] for column in VALIDATION_COLUMNS}
+
+
+# Rules that set the field type
+_TYPE_RULES = frozenset(['string', 'integer', 'numeric', 'boolean', 'array', 'file', 'image'])
+
+
+def _apply_int_param(column: str):
+    """Applier storing the first rule parameter as int (min:3, max:255)"""
+    def apply(row: Dict[str, Any], parameters: Tuple[str, ...]):
+        if parameters:
+            try:
+                row[column] = int(parameters[0])
+            except ValueError:
+                pass
+    return apply
+
+
+def _apply_in(row: Dict[str, Any], parameters: Tuple[str, ...]):
+    if parameters:
+        row['enum_values'] = list(parameters)
+
+
+# Rule name -> applier(row, parameters) updating the field-level columns of a validation row
+_RULE_APPLIERS = {
+    'required': lambda row, parameters: row.__setitem__('required', True),
+    'nullable': lambda row, parameters: row.__setitem__('nullable', True),
+    'min': _apply_int_param('min_value'),
+    'max': _apply_int_param('max_value'),
+    'in': _apply_in,
+}
+
+@functools.lru_cache(maxsize=4096)
+def _split_rule(rule_str: bytes) -> Tuple[str, Tuple[str, ...]]:
+    """Split a rule into name and parameters - memoized, the same rule strings repeat across fields"""
+    # Handle rules with parameters: 'max:255', 'in:foo,bar,baz'
+    if b':' in rule_str:
+        name, params = rule_str.split(b':', 1)
+        return intern(name.decode('utf8', errors='ignore')), tuple(p.strip().decode('utf8', errors='ignore') for p in params.split(b','))
+    # Rule names ('required', 'string', ...) are shared by every field - intern
+    return intern(rule_str.decode('utf8', errors='ignore')), ()
+
+
+# Indent strings by level for generate_sample_response(), grown on demand
+_INDENTS = [""]
+
+
+def _indent(level: int) -> str:
+    """Cached "  " * level"""
+    while len(_INDENTS) <= level:
+        _INDENTS.append("  " * len(_INDENTS))
+    return _INDENTS[level]
+
+
+def _children_of_type(node: Node, *type_names: str) -> Iterator[Node]:
+    """Yield direct children of the given types via TreeCursor (no node.children list)"""
+    cursor = node.walk()
+    if not cursor.goto_first_child():
+        return
+    while True:
+        if cursor.node.type in type_names:
+            yield cursor.node
+        if not cursor.goto_next_sibling():
+            break
+
+
+def _record_converter(keys: Tuple[str, ...], attrs: Optional[Tuple[str, ...]] = None):
+    """obj -> {key: obj.attr} for to_dict(), reading all attributes with one attrgetter call"""
+    getter = operator.attrgetter(*(attrs or keys))
+    return lambda obj: dict(zip(keys, getter(obj)))
+
+
+# to_dict() output layout - keys in output order, renamed where the dataclass field differs
+_endpoint_to_dict = _record_converter(
+    ('http_method', 'route_path', 'route_name', 'controller', 'controller_method', 'route_parameters',
+     'request_validation', 'response_structure', 'middleware', 'file_path', 'line_number'))
+_route_parameter_to_dict = _record_converter(('name', 'optional', 'type'))
+_validation_to_dict = _record_converter(
+    ('field_type', 'required', 'nullable', 'is_array', 'enum_values',
+     'min_value', 'max_value', 'default_value', 'rules', 'nested_fields'))
+_rule_to_dict = _record_converter(('rule', 'parameters', 'enum_values'),
+                                  ('rule_name', 'parameters', 'enum_values'))
+_nested_validation_to_dict = _record_converter(('field_type', 'required', 'nullable'))
+_response_field_to_dict = _record_converter(
+    ('field_type', 'nullable', 'is_array', 'description', 'nested_fields'))
+_nested_response_to_dict = _record_converter(('field_type', 'nullable', 'is_array'))
+
+
 class LaravelASTExtractor:
     """Extract API information from Laravel project using Tree-Sitter"""
     
     def __init__(self, project_path: str):
         """Initialize parser with Laravel project path"""
         self.project_path = Path(project_path)
-        self.php_language = Language(tsphp.language_php())
-        self.parser = Parser(self.php_language)
+        self.php_language = PHP_LANGUAGE
+        
+        # Compiled once - reused for every parsed file
+        self.class_with_base_query = Query(self.php_language, """
+            (class_declaration
+                name: (name) @class_name
+                (base_clause) @base
+                body: (declaration_list) @body) @class
+        """)
+        self.class_query = Query(self.php_language, """
+            (class_declaration
+                name: (name) @class_name
+                body: (declaration_list) @body) @class
+        """)
+        self.route_query = Query(self.php_language, """
+            (expression_statement
+                (scoped_call_expression
+                    scope: (name) @scope
+                    name: (name) @method
+                    arguments: (arguments) @args) @route_call)
+        """)
+        
+        # One cursor per query, reused across files; matches() groups captures per class/call
+        self.class_with_base_cursor = QueryCursor(self.class_with_base_query)
+        self.class_cursor = QueryCursor(self.class_query)
+        self.route_cursor = QueryCursor(self.route_query)
+        
+        # rules()/toArray() lookup: name predicate runs in C; depth 2 = class > body > method
+        self.rules_method_query = Query(self.php_language, """
+            (method_declaration
+                name: (name) @name (#eq? @name "rules")) @method
+        """)
+        self.to_array_method_query = Query(self.php_language, """
+            (method_declaration
+                name: (name) @name (#eq? @name "toArray")) @method
+        """)
+        self.rules_method_cursor = QueryCursor(self.rules_method_query)
+        self.rules_method_cursor.set_max_start_depth(2)
+        self.to_array_method_cursor = QueryCursor(self.to_array_method_query)
+        self.to_array_method_cursor.set_max_start_depth(2)
+        
+        # ->name('...') / ->middleware('...') calls of a route chain, one match per string argument
+        self.route_chain_query = Query(self.php_language, """
+            (member_call_expression
+                name: (name) @chain_method (#any-of? @chain_method "name" "middleware")
+                arguments: (arguments
+                    (argument [(string) (encapsed_string)] @chain_arg))) @chain_call
+        """)
+        self.route_chain_cursor = QueryCursor(self.route_chain_query)
         
         # Storage for extracted data
         self.routes: List[APIEndpoint] = []
-        self.form_requests: Dict[str, Dict[str, FieldValidation]] = {}
+        self.form_requests: Dict[str, Dict[str, list]] = {}
         self.controllers: Dict[str, Dict] = {}
         self.resources: Dict[str, Dict[str, ResponseField]] = {}
         
         # Route to FormRequest mapping
         self.route_form_request_map: Dict[Tuple[str, str], str] = {}
+        
+        # Decoded node texts of the current file, keyed by (start_byte, end_byte)
+        self._text_cache: Dict[Tuple[int, int], str] = {}
+    
+    @property
+    def parser(self) -> Parser:
+        """Parser of the current thread"""
+        return _get_parser()
     
-    def parse_file(self, file_path: Path) -> Tuple[Optional[Any], Optional[bytes]]:
-        """Parse a PHP file and return tree and source"""
+    def parse_file(self, file_path: Path, marker: Optional[bytes] = None) -> Tuple[Optional[Any], Optional[bytes]]:
+        """Parse a PHP file and return tree and source (None, None if marker is not in the source)"""
+        self._text_cache.clear()
         try:
-            with open(file_path, 'rb') as f:
-                source_code = f.read()
+            # Raw fd read: one fstat + one read, no buffered file object
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                source_code = os.read(fd, os.fstat(fd).st_size)
+            finally:
+                os.close(fd)
+            # Cheap substring check before the full tree-sitter parse
+            if marker is not None and marker not in source_code:
+                return None, None
             tree = self.parser.parse(source_code)
             return tree, source_code
         except Exception as e:
             print(f"Error parsing {file_path}: {e}")
             return None, None
     
+    def node_contains(self, node: Node, source: bytes, needle: bytes) -> bool:
+        """Substring test on the node's raw bytes - no slice copy, no decode"""
+        return source.find(needle, node.start_byte, node.end_byte) != -1
+    
     def get_node_text(self, node: Node, source: bytes) -> str:
-        """Extract text for a node"""
-        return source[node.start_byte:node.end_byte].decode('utf8', errors='ignore')
+        """Extract text for a node (memoized per parsed file)"""
+        key = (node.start_byte, node.end_byte)
+        text = self._text_cache.get(key)
+        if text is None:
+            text = source[key[0]:key[1]].decode('utf8', errors='ignore')
+            # Class/method/route names repeat across files - one str object each
+            if text.isidentifier():
+                text = intern(text)
+            self._text_cache[key] = text
+        return text
     
     def extract_all(self) -> List[APIEndpoint]:
         """Extract all API endpoint information from Laravel project"""
@@ -148,168 +375,204 @@ class LaravelASTExtractor:
         print(f"\nExtraction complete: {len(get_routes)} GET endpoints found")
         return get_routes
     
+    def _iter_php(self, root: Path) -> Iterator[str]:
+        """Recursively yield .php file paths under root (DirEntry type cache, no extra stat)"""
+        stack = [str(root)]
+        while stack:
+            directory = stack.pop()
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith('.php'):
+                        yield entry.path
+    
+    def map_files(self, method_name: str, php_files) -> List[Dict]:
+        """Run a per-file extraction method over files in worker processes (order preserved)"""
+        php_files = list(php_files)
+        if not php_files:
+            return []
+        
+        worker = functools.partial(_run_in_worker, method_name)
+        with ProcessPoolExecutor(initializer=_init_worker, initargs=(str(self.project_path),)) as executor:
+            return list(executor.map(worker, php_files, chunksize=8))
+    
     def extract_form_requests(self):
         """Extract validation rules from FormRequest classes"""
         requests_path = self.project_path / 'app' / 'Http' / 'Requests'
         if not requests_path.exists():
             return
         
-        for php_file in requests_path.rglob('*.php'):
-            tree, source = self.parse_file(php_file)
-            if not tree or not source:
-                continue
-            
-            # Find FormRequest classes
-            query = self.php_language.query("""
-                (class_declaration
-                    name: (name) @class_name
-                    base_clause: (base_clause) @base
-                    body: (declaration_list) @body) @class
-            """)
-            
-            captures = query.captures(tree.root_node)
-            
-            for node, capture_name in captures:
-                if capture_name == 'class':
-                    class_name_node = node.child_by_field_name('name')
-                    base_clause = node.child_by_field_name('base_clause')
-                    
-                    if base_clause:
-                        base_text = self.get_node_text(base_clause, source)
-                        if 'FormRequest' in base_text:
-                            class_name = self.get_node_text(class_name_node, source)
-                            rules = self.extract_rules_from_class(node, source)
-                            if rules:
-                                self.form_requests[class_name] = rules
-    
-    def extract_rules_from_class(self, class_node: Node, source: bytes) -> Dict[str, FieldValidation]:
-        """Extract validation rules from FormRequest class"""
-        body = class_node.child_by_field_name('body')
-        if not body:
-            return {}
-        
+        for form_requests in self.map_files('extract_form_requests_from_file', self._iter_php(requests_path)):
+            self.form_requests.update(form_requests)
+    
+    def extract_form_requests_from_file(self, php_file: Path) -> Dict[str, Dict[str, list]]:
+        """Extract validation tables from FormRequest classes in a single file"""
+        form_requests = {}
+        tree, source = self.parse_file(php_file, b'FormRequest')
+        if not tree or not source:
+            return form_requests
+        
+        # Find FormRequest classes
+        for _, match in self.class_with_base_cursor.matches(tree.root_node):
+            if self.node_contains(match['base'][0], source, b'FormRequest'):
+                class_name = self.get_node_text(match['class_name'][0], source)
+                table = self.extract_rules_from_class(match['class'][0], source)
+                if table['field_path']:
+                    form_requests[class_name] = table
+        
+        return form_requests
+    
+    def extract_rules_from_class(self, class_node: Node, source: bytes) -> Dict[str, list]:
+        """Extract validation table from FormRequest class"""
         # Find rules() method
-        for child in body.children:
-            if child.type == 'method_declaration':
-                method_name = child.child_by_field_name('name')
-                if method_name and self.get_node_text(method_name, source) == 'rules':
-                    return self.extract_validation_rules(child, source)
+        for _, match in self.rules_method_cursor.matches(class_node):
+            return self.extract_validation_rules(match['method'][0], source)
         
-        return {}
+        return new_validation_table()
     
-    def extract_validation_rules(self, method_node: Node, source: bytes) -> Dict[str, FieldValidation]:
-        """Extract validation rules from rules() method"""
-        rules = {}
+    def extract_validation_rules(self, method_node: Node, source: bytes) -> Dict[str, list]:
+        """Extract validation table from rules() method"""
+        table = new_validation_table()
         body = method_node.child_by_field_name('body')
         if not body:
-            return rules
+            return table
         
         # Find return statement with array
-        for child in body.children:
-            if child.type == 'return_statement':
-                # Find array creation expression
-                for subchild in child.children:
-                    if subchild.type == 'array_creation_expression':
-                        rules = self.parse_validation_array(subchild, source)
-                        break
+        for child in _children_of_type(body, 'return_statement'):
+            # Find array creation expression
+            for subchild in _children_of_type(child, 'array_creation_expression'):
+                table = self.parse_validation_array(subchild, source)
                 break
+            break
         
-        return rules
+        return table
     
-    def parse_validation_array(self, array_node: Node, source: bytes) -> Dict[str, FieldValidation]:
-        """Parse validation array and extract field rules"""
-        rules = {}
-        
-        for child in array_node.children:
-            if child.type == 'array_element_initializer':
-                for element in child.children:
-                    if element.type == 'array_element':
-                        key_node = element.child_by_field_name('key')
-                        value_node = element.child_by_field_name('value')
-                        
-                        if key_node and value_node:
-                            field_name = self.get_node_text(key_node, source).strip('\'"')
-                            validation = self.parse_validation_value(value_node, source)
-                            
-                            # Handle nested fields (e.g., 'user.email', 'items.*.name')
-                            if '.' in field_name:
-                                rules.update(self.handle_nested_validation(field_name, validation))
-                            else:
-                                rules[field_name] = validation
+    def parse_validation_array(self, array_node: Node, source: bytes) -> Dict[str, list]:
+        """Parse validation array into a columnar table (one row per field key)"""
+        table = new_validation_table()
+        
+        for child in _children_of_type(array_node, 'array_element_initializer'):
+            for element in _children_of_type(child, 'array_element'):
+                key_node = element.child_by_field_name('key')
+                value_node = element.child_by_field_name('value')
+                
+                if key_node and value_node:
+                    field_name = self.get_node_text(key_node, source).strip('\'"')
+                    self.append_validation_row(table, field_name, value_node, source)
         
-        return rules
+        return table
     
-    def parse_validation_value(self, value_node: Node, source: bytes) -> FieldValidation:
-        """Parse validation rules from value node""" 
-        validation = FieldValidation(field_name="")
+    def append_validation_row(self, table: Dict[str, list], field_path: str, value_node: Node, source: bytes):
+        """Parse rules of one field and append them as a row of the validation table"""
+        row = {
+            'field_type': "string",
+            'required': False,
+            'nullable': False,
+            'enum_values': [],
+            'min_value': None,
+            'max_value': None
+        }
+        rules = []
+        
+        # Hot loop (once per rule of every field): locals instead of global/attribute lookups
+        split_rule = _split_rule
+        get_applier = _RULE_APPLIERS.get
+        type_rules = _TYPE_RULES
+        append_rule = rules.append
+        
+        for rule_str in self.collect_rule_strings(value_node, source):
+            rule = split_rule(rule_str)
+            append_rule(rule)
+            rule_name = rule[0]
+            
+            # Set field-level properties based on rules
+            applier = get_applier(rule_name)
+            if applier is not None:
+                applier(row, rule[1])
+            elif rule_name in type_rules:
+                row['field_type'] = rule_name
+            elif rule_name.startswith('enum'):
+                # Only 'in' rules carry enum values
+                row['enum_values'] = []
+        
+        table['field_path'].append(field_path)
+        for column, value in row.items():
+            table[column].append(value)
+        table['rules'].append(rules)
+    
+    def collect_rule_strings(self, value_node: Node, source: bytes) -> List[bytes]:
+        """Raw rule strings of a validation value (pipe string or array of strings)"""
         rule_strings = []
         
         if value_node.type in ['string', 'encapsed_string']:
             # Pipe-delimited string: 'required|string|max:255'
-            text = self.get_node_text(value_node, source).strip('\'"')
-            rule_strings = [r.strip() for r in text.split('|')]
+            # Split the raw bytes - rules are decoded one by one in split_rule
+            text = source[value_node.start_byte:value_node.end_byte].strip(b'\'"').strip()
+            rule_strings = _RULE_SPLIT.split(text)
         
         elif value_node.type == 'array_creation_expression':
             # Array of rules: ['required', 'string', 'max:255']
-            for child in value_node.children:
-                if child.type == 'array_element_initializer':
-                    for element in child.children:
-                        if element.type == 'array_element':
-                            val = element.child_by_field_name('value')
-                            if val and val.type in ['string', 'encapsed_string']:
-                                rule_strings.append(
-                                    self.get_node_text(val, source).strip('\'"')
-                                )
-        
-        # Parse individual rules
-        validation.rules = []
-        for rule_str in rule_strings:
-            parsed_rule = self.parse_single_rule(rule_str)
-            validation.rules.append(parsed_rule)
-            
-            # Set field-level properties based on rules
-            if parsed_rule.rule_name == 'required':
-                validation.required = True
-            elif parsed_rule.rule_name == 'nullable':
-                validation.nullable = True
-            elif parsed_rule.rule_name in ['string', 'integer', 'numeric', 'boolean', 'array', 'file', 'image']:
-                validation.field_type = parsed_rule.rule_name
-            elif parsed_rule.rule_name == 'min' and parsed_rule.parameters:
-                try:
-                    validation.min_value = int(parsed_rule.parameters[0])
-                except ValueError:
-                    pass
-            elif parsed_rule.rule_name == 'max' and parsed_rule.parameters:
-                try:
-                    validation.max_value = int(parsed_rule.parameters[0])
-                except ValueError:
-                    pass
-            elif parsed_rule.rule_name == 'in' and parsed_rule.parameters:
-                validation.enum_values = parsed_rule.parameters
-            elif parsed_rule.rule_name.startswith('enum'):
-                validation.enum_values = parsed_rule.enum_values
-        
-        return validation
-    
-    def parse_single_rule(self, rule_str: str) -> ValidationRule:
-        """Parse a single validation rule string"""
-        rule = ValidationRule(rule_name=rule_str)
-        
-        # Handle rules with parameters: 'max:255', 'in:foo,bar,baz'
-        if ':' in rule_str:
-            parts = rule_str.split(':', 1)
-            rule.rule_name = parts[0]
-            rule.parameters = [p.strip() for p in parts[1].split(',')]
-            
-            # Special handling for enum values in 'in' rule
-            if rule.rule_name == 'in':
-                rule.enum_values = rule.parameters
+            for child in _children_of_type(value_node, 'array_element_initializer'):
+                for element in _children_of_type(child, 'array_element'):
+                    val = element.child_by_field_name('value')
+                    if val and val.type in ['string', 'encapsed_string']:
+                        rule_strings.append(
+                            source[val.start_byte:val.end_byte].strip(b'\'"')
+                        )
+        
+        return rule_strings
+    
+    def parse_validation_value(self, value_node: Node, source: bytes) -> FieldValidation:
+        """Parse validation rules from value node""" 
+        table = new_validation_table()
+        self.append_validation_row(table, "", value_node, source)
+        return self.to_field_validations(table)[""]
+    
+    def to_field_validations(self, table: Dict[str, list]) -> Dict[str, FieldValidation]:
+        """Materialize a validation table into FieldValidation objects (nested fields resolved)"""
+        rules = {}
         
-        # Mark as required
-        if rule.rule_name == 'required':
-            rule.required = True
+        for field_path, field_type, required, nullable, enum_values, min_value, max_value, rule_rows in zip(
+                *(table[column] for column in VALIDATION_COLUMNS)):
+            validation = FieldValidation(
+                field_name="",
+                field_type=field_type,
+                required=required,
+                nullable=nullable,
+                rules=[self.make_rule(rule_name, parameters) for rule_name, parameters in rule_rows],
+                enum_values=enum_values,
+                min_value=min_value,
+                max_value=max_value
+            )
+            
+            # Handle nested fields (e.g., 'user.email', 'items.*.name')
+            if '.' in field_path:
+                rules.update(self.handle_nested_validation(field_path, validation))
+            else:
+                rules[field_path] = validation
         
-        return rule
+        return rules
+    
+    def split_rule(self, rule_str: bytes) -> Tuple[str, List[str]]:
+        """Split a single rule (raw bytes from source) into name and parameters"""
+        rule_name, parameters = _split_rule(rule_str)
+        return rule_name, list(parameters)
+    
+    def make_rule(self, rule_name: str, parameters: Tuple[str, ...]) -> ValidationRule:
+        """Build a ValidationRule from a split rule"""
+        parameters = list(parameters)
+        return ValidationRule(
+            rule_name=rule_name,
+            parameters=parameters,
+            # Mark as required / enum values in 'in' rule
+            required=rule_name == 'required',
+            enum_values=parameters if rule_name == 'in' else []
+        )
+    
+    def parse_single_rule(self, rule_str: bytes) -> ValidationRule:
+        """Parse a single validation rule (raw bytes from source)"""
+        return self.make_rule(*self.split_rule(rule_str))
     
     def handle_nested_validation(self, field_path: str, validation: FieldValidation) -> Dict[str, FieldValidation]:
         """Handle nested field validation like 'user.email' or 'items.*.name'""" 
@@ -340,45 +603,32 @@ class LaravelASTExtractor:
         if not resources_path.exists():
             return
         
-        for php_file in resources_path.rglob('*.php'):
-            tree, source = self.parse_file(php_file)
-            if not tree or not source:
-                continue
-            
-            # Find Resource classes
-            query = self.php_language.query("""
-                (class_declaration
-                    name: (name) @class_name
-                    base_clause: (base_clause) @base
-                    body: (declaration_list) @body) @class
-            """)
-            
-            captures = query.captures(tree.root_node)
-            
-            for node, capture_name in captures:
-                if capture_name == 'class':
-                    base_clause = node.child_by_field_name('base_clause')
-                    if base_clause:
-                        base_text = self.get_node_text(base_clause, source)
-                        if 'JsonResource' in base_text or 'Resource' in base_text:
-                            class_name_node = node.child_by_field_name('name')
-                            class_name = self.get_node_text(class_name_node, source)
-                            response_fields = self.extract_resource_fields(node, source)
-                            if response_fields:
-                                self.resources[class_name] = response_fields
+        for resources in self.map_files('extract_resources_from_file', self._iter_php(resources_path)):
+            self.resources.update(resources)
+    
+    def extract_resources_from_file(self, php_file: Path) -> Dict[str, Dict[str, ResponseField]]:
+        """Extract response structures from Resource classes in a single file"""
+        resources = {}
+        tree, source = self.parse_file(php_file, b'Resource')
+        if not tree or not source:
+            return resources
+        
+        # Find Resource classes
+        for _, match in self.class_with_base_cursor.matches(tree.root_node):
+            # b'Resource' also covers JsonResource
+            if self.node_contains(match['base'][0], source, b'Resource'):
+                class_name = self.get_node_text(match['class_name'][0], source)
+                response_fields = self.extract_resource_fields(match['class'][0], source)
+                if response_fields:
+                    resources[class_name] = response_fields
+        
+        return resources
     
     def extract_resource_fields(self, class_node: Node, source: bytes) -> Dict[str, ResponseField]:
         """Extract response fields from toArray() method in Resource"""
-        body = class_node.child_by_field_name('body')
-        if not body:
-            return {}
-        
         # Find toArray() method
-        for child in body.children:
-            if child.type == 'method_declaration':
-                method_name = child.child_by_field_name('name')
-                if method_name and self.get_node_text(method_name, source) == 'toArray':
-                    return self.extract_response_array(child, source)
+        for _, match in self.to_array_method_cursor.matches(class_node):
+            return self.extract_response_array(match['method'][0], source)
         
         return {}
     
@@ -390,13 +640,11 @@ class LaravelASTExtractor:
             return fields
         
         # Find return statement
-        for child in body.children:
-            if child.type == 'return_statement':
-                for subchild in child.children:
-                    if subchild.type == 'array_creation_expression':
-                        fields = self.parse_response_array(subchild, source)
-                        break
+        for child in _children_of_type(body, 'return_statement'):
+            for subchild in _children_of_type(child, 'array_creation_expression'):
+                fields = self.parse_response_array(subchild, source)
                 break
+            break
         
         return fields
     
@@ -404,27 +652,25 @@ class LaravelASTExtractor:
         """Parse response array structure"""
         fields = {}
         
-        for child in array_node.children:
-            if child.type == 'array_element_initializer':
-                for element in child.children:
-                    if element.type == 'array_element':
-                        key_node = element.child_by_field_name('key')
-                        value_node = element.child_by_field_name('value')
-                        
-                        if key_node and value_node:
-                            field_name = self.get_node_text(key_node, source).strip('\'"')
-                            field = ResponseField(field_name=field_name)
-                            
-                            # Infer type from value
-                            value_text = self.get_node_text(value_node, source)
-                            field.field_type = self.infer_response_type(value_node, value_text, source)
-                            
-                            # Check if it's an array
-                            if value_node.type == 'array_creation_expression':
-                                field.is_array = True
-                                field.nested_fields = self.parse_response_array(value_node, source)
-                            
-                            fields[field_name] = field
+        for child in _children_of_type(array_node, 'array_element_initializer'):
+            for element in _children_of_type(child, 'array_element'):
+                key_node = element.child_by_field_name('key')
+                value_node = element.child_by_field_name('value')
+                
+                if key_node and value_node:
+                    field_name = self.get_node_text(key_node, source).strip('\'"')
+                    field = ResponseField(field_name=field_name)
+                    
+                    # Infer type from value
+                    value_text = self.get_node_text(value_node, source)
+                    field.field_type = self.infer_response_type(value_node, value_text, source)
+                    
+                    # Check if it's an array
+                    if value_node.type == 'array_creation_expression':
+                        field.is_array = True
+                        field.nested_fields = self.parse_response_array(value_node, source)
+                    
+                    fields[field_name] = field
         
         return fields
     
@@ -453,27 +699,24 @@ class LaravelASTExtractor:
         if not controllers_path.exists():
             return
         
-        for php_file in controllers_path.rglob('*.php'):
-            tree, source = self.parse_file(php_file)
-            if not tree or not source:
-                continue
-            
-            # Find Controller classes
-            query = self.php_language.query("""
-                (class_declaration
-                    name: (name) @class_name
-                    body: (declaration_list) @body) @class
-            """)
-            
-            captures = query.captures(tree.root_node)
-            
-            for node, capture_name in captures:
-                if capture_name == 'class':
-                    class_name_node = node.child_by_field_name('name')
-                    class_name = self.get_node_text(class_name_node, source)
-                    methods = self.extract_controller_methods(node, source)
-                    if methods:
-                        self.controllers[class_name] = methods
+        for controllers in self.map_files('extract_controllers_from_file', self._iter_php(controllers_path)):
+            self.controllers.update(controllers)
+    
+    def extract_controllers_from_file(self, php_file: Path) -> Dict[str, Dict]:
+        """Extract controller methods and type hints from a single file"""
+        controllers = {}
+        tree, source = self.parse_file(php_file)
+        if not tree or not source:
+            return controllers
+        
+        # Find Controller classes
+        for _, match in self.class_cursor.matches(tree.root_node):
+            class_name = self.get_node_text(match['class_name'][0], source)
+            methods = self.extract_controller_methods(match['class'][0], source)
+            if methods:
+                controllers[class_name] = methods
+        
+        return controllers
     
     def extract_controller_methods(self, class_node: Node, source: bytes) -> Dict:
         """Extract methods from controller class""" 
@@ -482,34 +725,33 @@ class LaravelASTExtractor:
         if not body:
             return methods
         
-        for child in body.children:
-            if child.type == 'method_declaration':
-                method_name_node = child.child_by_field_name('name')
-                if method_name_node:
-                    method_name = self.get_node_text(method_name_node, source)
-                    method_info = {
-                        'name': method_name,
-                        'parameters': [],
-                        'form_request': None,
-                        'return_type': None
-                    }
-                    
-                    # Extract parameters
-                    params = child.child_by_field_name('parameters')
-                    if params:
-                        method_info['parameters'] = self.extract_method_parameters(params, source)
-                        
-                        # Check for FormRequest parameter
-                        for param in method_info['parameters']:
-                            if param.get('type', '').endswith('Request'):
-                                method_info['form_request'] = param['type']
-                    
-                    # Extract return type if available
-                    return_type = child.child_by_field_name('return_type')
-                    if return_type:
-                        method_info['return_type'] = self.get_node_text(return_type, source)
+        for child in _children_of_type(body, 'method_declaration'):
+            method_name_node = child.child_by_field_name('name')
+            if method_name_node:
+                method_name = self.get_node_text(method_name_node, source)
+                method_info = {
+                    'name': method_name,
+                    'parameters': [],
+                    'form_request': None,
+                    'return_type': None
+                }
+                
+                # Extract parameters
+                params = child.child_by_field_name('parameters')
+                if params:
+                    method_info['parameters'] = self.extract_method_parameters(params, source)
                     
-                    methods[method_name] = method_info
+                    # Check for FormRequest parameter
+                    for param in method_info['parameters']:
+                        if param.get('type', '').endswith('Request'):
+                            method_info['form_request'] = param['type']
+                
+                # Extract return type if available
+                return_type = child.child_by_field_name('return_type')
+                if return_type:
+                    method_info['return_type'] = self.get_node_text(return_type, source)
+                
+                methods[method_name] = method_info
         
         return methods
     
@@ -517,26 +759,25 @@ class LaravelASTExtractor:
         """Extract method parameters with type hints"""
         parameters = []
         
-        for child in params_node.children:
-            if child.type == 'simple_parameter':
-                param_info = {}
-                
-                # Extract type hint
-                type_node = child.child_by_field_name('type')
-                if type_node:
-                    param_info['type'] = self.get_node_text(type_node, source)
-                
-                # Extract parameter name
-                name_node = child.child_by_field_name('name')
-                if name_node:
-                    param_info['name'] = self.get_node_text(name_node, source)
-                
-                # Check for default value
-                default_value = child.child_by_field_name('default_value')
-                if default_value:
-                    param_info['default'] = self.get_node_text(default_value, source)
-                
-                parameters.append(param_info)
+        for child in _children_of_type(params_node, 'simple_parameter'):
+            param_info = {}
+            
+            # Extract type hint
+            type_node = child.child_by_field_name('type')
+            if type_node:
+                param_info['type'] = self.get_node_text(type_node, source)
+            
+            # Extract parameter name
+            name_node = child.child_by_field_name('name')
+            if name_node:
+                param_info['name'] = self.get_node_text(name_node, source)
+            
+            # Check for default value
+            default_value = child.child_by_field_name('default_value')
+            if default_value:
+                param_info['default'] = self.get_node_text(default_value, source)
+            
+            parameters.append(param_info)
         
         return parameters
     
@@ -553,35 +794,52 @@ class LaravelASTExtractor:
             if not file_path.exists():
                 continue
             
-            tree, source = self.parse_file(file_path)
+            tree, source = self.parse_file(file_path, b'Route::')
             if not tree or not source:
                 continue
             
-            # Query for Route static calls
-            query = self.php_language.query("""
-                (expression_statement
-                    (scoped_call_expression
-                        scope: (name) @scope
-                        name: (name) @method
-                        arguments: (arguments) @args) @route_call)
-            """)
-            
-            captures = query.captures(tree.root_node)
-            route_nodes = []
-            
-            for node, capture_name in captures:
-                if capture_name == 'scope':
-                    scope_text = self.get_node_text(node, source)
-                    if scope_text == 'Route':
-                        parent = node.parent
-                        if parent and parent.type == 'scoped_call_expression':
-                            route_nodes.append(parent)
-            
-            # Parse each route
-            for route_node in route_nodes:
-                endpoint = self.parse_route_definition(route_node, source, str(file_path))
-                if endpoint and endpoint.http_method.upper() == 'GET':
+            # Query for Route static calls - each route parsed as soon as it is matched
+            file_path_str = str(file_path)
+            for _, match in self.route_cursor.matches(tree.root_node):
+                if self.get_node_text(match['scope'][0], source) != 'Route':
+                    continue
+                endpoint = self.parse_route_definition(match['route_call'][0], source, file_path_str)
+                if endpoint and endpoint.http_method == 'GET':
                     self.routes.append(endpoint)
+        
+        # Extract route parameters - all paths at once
+        self.assign_route_parameters(self.routes)
+    
+    def assign_route_parameters(self, endpoints: List[APIEndpoint]):
+        """Fill route_parameters of endpoints - one Hyperscan pass over all paths if available"""
+        if hyperscan is None:
+            for endpoint in endpoints:
+                endpoint.route_parameters = self.extract_route_parameters(endpoint.route_path)
+            return
+        
+        if not endpoints:
+            return
+        
+        # Paths joined by '\n' (never inside {param}); match offset -> endpoint via bisect on start offsets
+        starts = []
+        chunks = []
+        offset = 0
+        for endpoint in endpoints:
+            endpoint.route_parameters = []
+            chunk = endpoint.route_path.encode('utf8')
+            starts.append(offset)
+            chunks.append(chunk)
+            offset += len(chunk) + 1
+        buffer = b'\n'.join(chunks)
+        
+        def on_match(_id, start, end, _flags, _context):
+            # buffer[start:end] is '{name}' or '{name?}'
+            optional = buffer[end - 2] == 0x3F  # '?'
+            name = buffer[start + 1:end - 2 if optional else end - 1].decode('utf8')
+            endpoint = endpoints[bisect.bisect_right(starts, start) - 1]
+            endpoint.route_parameters.append(RouteParameter(name=name, optional=optional))
+        
+        _route_param_database().scan(buffer, match_event_handler=on_match)
     
     def parse_route_definition(self, route_node: Node, source: bytes, file_path: str) -> Optional[APIEndpoint]:
         """Parse a Route::method() call"""
@@ -614,9 +872,6 @@ class LaravelASTExtractor:
         if len(args) > 0:
             path_text = self.get_node_text(args[0], source)
             endpoint.route_path = path_text.strip('\'"')
-            
-            # Extract route parameters
-            endpoint.route_parameters = self.extract_route_parameters(endpoint.route_path)
         
         # Second argument is the handler (controller or closure)
         if len(args) > 1:
@@ -638,12 +893,11 @@ class LaravelASTExtractor:
         parameters = []
         
         # Match {param} and {param?}
-        matches = re.finditer(r'\{([a-zA-Z_][a-zA-Z0-9_]*)\??}', route_path)
+        if '{' not in route_path:
+            return parameters
         
-        for match in matches:
-            param_name = match.group(1)
-            optional = match.group(0).endswith('?}')
-            parameters.append(RouteParameter(name=param_name, optional=optional))
+        for match in _ROUTE_PARAM_RE.finditer(route_path):
+            parameters.append(RouteParameter(name=match.group(1), optional=match.group(2) == '?'))
         
         return parameters
     
@@ -651,13 +905,11 @@ class LaravelASTExtractor:
         """Parse controller array handler [Controller::class, 'method']"""
         elements = []
         
-        for child in handler_node.children:
-            if child.type == 'array_element_initializer':
-                for element in child.children:
-                    if element.type == 'array_element':
-                        value = element.child_by_field_name('value')
-                        if value:
-                            elements.append(value)
+        for child in _children_of_type(handler_node, 'array_element_initializer'):
+            for element in _children_of_type(child, 'array_element'):
+                value = element.child_by_field_name('value')
+                if value:
+                    elements.append(value)
         
         if len(elements) < 2:
             return None
@@ -682,29 +934,34 @@ class LaravelASTExtractor:
     
     def extract_route_chains(self, route_node: Node, endpoint: APIEndpoint, source: bytes):
         """Extract chained method calls like ->name() or ->middleware()"""
-        parent = route_node.parent
+        # Outermost call of the chain (type checks only, no field/text lookups)
+        top = route_node
+        while top.parent and top.parent.type == 'member_call_expression':
+            top = top.parent
+        if top is route_node:
+            return
         
-        while parent and parent.type == 'member_call_expression':
-            method_name_node = parent.child_by_field_name('name')
-            if method_name_node:
-                method_name = self.get_node_text(method_name_node, source)
-                args_node = parent.child_by_field_name('arguments')
-                
-                if method_name == 'name' and args_node:
-                    # Extract route name
-                    for child in args_node.children:
-                        if child.type in ['string', 'encapsed_string']:
-                            endpoint.route_name = self.get_node_text(child, source).strip('\'"')
-                            break
-                
-                elif method_name == 'middleware' and args_node:
-                    # Extract middleware
-                    for child in args_node.children:
-                        if child.type in ['string', 'encapsed_string']:
-                            middleware = self.get_node_text(child, source).strip('\'"')
-                            endpoint.middleware.append(middleware)
-            
-            parent = parent.parent
+        # Every call of this chain starts where the Route:: call starts; calls nested
+        # in arguments start elsewhere. Innermost call first, arguments in order
+        chain = []
+        for _, match in self.route_chain_cursor.matches(top):
+            call = match['chain_call'][0]
+            if call.start_byte == route_node.start_byte:
+                arg = match['chain_arg'][0]
+                chain.append((call.end_byte, arg.start_byte, match['chain_method'][0], arg))
+        chain.sort(key=lambda item: item[:2])
+        
+        named_calls = set()
+        for call_end, _, method_name_node, arg in chain:
+            value = self.get_node_text(arg, source).strip('\'"')
+            if self.get_node_text(method_name_node, source) == 'name':
+                # Extract route name - first string argument; outer ->name() wins
+                if call_end not in named_calls:
+                    named_calls.add(call_end)
+                    endpoint.route_name = value
+            else:
+                # Extract middleware
+                endpoint.middleware.append(value)
     
     def link_route_data(self):
         """Link routes with FormRequests, controllers, and resources"""
@@ -723,9 +980,9 @@ class LaravelASTExtractor:
                         endpoint.form_request_class = form_request
                         
                         # Find validation rules for this FormRequest
-                        for fr_name, fr_rules in self.form_requests.items():
+                        for fr_name, fr_table in self.form_requests.items():
                             if fr_name in form_request or form_request.endswith(fr_name):
-                                endpoint.request_validation = fr_rules
+                                endpoint.request_validation = self.to_field_validations(fr_table)
                                 break
                     
                     # Link Resource response
@@ -740,67 +997,26 @@ class LaravelASTExtractor:
         result = []
         
         for endpoint in endpoints:
-            endpoint_dict = {
-                'http_method': endpoint.http_method,
-                'route_path': endpoint.route_path,
-                'route_name': endpoint.route_name,
-                'controller': endpoint.controller,
-                'controller_method': endpoint.controller_method,
-                'route_parameters': [
-                    {'name': p.name, 'optional': p.optional, 'type': p.type}
-                    for p in endpoint.route_parameters
-                ],
-                'request_validation': {},
-                'response_structure': {},
-                'middleware': endpoint.middleware,
-                'file_path': endpoint.file_path,
-                'line_number': endpoint.line_number
-            }
+            endpoint_dict = _endpoint_to_dict(endpoint)
+            endpoint_dict['route_parameters'] = [_route_parameter_to_dict(p) for p in endpoint.route_parameters]
             
             # Convert request validation
+            request_validation = endpoint_dict['request_validation'] = {}
             for field_name, validation in endpoint.request_validation.items():
-                endpoint_dict['request_validation'][field_name] = {
-                    'field_type': validation.field_type,
-                    'required': validation.required,
-                    'nullable': validation.nullable,
-                    'is_array': validation.is_array,
-                    'enum_values': validation.enum_values,
-                    'min_value': validation.min_value,
-                    'max_value': validation.max_value,
-                    'default_value': validation.default_value,
-                    'rules': [
-                        {
-                            'rule': r.rule_name,
-                            'parameters': r.parameters,
-                            'enum_values': r.enum_values
-                        }
-                        for r in validation.rules
-                    ],
-                    'nested_fields': {
-                        nf_name: {
-                            'field_type': nf.field_type,
-                            'required': nf.required,
-                            'nullable': nf.nullable
-                        }
-                        for nf_name, nf in validation.nested_fields.items()
-                    } if validation.nested_fields else {}
+                validation_dict = request_validation[field_name] = _validation_to_dict(validation)
+                validation_dict['rules'] = [_rule_to_dict(r) for r in validation.rules]
+                validation_dict['nested_fields'] = {
+                    nf_name: _nested_validation_to_dict(nf)
+                    for nf_name, nf in validation.nested_fields.items()
                 }
             
             # Convert response structure
+            response_structure = endpoint_dict['response_structure'] = {}
             for field_name, field in endpoint.response_structure.items():
-                endpoint_dict['response_structure'][field_name] = {
-                    'field_type': field.field_type,
-                    'nullable': field.nullable,
-                    'is_array': field.is_array,
-                    'description': field.description,
-                    'nested_fields': {
-                        nf_name: {
-                            'field_type': nf.field_type,
-                            'nullable': nf.nullable,
-                            'is_array': nf.is_array
-                        }
-                        for nf_name, nf in field.nested_fields.items()
-                    } if field.nested_fields else {}
+                field_dict = response_structure[field_name] = _response_field_to_dict(field)
+                field_dict['nested_fields'] = {
+                    nf_name: _nested_response_to_dict(nf)
+                    for nf_name, nf in field.nested_fields.items()
                 }
             
             result.append(endpoint_dict)
@@ -810,6 +1026,8 @@ class LaravelASTExtractor:
     def generate_documentation(self, endpoints: List[APIEndpoint], output_format: str = 'json') -> str:
         """Generate API documentation in specified format"""
         if output_format == 'json':
+            if orjson is not None:
+                return orjson.dumps(self.to_dict(endpoints), option=orjson.OPT_INDENT_2).decode()
             return json.dumps(self.to_dict(endpoints), indent=2)
         
         elif output_format == 'markdown':
@@ -870,34 +1088,46 @@ class LaravelASTExtractor:
         return "".join(lines)
     
     def generate_sample_response(self, response_structure: Dict[str, ResponseField], indent: int = 0) -> str:
-        """Generate sample JSON response structure"""
-        lines = []
-        indent_str = "  " * indent
-        
-        lines.append(indent_str + "{\n")
-        
-        items = list(response_structure.items())
-        for i, (field_name, field) in enumerate(items):
-            comma = "," if i < len(items) - 1 else ""
+        """Generate sample JSON response structure (one output buffer, explicit stack instead of recursion)"""
+        out = []
+        emit = out.append
+        # Work stack: str - emit as is, (structure, indent) - emit a nested object
+        stack = [(response_structure, indent)]
+        
+        while stack:
+            task = stack.pop()
+            if isinstance(task, str):
+                emit(task)
+                continue
+            
+            structure, level = task
+            indent_str = _indent(level)
+            emit(indent_str + "{\n")
             
-            if field.is_array:
-                lines.append(f'{indent_str}  "{field_name}": [\n')
-                if field.nested_fields:
-                    lines.append(self.generate_sample_response(field.nested_fields, indent + 2))
+            tasks = []
+            last = len(structure) - 1
+            for i, (field_name, field) in enumerate(structure.items()):
+                comma = "," if i < last else ""
+                
+                if field.is_array:
+                    tasks.append(f'{indent_str}  "{field_name}": [\n')
+                    if field.nested_fields:
+                        tasks.append((field.nested_fields, level + 2))
+                    else:
+                        tasks.append(f'{indent_str}    {self.get_sample_value(field.field_type)}\n')
+                    tasks.append(f'{indent_str}  ]{comma}\n')
+                elif field.nested_fields:
+                    tasks.append(f'{indent_str}  "{field_name}": \n')
+                    tasks.append((field.nested_fields, level + 1))
+                    tasks.append(f'{comma}\n')
                 else:
-                    lines.append(f'{indent_str}    {self.get_sample_value(field.field_type)}\n')
-                lines.append(f'{indent_str}  ]{comma}\n')
-            elif field.nested_fields:
-                lines.append(f'{indent_str}  "{field_name}": \n')
-                lines.append(self.generate_sample_response(field.nested_fields, indent + 1))
-                lines.append(f'{comma}\n')
-            else:
-                sample_value = self.get_sample_value(field.field_type)
-                lines.append(f'{indent_str}  "{field_name}": {sample_value}{comma}\n')
-        
-        lines.append(indent_str + "}\n")
+                    sample_value = self.get_sample_value(field.field_type)
+                    tasks.append(f'{indent_str}  "{field_name}": {sample_value}{comma}\n')
+            
+            tasks.append(indent_str + "}\n")
+            stack.extend(reversed(tasks))
         
-        return "".join(lines)
+        return "".join(out)
     
     def get_sample_value(self, field_type: str) -> str:
         """Get sample value for field type"""
@@ -913,6 +1143,22 @@ class LaravelASTExtractor:
         return samples.get(field_type, 'null')
 
 
+# Per-process extractor for map_files() - tree-sitter nodes can't cross process boundaries,
+# so each worker parses with its own parser and returns plain dataclasses/dicts
+_worker_extractor: Optional[LaravelASTExtractor] = None
+
+
+def _init_worker(project_path: str):
+    """Create the worker-local extractor (parser + compiled queries)"""
+    global _worker_extractor
+    _worker_extractor = LaravelASTExtractor(project_path)
+
+
+def _run_in_worker(method_name: str, php_file: Path) -> Dict:
+    """Call a per-file extraction method on the worker-local extractor"""
+    return getattr(_worker_extractor, method_name)(php_file)
+
+
 def main():
     """Main execution function"""
     import sys
@@ -941,7 +1187,7 @@ def main():
     
     # Output results
     output_file = f'api_documentation.{output_format}'
-    with open(output_file, 'w') as f:
+    with open(output_file, 'w', encoding='utf-8') as f:
         f.write(documentation)
     
     print(f"\n✓ Documentation generated: {output_file}")
@@ -3,96 +3,192 @@
 Linker для повного AST - витягує parameters, types, required, response
 """
 
+import functools
+import hashlib
 import json
+import os
+import re
 import sys
+from collections import deque, namedtuple
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+# Внутрішні записи замість dict: Route::method(...) виклик і route з request/response schemas
+RouteCall = namedtuple('RouteCall', ['method', 'path', 'controller', 'action', 'line', 'source_file'])
+LinkedRoute = namedtuple('LinkedRoute', ['method', 'path', 'controller', 'action', 'parameters', 'response', 'line', 'file'])
+
+# Кеші по id() ноди: ноди живуть в class_index весь час лінкування і не змінюються,
+# тому повторні routes на той самий FormRequest/Resource не обходять AST заново.
+# Дійсні тільки для одного class_index - link_routes_to_schemas очищає їх на старті
+_rules_cache = {}
+_response_cache = {}
+_array_schema_cache = {}
+_scan_cache = {}
+# (id(controller node), action) → (request_params, response_schema) або None, якщо методу немає
+_action_cache = {}
 
 
 def load_ast_streaming(json_file):
-    """Завантажити величезний JSON по частинах"""
+    """
+    Завантажити величезний JSON по частинах - генератор file_data з 'files'
+    З ijson в пам'яті тільки один файл за раз, без нього - весь документ (orjson/json)
+    """
     print(f"[*] Loading {json_file}...")
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return data
+    with open(json_file, 'rb') as f:
+        if ijson is not None:
+            yield from ijson.items(f, 'files.item')
+        elif orjson is not None:
+            yield from orjson.loads(f.read()).get('files', [])
+        else:
+            yield from json.load(f).get('files', [])
 
 
 def get_text(node):
-    """Витягти текст з ноди"""
-    return node.get('text', node.get('text_preview', ''))
+    """Витягти текст з ноди (text_preview читається тільки якщо немає text)"""
+    text = node.get('text')
+    return text if text is not None else node.get('text_preview', '')
+
+
+def index_file_classes(file_data, index):
+    """Додати класи одного файлу в індекс FQN → class node"""
+    # Витягти classes з nodes
+    nodes = file_data.get('nodes') or {}
+    classes = nodes.get('classes')
+    if not classes:
+        return
+
+    # Namespace - один на файл, для всіх його класів
+    namespace = first_namespace(nodes.get('namespaces', ()))
+
+    for class_node in classes:
+        # Знайти class name
+        class_name = None
+        for child in class_node.get('children', []):
+            if child.get('field') == 'name':
+                class_name = get_text(child)
+                break
 
+        if class_name:
+            fqn = f"{namespace}\\{class_name}" if namespace else class_name
+            index[fqn] = {
+                'node': class_node,
+                'file': file_data.get('file'),
+                'short': class_name,
+                'fqn': fqn
+            }
 
-def build_class_index(files):
-    """Індекс всіх класів: FQN → class node"""
-    index = {}
 
-    print("[*] Building class index...")
-    for i, file_data in enumerate(files):
-        if (i+1) % 500 == 0:
-            print(f"    Indexed {i+1}/{len(files)} files...")
-
-        # Витягти classes з nodes
-        for class_node in file_data.get('nodes', {}).get('classes', []):
-            # Знайти namespace
-            namespace = ''
-            for ns_node in file_data.get('nodes', {}).get('namespaces', []):
-                # Витягти namespace name
-                for child in ns_node.get('children', []):
-                    if child.get('field') == 'name':
-                        namespace = get_text(child)
-                        break
+def first_namespace(namespaces):
+    """Ім'я першого namespace з непорожнім name"""
+    for ns_node in namespaces:
+        # Витягти namespace name
+        for child in ns_node.get('children', ()):
+            if child.get('field') == 'name':
+                namespace = get_text(child)
                 if namespace:
-                    break
+                    return namespace
+                break
+    return ''
 
-            # Знайти class name
-            class_name = None
-            for child in class_node.get('children', []):
-                if child.get('field') == 'name':
-                    class_name = get_text(child)
-                    break
 
-            if class_name:
-                fqn = f"{namespace}\\{class_name}" if namespace else class_name
-                index[fqn] = {
-                    'node': class_node,
-                    'file': file_data.get('file')
-                }
+def _index_one_file(file_data):
+    """Воркер для --parallel: класи і routes одного файлу → (class_pairs, routes)"""
+    index = {}
+    routes = []
+    index_file_classes(file_data, index)
+    if is_route_file(file_data):
+        extract_routes_from_file(file_data, routes)
+    return list(index.items()), routes
+
+
+def _map_chunk(fn, chunk):
+    """Воркер для map_bounded: fn по кожному елементу chunk"""
+    return [fn(item) for item in chunk]
+
+
+def map_bounded(executor, fn, items, chunksize=64):
+    """
+    executor.map з обмеженою чергою: в роботі не більше 2 × CPU chunk-ів,
+    наступні items читаються тільки коли видано результат - потік load_ast_streaming
+    не вичитується весь наперед. Порядок результатів той самий, що в items
+    """
+    window = 2 * (os.cpu_count() or 1)
+    items = iter(items)
+    pending = deque()
+    while True:
+        while len(pending) < window:
+            chunk = list(islice(items, chunksize))
+            if not chunk:
+                break
+            pending.append(executor.submit(_map_chunk, fn, chunk))
+        if not pending:
+            return
+        yield from pending.popleft().result()
+
+
+def build_short_index(index):
+    """Коротке ім'я → класи - пошук controller/FormRequest без перебору всього індексу"""
+    short_index = {}
+    for fqn, class_info in index.items():
+        short_index.setdefault(class_info['short'], []).append((fqn, class_info))
+    return short_index
+
+
+def build_resource_index(index):
+    """Resource/Transformer класи в порядку індексу - кандидати для response schema"""
+    resource_index = []
+    for class_info in index.values():
+        class_name = class_info['short']
+        if 'Resource' in class_name or 'Transformer' in class_name:
+            resource_index.append((class_name, class_info))
+    return resource_index
+
+
+def lookup_class(name, class_index, short_index):
+    """
+    Знайти клас, FQN якого містить name
+    Спершу тільки серед класів з тим самим коротким ім'ям (O(1)), потім - повний перебір
+    (часткові/нестандартні імена, як і раніше)
+    """
+    for fqn, class_info in short_index.get(name.rsplit('\\', 1)[-1], ()):
+        if name in fqn:
+            return class_info
+
+    for fqn, class_info in class_index.items():
+        if name in fqn:
+            return class_info
 
-    return index
+    return None
 
 
 def find_validation_rules(class_node):
+    """Знайти validation rules в FormRequest класі (кеш по класу)"""
+    key = id(class_node)
+    rules = _rules_cache.get(key)
+    if rules is None:
+        rules = _rules_cache[key] = _find_validation_rules(class_node)
+    return rules
+
+
+def _find_validation_rules(class_node):
     """Знайти validation rules в FormRequest класі"""
     # Шукаємо метод rules()
-    def find_method(node, name):
-        if node.get('type') == 'method_declaration':
-            for child in node.get('children', []):
-                if child.get('field') == 'name' and get_text(child) == name:
-                    return node
-        for child in node.get('children', []):
-            result = find_method(child, name)
-            if result:
-                return result
-        return None
-
-    rules_method = find_method(class_node, 'rules')
+    rules_method = find_method_in_class(class_node, 'rules')
     if not rules_method:
         return {}
 
     # Знайти return array
-    def find_return_array(node):
-        if node.get('type') == 'return_statement':
-            # Знайти array_creation_expression
-            for child in node.get('children', []):
-                if child.get('type') == 'array_creation_expression':
-                    return child
-                result = find_return_array(child)
-                if result:
-                    return result
-        for child in node.get('children', []):
-            result = find_return_array(child)
-            if result:
-                return result
-        return None
-
     array_node = find_return_array(rules_method)
     if not array_node:
         return {}
@@ -102,112 +198,150 @@ def find_validation_rules(class_node):
     for child in array_node.get('children', []):
         if child.get('type') == 'array_element_initializer':
             # Витягти key => value
-            text = get_text(child)
-            if '=>' in text:
-                parts = text.split('=>', 1)
-                field_name = parts[0].strip().strip("'\"")
-                rules_str = parts[1].strip().strip("'\"")
+            key, sep, value = get_text(child).partition('=>')
+            if sep:
+                field_name = key.strip().strip("'\"")
+                rules_str = value.strip().strip("'\"")
 
                 rules[field_name] = parse_validation_rule(rules_str)
 
     return rules
 
 
+def _set_type(schema_type):
+    def apply(result, arg):
+        result['schema']['type'] = schema_type
+    return apply
+
+
+def _set_flag(flag):
+    def apply(result, arg):
+        result[flag] = True
+    return apply
+
+
+def _set_format(fmt, schema_type=None):
+    def apply(result, arg):
+        if schema_type:
+            result['schema']['type'] = schema_type
+        result['schema']['format'] = fmt
+    return apply
+
+
+def _apply_array(result, arg):
+    schema = result['schema']
+    schema['type'] = 'array'
+    schema['items'] = {'type': 'string'}
+
+
+def _apply_bound(length_key, number_key):
+    """min:/max: - довжина для string, значення для integer/number"""
+    def apply(result, arg):
+        schema = result['schema']
+        schema_type = schema['type']
+        if schema_type == 'string':
+            schema[length_key] = int(arg.partition(':')[0])
+        elif schema_type in ('integer', 'number'):
+            schema[number_key] = int(arg.partition(':')[0])
+    return apply
+
+
+def _apply_in(result, arg):
+    result['schema']['enum'] = [v.strip() for v in arg.split(',')]
+
+
+def _apply_size(result, arg):
+    schema = result['schema']
+    if schema['type'] == 'array':
+        size = int(arg.partition(':')[0])
+        schema['minItems'] = size
+        schema['maxItems'] = size
+
+
+# Правила без параметрів: rule → застосувати до результату
+_EXACT_RULES = {
+    # Required/Optional
+    'required': _set_flag('required'),
+    'nullable': _set_flag('nullable'),
+    'sometimes': _set_flag('nullable'),
+    # Types
+    'integer': _set_type('integer'),
+    'numeric': _set_type('number'),
+    'boolean': _set_type('boolean'),
+    'array': _apply_array,
+    'string': _set_type('string'),
+    # Format
+    'email': _set_format('email'),
+    'url': _set_format('uri'),
+    'date': _set_format('date', 'string'),
+    'datetime': _set_format('date-time', 'string'),
+}
+
+# Правила з параметрами: 'head:arg' → застосувати з arg
+_PREFIX_RULES = {
+    'min': _apply_bound('minLength', 'minimum'),
+    'max': _apply_bound('maxLength', 'maximum'),
+    'in': _apply_in,
+    'email': _set_format('email'),
+    'size': _apply_size,
+}
+
+_apply_email = _EXACT_RULES['email']
+
+# Одне правило з рядка правил: сегмент між '|' → (head, ':' або '', arg), як split('|') + partition(':')
+_RULE_RE = re.compile(r'(?:^|\|)([^|:]*)(:?)([^|]*)')
+
+
+@functools.lru_cache(maxsize=4096)
 def parse_validation_rule(rule_str):
-    """Парсити Laravel validation rule в OpenAPI schema - ПОВНИЙ парсинг"""
-    rules_list = [r.strip() for r in rule_str.split('|')]
-
-    schema = {'type': 'string'}  # default
-    required = False
-    nullable = False
-
-    for rule in rules_list:
-        # Required/Optional
-        if rule == 'required':
-            required = True
-        elif rule in ['nullable', 'sometimes']:
-            nullable = True
-
-        # Types
-        elif rule == 'integer':
-            schema['type'] = 'integer'
-        elif rule == 'numeric':
-            schema['type'] = 'number'
-        elif rule == 'boolean':
-            schema['type'] = 'boolean'
-        elif rule == 'array':
-            schema['type'] = 'array'
-            schema['items'] = {'type': 'string'}
-        elif rule == 'string':
-            schema['type'] = 'string'
-
-        # String constraints
-        elif rule.startswith('min:'):
-            min_val = rule.split(':')[1]
-            if schema.get('type') == 'string':
-                schema['minLength'] = int(min_val)
-            elif schema.get('type') in ['integer', 'number']:
-                schema['minimum'] = int(min_val)
-
-        elif rule.startswith('max:'):
-            max_val = rule.split(':')[1]
-            if schema.get('type') == 'string':
-                schema['maxLength'] = int(max_val)
-            elif schema.get('type') in ['integer', 'number']:
-                schema['maximum'] = int(max_val)
-
-        # Enums
-        elif rule.startswith('in:'):
-            enum_str = rule[3:]
-            schema['enum'] = [v.strip() for v in enum_str.split(',')]
-
-        # Format
-        elif rule.startswith('email'):
-            schema['format'] = 'email'
-        elif rule == 'url':
-            schema['format'] = 'uri'
-        elif rule == 'date':
-            schema['type'] = 'string'
-            schema['format'] = 'date'
-        elif rule == 'datetime':
-            schema['type'] = 'string'
-            schema['format'] = 'date-time'
-
-        # Array size
-        elif rule.startswith('size:'):
-            size = rule.split(':')[1]
-            if schema.get('type') == 'array':
-                schema['minItems'] = int(size)
-                schema['maxItems'] = int(size)
-
-    if nullable:
-        schema['nullable'] = True
-
-    return {'schema': schema, 'required': required, 'nullable': nullable}
-
-
-def extract_routes(files):
-    """Витягти всі routes з files"""
-    print("[*] Extracting routes...")
-    routes = []
+    """
+    Парсити Laravel validation rule в OpenAPI schema - ПОВНИЙ парсинг
+    Кешується по рядку правил ('required|string|max:255' повторюються між полями) -
+    результат спільний, не змінювати
+    """
+    result = {'schema': {'type': 'string'}, 'required': False, 'nullable': False}  # default
+
+    for head, sep, arg in _RULE_RE.findall(rule_str):
+        if sep:
+            # 'head:arg' - пробіли тільки по краях правила
+            head = head.lstrip()
+            apply = _PREFIX_RULES.get(head)
+            if apply is not None:
+                apply(result, arg.rstrip())
+                continue
+        else:
+            head = head.strip()
+            apply = _EXACT_RULES.get(head)
+            if apply is not None:
+                apply(result, '')
+                continue
 
-    for file_data in files:
-        file_path = file_data.get('file', '')
-        if 'routes' not in file_path.lower():
-            continue
+        if head.startswith('email'):
+            _apply_email(result, '')
 
-        for route_call in file_data.get('nodes', {}).get('route_calls', []):
-            # Парсити Route::get('/path', [Controller::class, 'method'])
-            route_info = parse_route_call_node(route_call)
-            if route_info:
-                route_info['source_file'] = file_path
-                routes.append(route_info)
+    if result['nullable']:
+        result['schema']['nullable'] = True
 
-    return routes
+    return result
 
 
-def parse_route_call_node(node):
-    """Парсити Route::method(...) ноду"""
+def is_route_file(file_data):
+    """Файл з routes/ - тільки в них шукаються route_calls"""
+    return 'routes' in file_data.get('file', '').lower()
+
+
+def extract_routes_from_file(file_data, routes):
+    """Додати routes одного файлу routes/"""
+    file_path = file_data.get('file', '')
+    for route_call in file_data.get('nodes', {}).get('route_calls', []):
+        # Парсити Route::get('/path', [Controller::class, 'method'])
+        route_info = parse_route_call_node(route_call, file_path)
+        if route_info:
+            routes.append(route_info)
+
+
+def parse_route_call_node(node, source_file=None):
+    """Парсити Route::method(...) ноду → RouteCall"""
     children = node.get('children', [])
 
     # Знайти scope (Route), name (get/post), arguments
@@ -215,21 +349,22 @@ def parse_route_call_node(node):
     method_text = None
     args_node = None
 
+    # Гарячий цикл (кожен scoped_call_expression) - get_text інлайн
     for child in children:
-        if child.get('field') == 'scope':
-            scope_text = get_text(child)
-        elif child.get('field') == 'name':
-            method_text = get_text(child)
+        field = child.get('field')
+        if field == 'scope':
+            scope_text = child.get('text') or child.get('text_preview', '')
+        elif field == 'name':
+            method_text = child.get('text') or child.get('text_preview', '')
         elif child.get('type') == 'arguments':
             args_node = child
 
     if scope_text != 'Route' or not method_text:
         return None
 
-    route = {
-        'method': method_text.upper(),
-        'line': node.get('start_line')
-    }
+    path = None
+    controller = None
+    action = None
 
     # Парсити arguments
     if args_node:
@@ -237,17 +372,15 @@ def parse_route_call_node(node):
 
         # Path (1st arg)
         if len(arguments) >= 1:
-            path = extract_string_from_arg(arguments[0])
-            if path:
-                route['path'] = path
+            path = extract_string_from_arg(arguments[0]) or None
 
         # Controller (2nd arg)
         if len(arguments) >= 2:
             controller_info = extract_controller_from_arg(arguments[1])
             if controller_info:
-                route.update(controller_info)
+                controller, action = controller_info
 
-    return route
+    return RouteCall(method_text.upper(), path, controller, action, node.get('start_line'), source_file)
 
 
 def extract_string_from_arg(arg_node):
@@ -278,14 +411,21 @@ def extract_controller_from_arg(arg_node):
                             action = get_text(e_child).strip('"\'')
 
             if controller or action:
-                return {'controller': controller, 'action': action}
+                return controller, action
 
     return None
 
 
-def link_routes_to_schemas(routes, class_index):
+def clear_node_caches():
+    """Очистити кеші по id() ноди - id звільнених нод попереднього AST можуть повторитись"""
+    for cache in (_rules_cache, _response_cache, _array_schema_cache, _scan_cache, _action_cache):
+        cache.clear()
+
+
+def link_routes_to_schemas(routes, class_index, short_index, resource_index):
     """Лінкувати routes до FormRequest і JsonResource"""
     print(f"[*] Linking {len(routes)} routes...")
+    clear_node_caches()
 
     linked = []
     for i, route in enumerate(routes):
@@ -293,72 +433,126 @@ def link_routes_to_schemas(routes, class_index):
             print(f"    Linked {i+1}/{len(routes)}...")
 
         # Знайти controller клас
-        controller = route.get('controller')
-        action = route.get('action')
+        controller = route.controller
+        action = route.action
 
         if not controller or not action:
             continue
 
         # Шукати controller в index (може бути з namespace)
-        controller_class = None
-        for fqn, class_info in class_index.items():
-            if controller in fqn:
-                controller_class = class_info
-                break
+        controller_class = lookup_class(controller, class_index, short_index)
 
         if not controller_class:
             continue
 
-        # Знайти метод action в controller
-        method_node = find_method_in_class(controller_class['node'], action)
-        if not method_node:
+        # index/show/store/... одного controller - метод і його schemas резолвляться один раз
+        key = (id(controller_class['node']), action)
+        if key in _action_cache:
+            schemas = _action_cache[key]
+        else:
+            schemas = _action_cache[key] = resolve_action(controller_class, action, class_index, short_index, resource_index)
+        if schemas is None:
             continue
+        request_params, response_schema = schemas
 
-        # Витягти FormRequest з параметрів методу
-        request_params = extract_request_from_method(method_node, class_index)
+        linked.append(LinkedRoute(route.method, route.path, controller, action,
+                                  request_params, response_schema, route.line, route.source_file))
 
-        # Витягти Response з return statements
-        response_schema = extract_response_from_method(method_node, class_index)
+    return linked
 
-        linked.append({
-            'method': route.get('method'),
-            'path': route.get('path'),
-            'controller': controller,
-            'action': action,
-            'parameters': request_params,
-            'response': response_schema,
-            'line': route.get('line'),
-            'file': route.get('source_file')
-        })
 
-    return linked
+def resolve_action(controller_class, action, class_index, short_index, resource_index):
+    """Метод action в controller → (request_params, response_schema); None якщо методу немає"""
+    # Знайти метод action в controller
+    method_node = find_method_in_class(controller_class['node'], action)
+    if not method_node:
+        return None
+
+    # Витягти FormRequest з параметрів методу
+    request_params = extract_request_from_method(method_node, class_index, short_index)
+
+    # Витягти Response з return statements
+    response_schema = extract_response_from_method(method_node, resource_index)
+
+    return request_params, response_schema
 
 
 def find_method_in_class(class_node, method_name):
-    """Знайти метод в класі"""
-    def search(node):
+    """Знайти метод в класі (ітеративний DFS в порядку документа)"""
+    stack = [class_node]
+    # Локальні посилання на методи - без пошуку атрибутів на кожній ноді
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        node = pop()
+        children = node.get('children', ())
         if node.get('type') == 'method_declaration':
-            for child in node.get('children', []):
-                if child.get('field') == 'name' and get_text(child) == method_name:
+            for child in children:
+                # get_text інлайн - викликається для кожного методу кожного класу
+                if child.get('field') == 'name' and (child.get('text') or child.get('text_preview', '')) == method_name:
                     return node
-        for child in node.get('children', []):
-            result = search(child)
-            if result:
-                return result
-        return None
+        if children:
+            extend(reversed(children))
+    return None
 
-    return search(class_node)
 
+def find_return_array(root):
+    """
+    Знайти array_creation_expression - пряму дитину return_statement
+    Ітеративний DFS в порядку документа: стек (нода, чи батько - return)
+    """
+    stack = [(root, False)]
+    pop = stack.pop
+    append = stack.append
+    while stack:
+        node, in_return = pop()
+        node_type = node.get('type')
+        if in_return and node_type == 'array_creation_expression':
+            return node
+        is_return = node_type == 'return_statement'
+        for child in reversed(node.get('children', ())):
+            append((child, is_return))
+    return None
 
-def extract_request_from_method(method_node, class_index):
-    """Витягти FormRequest параметри з методу"""
-    # Знайти parameters
+
+def scan_method(method_node):
+    """
+    Один обхід методу для request і response (кеш по методу):
+    (formal_parameters - пряма дитина методу, [return_statement в порядку документа])
+    """
+    key = id(method_node)
+    scan = _scan_cache.get(key)
+    if scan is not None:
+        return scan
+
+    children = method_node.get('children', [])
     params_node = None
-    for child in method_node.get('children', []):
+    for child in children:
         if child.get('type') == 'formal_parameters':
             params_node = child
             break
 
+    returns = []
+    stack = list(reversed(children))
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        node = pop()
+        if node.get('type') == 'return_statement':
+            returns.append(node)
+        grandchildren = node.get('children')
+        if grandchildren:
+            extend(reversed(grandchildren))
+
+    scan = _scan_cache[key] = (params_node, returns)
+    return scan
+
+
+def extract_request_from_method(method_node, class_index, short_index):
+    """Витягти FormRequest параметри з методу"""
+    # Знайти parameters
+    params_node, _ = scan_method(method_node)
+
     if not params_node:
         return {}
 
@@ -374,36 +568,36 @@ def extract_request_from_method(method_node, class_index):
 
             if param_type and 'Request' in param_type:
                 # Знайти FormRequest клас
-                for fqn, class_info in class_index.items():
-                    if param_type in fqn:
-                        # Витягти validation rules
-                        rules = find_validation_rules(class_info['node'])
-                        return rules
+                class_info = lookup_class(param_type, class_index, short_index)
+                if class_info:
+                    # Витягти validation rules
+                    rules = find_validation_rules(class_info['node'])
+                    return rules
 
     return {}
 
 
-def extract_response_from_method(method_node, class_index):
+def extract_response_from_method(method_node, resource_index):
+    """Витягти response schema з return statements (кеш по методу)"""
+    key = id(method_node)
+    schema = _response_cache.get(key)
+    if schema is None:
+        schema = _response_cache[key] = _extract_response_from_method(method_node, resource_index)
+    return schema
+
+
+def _extract_response_from_method(method_node, resource_index):
     """Витягти response schema з return statements"""
     # Знайти всі return statements
-    def find_returns(node):
-        returns = []
-        if node.get('type') == 'return_statement':
-            returns.append(node)
-        for child in node.get('children', []):
-            returns.extend(find_returns(child))
-        return returns
-
-    returns = find_returns(method_node)
+    _, returns = scan_method(method_node)
 
     for ret_node in returns:
         # Шукати new JsonResource(...) або return UserResource::collection(...)
         text = get_text(ret_node)
 
-        # Знайти class names в return
-        for fqn, class_info in class_index.items():
-            class_name = fqn.split('\\')[-1]
-            if ('Resource' in class_name or 'Transformer' in class_name) and class_name in text:
+        # Знайти class names в return (тільки серед Resource/Transformer)
+        for class_name, class_info in resource_index:
+            if class_name in text:
                 # Знайти toArray() або transform() метод
                 to_array = find_method_in_class(class_info['node'], 'toArray')
                 if not to_array:
@@ -418,20 +612,17 @@ def extract_response_from_method(method_node, class_index):
 
 
 def extract_array_schema_from_method(method_node):
+    """Витягти schema з toArray() методу (кеш по методу)"""
+    key = id(method_node)
+    schema = _array_schema_cache.get(key)
+    if schema is None:
+        schema = _array_schema_cache[key] = _extract_array_schema_from_method(method_node)
+    return schema
+
+
+def _extract_array_schema_from_method(method_node):
     """Витягти schema з toArray() методу"""
     # Знайти return array
-    def find_return_array(node):
-        if node.get('type') == 'return_statement':
-            for child in node.get('children', []):
-                if child.get('type') == 'array_creation_expression':
-                    return child
-                r = find_return_array(child)
-                if r: return r
-        for child in node.get('children', []):
-            r = find_return_array(child)
-            if r: return r
-        return None
-
     array_node = find_return_array(method_node)
     if not array_node:
         return {}
@@ -441,11 +632,10 @@ def extract_array_schema_from_method(method_node):
 
     for child in array_node.get('children', []):
         if child.get('type') == 'array_element_initializer':
-            text = get_text(child)
-            if '=>' in text:
-                parts = text.split('=>', 1)
-                field_name = parts[0].strip().strip('"\'')
-                field_value = parts[1].strip()
+            key, sep, value = get_text(child).partition('=>')
+            if sep:
+                field_name = key.strip().strip('"\'')
+                field_value = value.strip()
 
                 # Визначити тип
                 field_schema = {'type': 'string'}  # default
@@ -469,126 +659,218 @@ def extract_array_schema_from_method(method_node):
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python linker_full.py <ast_full.json>")
-        sys.exit(1)
+    # --parallel - індекс/routes по файлах у воркер-процесах (для великих проектів)
+    flags = {a for a in sys.argv[1:] if a.startswith('--')}
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
 
-    data = load_ast_streaming(sys.argv[1])
-
-    files = data.get('files', [])
-    print(f"[*] Total files: {len(files)}")
+    if not args:
+        print("Usage: python linker_full.py <ast_full.json> [--parallel]")
+        sys.exit(1)
 
-    # Build index
-    class_index = build_class_index(files)
+    # Один потоковий прохід по files: індекс класів + routes, без списку всіх файлів в пам'яті
+    print("[*] Building class index and extracting routes...")
+    class_index = {}
+    routes = []
+    total = 0
+    files = load_ast_streaming(args[0])
+    if '--parallel' in flags:
+        # Файли незалежні → паралельно; map_bounded зберігає порядок, тому індекс той самий, що й послідовно
+        with ProcessPoolExecutor() as executor:
+            for total, (class_pairs, file_routes) in enumerate(map_bounded(executor, _index_one_file, files), 1):
+                if total % 500 == 0:
+                    print(f"    Processed {total} files...")
+                class_index.update(class_pairs)
+                routes.extend(file_routes)
+    else:
+        for total, file_data in enumerate(files, 1):
+            if total % 500 == 0:
+                print(f"    Processed {total} files...")
+            index_file_classes(file_data, class_index)
+            if is_route_file(file_data):
+                extract_routes_from_file(file_data, routes)
+
+    short_index = build_short_index(class_index)
+    resource_index = build_resource_index(class_index)
+    print(f"[*] Total files: {total}")
     print(f"[*] Indexed {len(class_index)} classes")
-
-    # Extract routes
-    routes = extract_routes(files)
     print(f"[*] Found {len(routes)} routes")
 
     # Link routes to schemas
-    linked = link_routes_to_schemas(routes, class_index)
+    linked = link_routes_to_schemas(routes, class_index, short_index, resource_index)
     print(f"[*] Linked {len(linked)} routes with full schemas")
 
     # Generate OpenAPI
     print(f"\n[*] Generating OpenAPI...")
-    openapi = generate_openapi_full(linked)
-
     output_file = 'openapi_full.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(openapi, f, indent=2, ensure_ascii=False)
+    path_count = write_openapi_full(linked, output_file)
 
     print(f"\n[+] Done! Output: {output_file}")
-    print(f"    Paths: {len(openapi['paths'])}")
+    print(f"    Paths: {path_count}")
     print(f"    Total endpoints: {len(linked)}")
 
     # Show stats
-    with_params = sum(1 for r in linked if r.get('parameters'))
-    with_response = sum(1 for r in linked if r.get('response'))
+    with_params = sum(1 for r in linked if r.parameters)
+    with_response = sum(1 for r in linked if r.response)
     print(f"\n[*] Coverage:")
     print(f"    With request params: {with_params}/{len(linked)} ({with_params*100//len(linked) if linked else 0}%)")
     print(f"    With response schema: {with_response}/{len(linked)} ({with_response*100//len(linked) if linked else 0}%)")
 
 
-def generate_openapi_full(routes):
-    """Генерувати повний OpenAPI з parameters і response"""
-    paths = {}
-
+def schema_ref(schema, prefix, components, refs):
+    """
+    Винести schema в components/schemas і повернути {'$ref': ...}
+    Однакові schema (по вмісту) - один компонент: refs = hash → ім'я компонента
+    """
+    key = None
+    if orjson is not None:
+        try:
+            key = orjson.dumps(schema, option=orjson.OPT_SORT_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    if key is None:
+        key = json.dumps(schema, sort_keys=True).encode('utf-8')
+    digest = hashlib.sha1(key).hexdigest()[:12]
+
+    name = refs.get(digest)
+    if name is None:
+        name = refs[digest] = f"{prefix}{digest}"
+        components[name] = schema
+    return {'$ref': f"#/components/schemas/{name}"}
+
+
+OPENAPI_INFO = {
+    'title': 'Laravel API - Full AST Analysis',
+    'version': '1.0.0'
+}
+
+
+def group_routes_by_path(routes):
+    """path → {method: route} в порядку routes; повторний path+method замінює попередній"""
+    grouped = {}
     for route in routes:
-        path = route.get('path')
-        method = route.get('method', 'GET').lower()
+        path = route.path
+        method = route.method.lower()
 
         if not path or method not in ['get', 'post', 'put', 'patch', 'delete']:
             continue
 
-        if path not in paths:
-            paths[path] = {}
+        grouped.setdefault(path, {})[method] = route
+    return grouped
 
-        # Build operation
-        operation = {
-            'summary': f"{method.upper()} {path}",
-            'description': f"{route.get('controller', 'Unknown')}.{route.get('action', 'unknown')}()",
-            'responses': {}
-        }
 
-        # Add request parameters
-        params = route.get('parameters', {})
-        if params and method in ['post', 'put', 'patch']:
-            properties = {}
-            required = []
-
-            for field, rule_info in params.items():
-                properties[field] = rule_info['schema']
-                if rule_info.get('required'):
-                    required.append(field)
-
-            operation['requestBody'] = {
-                'required': bool(required),
-                'content': {
-                    'application/json': {
-                        'schema': {
-                            'type': 'object',
-                            'properties': properties
-                        }
-                    }
+def build_operation(route, components, refs):
+    """OpenAPI operation для одного route (request/response schema - через $ref)"""
+    path = route.path
+    method = route.method.lower()
+
+    # Build operation
+    operation = {
+        'summary': f"{method.upper()} {path}",
+        'description': f"{route.controller}.{route.action}()",
+        'responses': {}
+    }
+
+    # Add request parameters
+    params = route.parameters
+    if params and method in ['post', 'put', 'patch']:
+        properties = {}
+        required = []
+
+        for field, rule_info in params.items():
+            properties[field] = rule_info['schema']
+            if rule_info.get('required'):
+                required.append(field)
+
+        schema = {
+            'type': 'object',
+            'properties': properties
+        }
+        if required:
+            schema['required'] = required
+
+        operation['requestBody'] = {
+            'required': bool(required),
+            'content': {
+                'application/json': {
+                    'schema': schema_ref(schema, 'Request', components, refs)
                 }
             }
+        }
 
-            if required:
-                operation['requestBody']['content']['application/json']['schema']['required'] = required
-
-        # Add response schema
-        response = route.get('response', {})
-        if response:
-            operation['responses']['200'] = {
-                'description': 'Success',
-                'content': {
-                    'application/json': {
-                        'schema': response
-                    }
+    # Add response schema
+    response = route.response
+    if response:
+        operation['responses']['200'] = {
+            'description': 'Success',
+            'content': {
+                'application/json': {
+                    'schema': schema_ref(response, 'Response', components, refs)
                 }
             }
-        else:
-            operation['responses']['200'] = {
-                'description': 'Success',
-                'content': {
-                    'application/json': {
-                        'schema': {'type': 'object'}
-                    }
+        }
+    else:
+        operation['responses']['200'] = {
+            'description': 'Success',
+            'content': {
+                'application/json': {
+                    'schema': {'type': 'object'}
                 }
             }
+        }
 
-        paths[path][method] = operation
+    return operation
+
+
+def dump_json_bytes(data):
+    """
+    JSON з indent=2 → bytes - через orjson якщо встановлений, інакше stdlib json
+
+    orjson не серіалізує вкладеність глибше ~128 рівнів - тоді той самий вивід дає stdlib json
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def dump_member(key, value, level):
+    """'"key": value' на рівні вкладеності level - як у dump_json_bytes всього документа"""
+    pad = b'  ' * level
+    return pad + dump_json_bytes(key) + b': ' + dump_json_bytes(value).replace(b'\n', b'\n' + pad)
+
+
+def write_openapi_full(routes, output_file):
+    """
+    Записати OpenAPI потоково, path за path - без dict всіх paths в пам'яті
+    Вивід - dump_json_bytes документа {openapi, info, paths, components}; повертає кількість paths
+    """
+    components = {}
+    refs = {}
+    grouped = group_routes_by_path(routes)
+
+    with open(output_file, 'wb', buffering=1 << 20) as out:
+        out.write(b'{\n')
+        out.write(dump_member('openapi', '3.0.3', 1) + b',\n')
+        out.write(dump_member('info', OPENAPI_INFO, 1) + b',\n')
+
+        if grouped:
+            out.write(b'  "paths": {\n')
+            for i, (path, methods) in enumerate(grouped.items()):
+                if i:
+                    out.write(b',\n')
+                operations = {method: build_operation(route, components, refs) for method, route in methods.items()}
+                out.write(dump_member(path, operations, 2))
+            out.write(b'\n  },\n')
+        else:
+            out.write(b'  "paths": {},\n')
 
-    return {
-        'openapi': '3.0.3',
-        'info': {
-            'title': 'Laravel API - Full AST Analysis',
-            'version': '1.0.0'
-        },
-        'paths': paths
-    }
+        # components/schemas заповнюються build_operation - пишуться після paths
+        out.write(dump_member('components', {'schemas': components}, 1))
+        out.write(b'\n}')
 
+    return len(grouped)
 
 if __name__ == '__main__':
     main()
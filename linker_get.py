@@ -4,56 +4,177 @@ Linker для GET endpoints - витягує тільки response schemas
 """
 
 import json
+import os
+import re
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Обходи AST ітеративні; рекурсивним лишається тільки stdlib json.load (fallback без ijson/orjson),
+# на глибоких AST великих файлів він перевищує стандартний ліміт 1000
+sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+
+
+@dataclass(slots=True)
+class RouteInfo:
+    """Route::get('/path', [Controller::class, 'method'])"""
+    path: str
+    controller: str
+    action: str
+    line: int
+    file: str
+
+
+@dataclass(slots=True)
+class ClassEntry:
+    """Запис індексу класів; methods - ім'я → method_declaration, заповнюється get_methods()"""
+    node: dict
+    file: str
+    methods: dict = None
+
+
+# Типи нод, в піддереві яких немає declarations, return чи Route:: викликів - обхід в них не спускається
+_LEAF_TYPES = frozenset({
+    'string', 'encapsed_string', 'heredoc', 'nowdoc', 'comment',
+    'name', 'variable_name', 'qualified_name', 'namespace_name', 'named_type',
+    'integer', 'float', 'boolean', 'null', 'namespace_use_declaration',
+})
+
+# Кеші по id() ноди: ноди живуть в class_index весь час роботи і не змінюються,
+# тому routes на той самий метод/Resource не обходять AST заново
+_schema_cache = {}
+_resource_schema_cache = {}
 
 
 def get_text(node):
-    """Витягти текст з ноди"""
-    if 'text' in node:
-        return node['text']
-    if 'text_preview' in node:
-        return node['text_preview']
-    return ''
+    """Витягти текст з ноди (text_preview читається тільки якщо немає text)"""
+    text = node.get('text')
+    return text if text is not None else node.get('text_preview', '')
+
+
+def load_files(json_file):
+    """
+    file_data з 'files' по одному - з ijson в пам'яті тільки один файл за раз,
+    без нього - весь документ (orjson/json)
+    """
+    with open(json_file, 'rb') as f:
+        if ijson is not None:
+            yield from ijson.items(f, 'files.item')
+        elif orjson is not None:
+            yield from orjson.loads(f.read())['files']
+        else:
+            yield from json.load(f)['files']
+
+
+def is_route_file(file_data):
+    """Файл з routes/ - тільки в них шукаються Route::get()"""
+    return 'routes' in file_data.get('file', '').lower()
+
+
+def scan_file(file_data):
+    """Класи і GET routes одного файлу → (class_pairs, routes) - один прохід по stream"""
+    return index_file(file_data), routes_in_file(file_data) if is_route_file(file_data) else []
+
+
+def _map_chunk(fn, chunk):
+    """Воркер для map_bounded - fn по кожному файлу chunk"""
+    return [fn(item) for item in chunk]
+
+
+def map_bounded(executor, fn, items, chunksize=32):
+    """
+    Як executor.map, але items не вичитуються всі наперед: в черзі до 2 × CPU chunk-ів,
+    наступний chunk подається після видачі результату попереднього (порядок зберігається)
+    """
+    window = 2 * (os.cpu_count() or 1)
+    items = iter(items)
+    pending = deque()
+    while True:
+        while len(pending) < window:
+            chunk = list(islice(items, chunksize))
+            if not chunk:
+                break
+            pending.append(executor.submit(_map_chunk, fn, chunk))
+        if not pending:
+            return
+        yield from pending.popleft().result()
+
+
+def scan_files(files, executor=None):
+    """
+    Один прохід по files (список або stream з load_files): індекс класів FQN → class_info + GET routes
+    Route walk тільки для файлів routes/, решта лише індексуються
+    executor - по файлах у воркер-процесах (map_bounded - stream читається по мірі обробки), порядок той самий
+    Повертає (class_index, routes, кількість файлів)
+    """
+    class_index = {}
+    routes = []
+    total = 0
 
+    per_file = map_bounded(executor, scan_file, files) if executor else map(scan_file, files)
+    for total, (class_pairs, file_routes) in enumerate(per_file, 1):
+        if total % 500 == 0:
+            print(f"    {total}...")
+        class_index.update(class_pairs)
+        if file_routes:
+            routes.extend(file_routes)
 
-def find_routes(files):
-    """Знайти всі GET routes"""
-    routes = []
+    return class_index, routes, total
 
-    for file_data in files:
-        file_path = file_data.get('file', '')
-        if 'routes' not in file_path.lower():
-            continue
 
-        # Рекурсивно шукаємо Route::get() в AST
-        def search_routes(node):
-            if node.get('type') == 'scoped_call_expression':
-                children = node.get('children', [])
+def routes_in_file(file_data):
+    """GET routes одного файлу"""
+    routes = []
+    collect_get_routes(file_data['ast'], routes, file_data.get('file', ''))
+    return routes
 
-                scope = None
-                method = None
-                args = None
 
-                for child in children:
-                    if child.get('field') == 'scope':
-                        scope = get_text(child)
-                    elif child.get('field') == 'name':
-                        method = get_text(child)
-                    elif child.get('type') == 'arguments':
-                        args = child
+def collect_get_routes(ast_node, routes, file_path):
+    """Додати в routes всі Route::get() з AST файлу (ітеративний DFS в порядку документа)"""
+    stack = [ast_node]
+    while stack:
+        node = stack.pop()
+        children = node.get('children')
+        node_type = node.get('type')
 
-                if scope == 'Route' and method and method.upper() == 'GET':
-                    # Парсити GET route
-                    route_info = parse_get_route(args, node.get('start_line'), file_path)
-                    if route_info:
-                        routes.append(route_info)
+        if node_type == 'scoped_call_expression' and children:
+            scope = None
+            method = None
+            args = None
 
-            for child in node.get('children', []):
-                search_routes(child)
+            for child in children:
+                if child.get('field') == 'scope':
+                    scope = get_text(child)
+                elif child.get('field') == 'name':
+                    method = get_text(child)
+                elif child.get('type') == 'arguments':
+                    args = child
 
-        search_routes(file_data['ast'])
+            if scope == 'Route' and method and method.upper() == 'GET':
+                # Парсити GET route
+                route_info = parse_get_route(args, node.get('start_line'), file_path)
+                if route_info:
+                    routes.append(route_info)
 
-    return routes
+        if children and node_type not in _LEAF_TYPES:
+            stack.extend(reversed(children))
 
 
 def parse_get_route(args_node, line, file_path):
@@ -61,98 +182,177 @@ def parse_get_route(args_node, line, file_path):
     if not args_node:
         return None
 
-    arguments = [c for c in args_node.get('children', []) if c.get('type') == 'argument']
+    # Потрібні тільки перші два argument - без списку всіх
+    arguments = (c for c in args_node.get('children', ()) if c.get('type') == 'argument')
+    path_arg = next(arguments, None)
+    handler_arg = next(arguments, None)
 
-    if len(arguments) < 2:
+    if handler_arg is None:
         return None
 
     # Path
     path = None
-    for child in arguments[0].get('children', []):
+    for child in path_arg.get('children', ()):
         if child.get('type') == 'string':
             path = get_text(child).strip('"\'')
             break
 
-    # Controller + action
+    # Controller + action: тільки з [Controller::class, 'method'] - елементи масиву-аргументу,
+    # без спуску в вкладені вирази (тернарні, виклики, closures)
     controller = None
     action = None
 
-    for child in arguments[1].get('children', []):
-        if child.get('type') == 'array_creation_expression':
-            for elem in child.get('children', []):
-                if elem.get('type') == 'array_element_initializer':
-                    for e in elem.get('children', []):
-                        if e.get('type') == 'class_constant_access_expression':
-                            for cc in e.get('children', []):
-                                if cc.get('is_named'):
-                                    controller = get_text(cc)
-                                    break
-                        elif e.get('type') == 'string':
-                            action = get_text(e).strip('"\'')
+    for child in handler_arg.get('children', ()):
+        if child.get('type') != 'array_creation_expression':
+            continue
+        for elem in child.get('children', ()):
+            if elem.get('type') != 'array_element_initializer':
+                continue
+            for e in elem.get('children', ()):
+                e_type = e.get('type')
+                if e_type == 'class_constant_access_expression':
+                    for cc in e.get('children', ()):
+                        if cc.get('is_named'):
+                            controller = get_text(cc)
+                            break
+                elif e_type == 'string':
+                    action = get_text(e).strip('"\'')
 
     if not path or not controller or not action:
         return None
 
-    return {
-        'path': path,
-        'controller': controller,
-        'action': action,
-        'line': line,
-        'file': file_path
-    }
+    return RouteInfo(path, controller, action, line, file_path)
 
 
-def build_class_index(files):
-    """Індекс класів по FQN"""
-    print("[*] Building class index...")
-    index = {}
+def index_file(file_data):
+    """[(FQN, class_info), ...] класів одного файлу"""
+    # Знайти namespace
+    namespace = find_namespace(file_data['ast'])
 
-    for i, file_data in enumerate(files):
-        if (i+1) % 500 == 0:
-            print(f"    {i+1}/{len(files)}...")
+    # Знайти класи
+    classes = find_classes(file_data['ast'])
 
-        # Знайти namespace
-        namespace = find_namespace(file_data['ast'])
+    class_pairs = []
+    for cls in classes:
+        class_name = cls['name']
+        fqn = f"{namespace}\\{class_name}" if namespace else class_name
 
-        # Знайти класи
-        classes = find_classes(file_data['ast'])
+        class_pairs.append((fqn, ClassEntry(cls['node'], file_data['file'])))
 
-        for cls in classes:
-            class_name = cls['name']
-            fqn = f"{namespace}\\{class_name}" if namespace else class_name
+    return class_pairs
 
-            index[fqn] = {
-                'node': cls['node'],
-                'file': file_data['file']
-            }
 
-    return index
+def build_short_index(index):
+    """Коротке ім'я → [(FQN, class_info), ...] в порядку індексу - пошук controller без перебору всього індексу"""
+    short_index = {}
+    for fqn, class_info in index.items():
+        short_index.setdefault(fqn.rsplit('\\', 1)[-1], []).append((fqn, class_info))
+    return short_index
 
 
-def find_namespace(ast_node):
-    """Знайти namespace в AST"""
-    def search(node):
-        if node.get('type') == 'namespace_definition':
-            for child in node.get('children', []):
-                if child.get('field') == 'name':
-                    return get_text(child)
-        for child in node.get('children', []):
-            result = search(child)
-            if result:
-                return result
+def build_resource_index(index):
+    """Resource/Transformer класи в порядку індексу - кандидати для response schema"""
+    resource_index = []
+    for fqn, class_info in index.items():
+        class_name = fqn.rsplit('\\', 1)[-1]
+        if 'Resource' in class_name or 'Transformer' in class_name:
+            resource_index.append((class_name, class_info))
+    return resource_index
+
+
+def build_resource_automaton(resource_index):
+    """
+    Aho-Corasick по коротких іменах resource_index: ім'я → позиції в resource_index
+    None без pyahocorasick - тоді matching_resources перебирає список
+    """
+    if ahocorasick is None or not resource_index:
         return None
 
-    return search(ast_node) or ''
+    positions = {}
+    for pos, (class_name, _) in enumerate(resource_index):
+        positions.setdefault(class_name, []).append(pos)
+
+    automaton = ahocorasick.Automaton()
+    for class_name, class_positions in positions.items():
+        automaton.add_word(class_name, class_positions)
+    automaton.make_automaton()
+    return automaton
+
+
+def matching_resources(text, resource_index, automaton=None):
+    """
+    Resource/Transformer класи, ім'я яких є підрядком text - в порядку resource_index
+    Генератор: перевірка зупиняється, щойно caller знайшов schema
+    """
+    if automaton is None:
+        for entry in resource_index:
+            if entry[0] in text:
+                yield entry
+        return
+
+    # Один прохід по text для всіх імен; порядок - як при переборі resource_index
+    found = set()
+    for _, class_positions in automaton.iter(text):
+        found.update(class_positions)
+    for pos in sorted(found):
+        yield resource_index[pos]
+
+
+def lookup_class(name, class_index, short_index):
+    """
+    Знайти клас, FQN якого містить name
+    Спершу тільки серед класів з тим самим коротким ім'ям (O(1)), потім - повний перебір
+    """
+    for fqn, class_info in short_index.get(name.rsplit('\\', 1)[-1], ()):
+        if name in fqn:
+            return class_info
+
+    for fqn, class_info in class_index.items():
+        if name in fqn:
+            return class_info
+
+    return None
+
+
+def find_namespace(ast_node):
+    """Знайти namespace в AST (ітеративний DFS в порядку документа)"""
+    stack = [ast_node]
+    while stack:
+        node = stack.pop()
+        children = node.get('children')
+        node_type = node.get('type')
+        if not children or node_type in _LEAF_TYPES:
+            continue
+
+        if node_type == 'namespace_definition':
+            name = next((child for child in children if child.get('field') == 'name'), None)
+            if name is not None:
+                # Порожнє ім'я - namespace пропускається разом з піддеревом
+                namespace = get_text(name)
+                if namespace:
+                    return namespace
+                continue
+
+        stack.extend(reversed(children))
+
+    return ''
 
 
 def find_classes(ast_node):
     """Знайти всі class_declaration в AST"""
     classes = []
 
-    def search(node):
-        if node.get('type') == 'class_declaration':
+    stack = [ast_node]
+    while stack:
+        node = stack.pop()
+        children = node.get('children')
+        node_type = node.get('type')
+        if not children or node_type in _LEAF_TYPES:
+            continue
+
+        if node_type == 'class_declaration':
             # Знайти ім'я класу
-            for child in node.get('children', []):
+            for child in children:
                 if child.get('field') == 'name':
                     classes.append({
                         'name': get_text(child),
@@ -160,79 +360,124 @@ def find_classes(ast_node):
                     })
                     break
 
-        for child in node.get('children', []):
-            search(child)
+        stack.extend(reversed(children))
 
-    search(ast_node)
     return classes
 
 
-def find_method_in_class(class_node, method_name):
+def find_method_in_class(class_info, method_name):
     """Знайти метод в класі"""
-    def search(node):
-        if node.get('type') == 'method_declaration':
-            for child in node.get('children', []):
-                if child.get('field') == 'name' and get_text(child) == method_name:
-                    return node
-        for child in node.get('children', []):
-            result = search(child)
-            if result:
-                return result
-        return None
+    return get_methods(class_info).get(method_name)
+
+
+def get_methods(class_info):
+    """
+    Ім'я → method_declaration класу, будується при першому зверненні і зберігається в class_info
+    Ітеративний DFS в порядку документа; при однакових іменах - перший, як і пошук по одному
+    """
+    methods = class_info.methods
+    if methods is not None:
+        return methods
+
+    methods = class_info.methods = {}
+    stack = [class_info.node]
+    while stack:
+        node = stack.pop()
+        children = node.get('children')
+        node_type = node.get('type')
+        if not children or node_type in _LEAF_TYPES:
+            continue
 
-    return search(class_node)
+        if node_type == 'method_declaration':
+            for child in children:
+                if child.get('field') == 'name':
+                    methods.setdefault(get_text(child), node)
 
+        stack.extend(reversed(children))
 
-def extract_response_schema(method_node, class_index):
-    """Витягти response schema з return statements"""
-    # Знайти return statements
-    returns = []
+    return methods
+
+
+def extract_response_schema(method_node, resource_index, resource_automaton=None):
+    """Витягти response schema з return statements (кеш по методу)"""
+    key = id(method_node)
+    schema = _schema_cache.get(key)
+    if schema is None:
+        schema = _schema_cache[key] = _extract_response_schema(method_node, resource_index, resource_automaton)
+    return schema
 
-    def find_returns(node):
-        if node.get('type') == 'return_statement':
-            returns.append(node)
-        for child in node.get('children', []):
-            find_returns(child)
 
-    find_returns(method_node)
+def _extract_response_schema(method_node, resource_index, resource_automaton):
+    """Витягти response schema з return statements"""
+    # Знайти return statements - текст кожного береться один раз
+    return_texts = [get_text(ret_node) for ret_node in find_returns(method_node)]
 
     # Шукати Resource/Transformer в return
-    for ret_node in returns:
-        ret_text = get_text(ret_node)
+    for ret_text in return_texts:
+        # Перший Resource клас з непорожньою schema - інші для цього return вже не перевіряються
+        for _, class_info in matching_resources(ret_text, resource_index, resource_automaton):
+            schema = resource_schema(class_info)
+            if schema and schema.get('properties'):
+                return schema
 
-        # Знайти Resource клас
-        for fqn, class_info in class_index.items():
-            class_name = fqn.split('\\')[-1]
+    return {}
 
-            if ('Resource' in class_name or 'Transformer' in class_name) and class_name in ret_text:
-                # Знайти toArray() або transform()
-                to_array = find_method_in_class(class_info['node'], 'toArray')
-                if not to_array:
-                    to_array = find_method_in_class(class_info['node'], 'transform')
 
-                if to_array:
-                    schema = parse_to_array_method(to_array)
-                    if schema and schema.get('properties'):
-                        return schema
+def find_returns(root):
+    """Всі return_statement в порядку документа (ітеративний DFS)"""
+    returns = []
 
-    return {}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        node_type = node.get('type')
+        if node_type == 'return_statement':
+            returns.append(node)
+        children = node.get('children')
+        if children and node_type not in _LEAF_TYPES:
+            stack.extend(reversed(children))
+
+    return returns
+
+
+def find_return_array(root):
+    """
+    Знайти array_creation_expression - пряму дитину return_statement
+    Ітеративний DFS в порядку документа: стек (нода, чи батько - return)
+    """
+    stack = [(root, False)]
+    while stack:
+        node, in_return = stack.pop()
+        node_type = node.get('type')
+        if in_return and node_type == 'array_creation_expression':
+            return node
+        children = node.get('children')
+        if children and node_type not in _LEAF_TYPES:
+            is_return = node_type == 'return_statement'
+            stack.extend((child, is_return) for child in reversed(children))
+    return None
+
+
+def resource_schema(class_info):
+    """Schema Resource/Transformer класу з toArray() або transform() (кеш по класу)"""
+    key = id(class_info.node)
+    schema = _resource_schema_cache.get(key)
+    if schema is not None:
+        return schema
+
+    # Знайти toArray() або transform()
+    to_array = find_method_in_class(class_info, 'toArray')
+    if not to_array:
+        to_array = find_method_in_class(class_info, 'transform')
+
+    schema = parse_to_array_method(to_array) if to_array else {}
+    _resource_schema_cache[key] = schema
+    return schema
 
 
 def parse_to_array_method(method_node):
     """Парсити toArray() метод → OpenAPI schema"""
     # Знайти return array
-    def find_return_array(node):
-        if node.get('type') == 'return_statement':
-            for child in node.get('children', []):
-                if child.get('type') == 'array_creation_expression':
-                    return child
-                r = find_return_array(child)
-                if r: return r
-        for child in node.get('children', []):
-            r = find_return_array(child)
-            if r: return r
-        return None
-
     array_node = find_return_array(method_node)
     if not array_node:
         return {}
@@ -275,29 +520,42 @@ def parse_to_array_method(method_node):
     return schema
 
 
+# Шаблони назв полів для infer_type_from_value (підрядок будь-де в назві, як і раніше)
+_INTEGER_FIELD_RE = re.compile(r'id|count|number|amount|quantity')
+_BOOLEAN_FIELD_RE = re.compile(r'is_|has_|can_|should_')
+_DATE_FIELD_RE = re.compile(r'_at|date|time')
+
+# Спільні schema-константи - лише читаються серіалізатором, не змінювати
+_INTEGER_SCHEMA = {'type': 'integer'}
+_BOOLEAN_SCHEMA = {'type': 'boolean'}
+_DATE_TIME_SCHEMA = {'type': 'string', 'format': 'date-time'}
+_ARRAY_SCHEMA = {'type': 'array', 'items': {'type': 'object'}}
+_STRING_SCHEMA = {'type': 'string'}
+
+
 def infer_type_from_value(field_name, field_value):
     """Визначити тип поля по назві і значенню"""
-    # ID, counters
-    if any(x in field_name for x in ['_id', 'id', 'count', 'number', 'amount', 'quantity']):
-        return {'type': 'integer'}
+    # ID, counters ('_id' вже покривається 'id')
+    if _INTEGER_FIELD_RE.search(field_name):
+        return _INTEGER_SCHEMA
 
     # Booleans
-    if any(x in field_name for x in ['is_', 'has_', 'can_', 'should_']):
-        return {'type': 'boolean'}
+    if _BOOLEAN_FIELD_RE.search(field_name):
+        return _BOOLEAN_SCHEMA
 
     # Dates
-    if any(x in field_name for x in ['_at', 'date', 'time']):
-        return {'type': 'string', 'format': 'date-time'}
+    if _DATE_FIELD_RE.search(field_name):
+        return _DATE_TIME_SCHEMA
 
     # Arrays
     if '[' in field_value or 'array' in field_value.lower():
-        return {'type': 'array', 'items': {'type': 'object'}}
+        return _ARRAY_SCHEMA
 
     # Default
-    return {'type': 'string'}
+    return _STRING_SCHEMA
 
 
-def link_get_routes(routes, class_index):
+def link_get_routes(routes, class_index, short_index, resource_index, resource_automaton=None):
     """Лінкувати GET routes до response schemas"""
     print(f"[*] Linking {len(routes)} GET routes...")
 
@@ -307,64 +565,60 @@ def link_get_routes(routes, class_index):
         if (i+1) % 50 == 0:
             print(f"    {i+1}/{len(routes)}...")
 
-        controller = route['controller']
-        action = route['action']
+        controller = route.controller
+        action = route.action
 
         # Знайти controller class
-        controller_class = None
-        for fqn, class_info in class_index.items():
-            if controller in fqn:
-                controller_class = class_info
-                break
+        controller_class = lookup_class(controller, class_index, short_index)
 
         if not controller_class:
             continue
 
         # Знайти метод
-        method_node = find_method_in_class(controller_class['node'], action)
+        method_node = find_method_in_class(controller_class, action)
         if not method_node:
             continue
 
         # Витягти response
-        response = extract_response_schema(method_node, class_index)
+        response = extract_response_schema(method_node, resource_index, resource_automaton)
 
         linked.append({
-            'path': route['path'],
+            'path': route.path,
             'controller': controller,
             'action': action,
             'response': response,
-            'line': route['line']
+            'line': route.line
         })
 
     return linked
 
 
-def generate_openapi(routes):
-    """Генерувати OpenAPI для GET endpoints"""
-    paths = {}
-
-    for route in routes:
-        path = route['path']
-
-        if path not in paths:
-            paths[path] = {}
-
-        response = route.get('response', {})
-
-        paths[path]['get'] = {
-            'summary': f"GET {path}",
-            'description': f"{route['controller']}.{route['action']}()",
-            'responses': {
-                '200': {
-                    'description': 'Success',
-                    'content': {
-                        'application/json': {
-                            'schema': response if response else {'type': 'object'}
-                        }
+# Schema відповіді без Resource - спільна для всіх таких routes (лише читається серіалізатором)
+_EMPTY_RESPONSE_SCHEMA = {'type': 'object'}
+
+
+def get_operation(route):
+    """OpenAPI operation для одного GET route"""
+    return {
+        'summary': f"GET {route['path']}",
+        'description': f"{route['controller']}.{route['action']}()",
+        'responses': {
+            '200': {
+                'description': 'Success',
+                'content': {
+                    'application/json': {
+                        'schema': route.get('response') or _EMPTY_RESPONSE_SCHEMA
                     }
                 }
             }
         }
+    }
+
+
+def generate_openapi(routes):
+    """Генерувати OpenAPI для GET endpoints"""
+    # Один прохід; повторний path - остання operation на місці першого входження, як і раніше
+    paths = {route['path']: {'get': get_operation(route)} for route in routes}
 
     return {
         'openapi': '3.0.3',
@@ -376,29 +630,55 @@ def generate_openapi(routes):
     }
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python linker_get.py <ast_full.json>")
-        sys.exit(1)
+def save_json(data, output):
+    """
+    Зберегти JSON з відступом 2 - orjson якщо встановлений, інакше stdlib json
+
+    orjson не серіалізує вкладеність глибше ~128 рівнів - тоді той самий вивід дає stdlib json.
+    Дані серіалізуються до відкриття файлу - помилка не лишає порожній файл
+    """
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            encoded = None
+        if encoded is not None:
+            with open(output, 'wb') as f:
+                f.write(encoded)
+            return
+
+    encoded = json.dumps(data, indent=2, ensure_ascii=False)
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(encoded)
 
-    print("[*] Loading AST...")
-    with open(sys.argv[1], 'r', encoding='utf-8') as f:
-        data = json.load(f)
 
-    files = data['files']
-    print(f"[*] Loaded {len(files)} files")
+def main():
+    # --parallel - індекс класів і routes по файлах у воркер-процесах (для великих проектів)
+    flags = {a for a in sys.argv[1:] if a.startswith('--')}
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
 
-    # Build class index
-    class_index = build_class_index(files)
-    print(f"[*] Indexed {len(class_index)} classes")
+    if not args:
+        print("Usage: python linker_get.py <ast_full.json> [--parallel]")
+        sys.exit(1)
 
-    # Find GET routes
-    print("[*] Extracting GET routes...")
-    routes = find_routes(files)
+    # Один потоковий прохід по files: індекс класів + GET routes, без списку всіх файлів в пам'яті
+    print("[*] Loading AST, building class index and extracting GET routes...")
+    files = load_files(args[0])
+    if '--parallel' in flags:
+        with ProcessPoolExecutor() as executor:
+            class_index, routes, total = scan_files(files, executor)
+    else:
+        class_index, routes, total = scan_files(files)
+
+    short_index = build_short_index(class_index)
+    resource_index = build_resource_index(class_index)
+    resource_automaton = build_resource_automaton(resource_index)
+    print(f"[*] Loaded {total} files")
+    print(f"[*] Indexed {len(class_index)} classes")
     print(f"[*] Found {len(routes)} GET routes")
 
     # Link to schemas
-    linked = link_get_routes(routes, class_index)
+    linked = link_get_routes(routes, class_index, short_index, resource_index, resource_automaton)
     print(f"[*] Linked {len(linked)} routes")
 
     # Stats
@@ -410,8 +690,7 @@ def main():
     openapi = generate_openapi(linked)
 
     output = 'openapi_get.json'
-    with open(output, 'w', encoding='utf-8') as f:
-        json.dump(openapi, f, indent=2, ensure_ascii=False)
+    save_json(openapi, output)
 
     print(f"\n[+] Done! Output: {output}")
     print(f"    Total GET endpoints: {len(linked)}")
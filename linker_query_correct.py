@@ -3,90 +3,256 @@
 GET endpoints linker - ВИКЛЮЧНО Query API як в PDF
 """
 
+import functools
+import hashlib
 import json
+import mmap
+import os
+import re
+import sqlite3
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from tree_sitter import Language, Parser, Query, QueryCursor
 import tree_sitter_php
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 PHP_LANGUAGE = Language(tree_sitter_php.language_php())
-parser = Parser(PHP_LANGUAGE)
+
+# Query компілюються один раз при імпорті (воркери отримують їх теж при імпорті)
+# Route::get() - фільтр scope/method предикатами в самому запиті, а не в Python циклі
+_ROUTE_Q = Query(PHP_LANGUAGE, """
+    (scoped_call_expression
+      scope: (name) @scope
+      (#eq? @scope "Route")
+      name: (name) @method
+      (#match? @method "^[gG][eE][tT]$")
+      arguments: (arguments) @args
+    )
+""")
+_CLASS_Q = Query(PHP_LANGUAGE, """
+    (class_declaration
+      name: (name) @class_name
+    ) @class
+""")
+_PARAM_Q = Query(PHP_LANGUAGE, """
+    (simple_parameter
+      type: (named_type) @param_type
+      name: (variable_name) @param_name
+    )
+""")
+_RETURN_Q = Query(PHP_LANGUAGE, "(return_statement) @return")
+_ARRAY_Q = Query(PHP_LANGUAGE, "(array_creation_expression) @array")
+_ELEM_Q = Query(PHP_LANGUAGE, "(array_element_initializer) @elem")
+_STRING_Q = Query(PHP_LANGUAGE, "(string) @str")
+# Елементи масиву (pattern 0) і string-и (pattern 1) за один обхід масиву
+_ELEM_STRING_Q = Query(PHP_LANGUAGE, """
+    (array_element_initializer) @elem
+    (string) @str
+""")
+# Аргументи route: string-и (pattern 0) і class_constant_access (pattern 1) за один обхід
+_ROUTE_ARGS_Q = Query(PHP_LANGUAGE, """
+    (string) @str
+    (class_constant_access_expression) @class_access
+""")
+
+# {param} в route path
+_PATH_PARAM_RE = re.compile(r'\{(\w+)\}')
+
+# Без 'Route' у файлі немає Route::get(); без ключового слова class
+# (PHP - без урахування регістру) немає class_declaration
+_ROUTE_WORD_RE = re.compile(rb'Route')
+_CLASS_KEYWORD_RE = re.compile(rb'class', re.IGNORECASE)
+
+# Шаблони назв полів для infer_type (підрядок будь-де в назві, як і раніше)
+_INTEGER_FIELD_RE = re.compile(r'id|count|number|amount|quantity')
+_BOOLEAN_FIELD_RE = re.compile(r'is_|has_|can_|should_')
+_DATE_FIELD_RE = re.compile(r'_at|date|time')
+
+# Parser і QueryCursor-и не thread-safe: свої в кожному потоці, перевикористовуються
+_local = threading.local()
+
+# --cache: імена класів кожного файлу між запусками, ключ - (path, sha256 вмісту)
+CACHE_FILE = '.ast_cache.sqlite'
+
+# Кеш методів класу: class_node.id → (class_node, {method_name: method_node})
+# class_node у значенні тримає дерево живим - id не перевикористається, поки запис у кеші;
+# link_routes очищає кеш на старті кожного запуску
+_methods_cache = {}
+
+
+def thread_parser():
+    """Parser поточного потоку - створюється при першому виклику в потоці"""
+    try:
+        return _local.parser
+    except AttributeError:
+        parser = _local.parser = Parser(PHP_LANGUAGE)
+        return parser
+
+
+def query_cursor(query):
+    """QueryCursor для query - створюється один раз на потік, далі перевикористовується"""
+    try:
+        cursors = _local.cursors
+    except AttributeError:
+        cursors = _local.cursors = {}
+
+    cursor = cursors.get(query)
+    if cursor is None:
+        cursor = cursors[query] = QueryCursor(query)
+    return cursor
+
+
+def walk_tree(node):
+    """
+    Всі ноди піддерева (разом з node) в порядку документа - DFS через TreeCursor
+    Для простих структурних пошуків замість Query: без матчера і без списків captures
+    """
+    cursor = node.walk()
+
+    # Локальні посилання на методи - без пошуку атрибутів на кожній ноді
+    goto_first_child = cursor.goto_first_child
+    goto_next_sibling = cursor.goto_next_sibling
+    goto_parent = cursor.goto_parent
+    depth = 0
+
+    while True:
+        yield cursor.node
+
+        if goto_first_child():
+            depth += 1
+            continue
+
+        # Наступний сусід, піднімаючись вгору поки його немає (але не вище node)
+        while True:
+            if depth == 0:
+                return
+            if goto_next_sibling():
+                break
+            goto_parent()
+            depth -= 1
 
 
 def parse_php(file_path):
-    with open(file_path, 'rb') as f:
+    """
+    Розпарсити PHP файл → (tree, code)
+    Повторні виклики (на кожен route) беруть результат з кешу; кеш обмежений 256 файлами,
+    щоб дерева всього проекту не лишались у пам'яті
+    """
+    return _parse_php_cached(str(file_path))
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_php_cached(path):
+    with open(path, 'rb') as f:
         code = f.read()
-    return parser.parse(code), code
+    return thread_parser().parse(code), code
+
+
+def source_contains(file_path, pattern):
+    """
+    Чи є pattern (regex на bytes) у файлі - пошук по mmap, без копії вмісту в bytes
+    Файли, які не проходять перевірку, не читаються в пам'ять і не парсяться
+    """
+    with open(file_path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Порожній файл не мапиться
+            return False
+        with mm:
+            return pattern.search(mm) is not None
+
+
+def iter_php(root, recursive=True):
+    """
+    *.php файли каталогу через os.scandir (DirEntry кешує stat) - в тому ж порядку, що й rglob/glob:
+    спочатку файли каталогу, потім підкаталоги вглиб; symlink-и на каталоги не обходяться
+    """
+    stack = [os.fspath(root)]
+    pop = stack.pop
+
+    while stack:
+        subdirs = []
+        with os.scandir(pop()) as entries:
+            for entry in entries:
+                if entry.name.endswith('.php') and entry.is_file():
+                    yield entry.path
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+        stack.extend(reversed(subdirs))
 
 
 def find_routes(laravel_path):
-    """Знайти GET routes через Query API"""
+    """
+    Знайти GET routes через Query API
+    Routes файли обробляються в потоках: Parser.parse відпускає GIL, дерева не серіалізуються
+    """
     routes = []
     routes_path = Path(laravel_path) / 'routes'
 
     if not routes_path.exists():
         return routes
 
-    # Query для Route::get()
-    route_query = Query(PHP_LANGUAGE, """
-        (scoped_call_expression
-          scope: (name) @scope
-          name: (name) @method
-          arguments: (arguments) @args
-        )
-    """)
-
-    for route_file in routes_path.glob('*.php'):
-        tree, code = parse_php(route_file)
-        cursor = QueryCursor(route_query)
-
-        for pattern_index, captures in cursor.matches(tree.root_node):
-            if 'scope' in captures and 'method' in captures and 'args' in captures:
-                scope_node = captures['scope'][0]
-                method_node = captures['method'][0]
-                args_node = captures['args'][0]
-
-                scope = scope_node.text.decode('utf-8')
-                method = method_node.text.decode('utf-8')
-
-                if scope == 'Route' and method.upper() == 'GET':
-                    route_info = parse_route_args(args_node, code, route_file)
-                    if route_info:
-                        routes.append(route_info)
+    route_files = list(iter_php(routes_path, recursive=False))
+    with ThreadPoolExecutor() as executor:
+        for file_routes in executor.map(routes_in_file, route_files):
+            routes.extend(file_routes)
 
     return routes
 
 
+def routes_in_file(route_file):
+    """GET routes одного routes файлу (воркер для find_routes)"""
+    routes = []
+
+    # Без 'Route' в тексті Route::get() неможливий - файл не парситься
+    if not source_contains(route_file, _ROUTE_WORD_RE):
+        return routes
+
+    tree, code = parse_php(route_file)
+
+    # Кожен match - вже Route::get() (будь-який регістр get)
+    for pattern_index, captures in query_cursor(_ROUTE_Q).matches(tree.root_node):
+        route_info = parse_route_args(captures['args'][0], code, route_file)
+        if route_info:
+            routes.append(route_info)
+
+    return routes
+
+
+def _str_literal(node):
+    """Значення string ноди без лапок - лапки зрізаються з bytes, декодування одне"""
+    return node.text.strip(b'"\'').decode('utf-8')
+
+
 def parse_route_args(args_node, code, file_path):
-    """Парсити аргументи через Query API"""
-    # Query для string аргументів
-    string_query = Query(PHP_LANGUAGE, "(string) @str")
-    cursor = QueryCursor(string_query)
+    """Парсити аргументи через Query API - string-и і Controller::class одним запитом"""
+    cursor = query_cursor(_ROUTE_ARGS_Q)
 
     strings = []
-    for _, captures in cursor.matches(args_node):
-        if 'str' in captures:
+    controller = None
+    for pattern_index, captures in cursor.matches(args_node):
+        if pattern_index == 0:
             for node in captures['str']:
-                strings.append(node.text.decode('utf-8').strip('"\''))
+                strings.append(_str_literal(node))
+        else:
+            # Останній Controller::class в аргументах виграє
+            for node in captures['class_access']:
+                text = node.text
+                if b'::class' in text:
+                    controller = text.decode('utf-8').replace('::class', '')
 
     if len(strings) < 1:
         return None
 
     path = strings[0]
 
-    # Query для class_constant_access
-    class_query = Query(PHP_LANGUAGE, "(class_constant_access_expression) @class_access")
-    cursor2 = QueryCursor(class_query)
-
-    controller = None
-    for _, captures in cursor2.matches(args_node):
-        if 'class_access' in captures:
-            for node in captures['class_access']:
-                text = node.text.decode('utf-8')
-                if '::class' in text:
-                    controller = text.replace('::class', '')
-                    break
-
     action = strings[1] if len(strings) > 1 else None
 
     if path and controller and action:
@@ -94,77 +260,165 @@ def parse_route_args(args_node, code, file_path):
     return None
 
 
-def find_controller(controller_name, laravel_path):
-    """Знайти контролер через Query API"""
-    app_path = Path(laravel_path) / 'app' / 'Http' / 'Controllers'
+def class_names_in_file(php_file):
+    """Імена класів файлу (воркер для --parallel: Tree/Node не серіалізуються, імена - так)"""
+    if not source_contains(php_file, _CLASS_KEYWORD_RE):
+        return []
 
-    class_query = Query(PHP_LANGUAGE, """
-        (class_declaration
-          name: (name) @class_name
-        ) @class
-    """)
+    tree, code = parse_php(php_file)
+    return [
+        captures['class_name'][0].text.decode('utf-8')
+        for _, captures in query_cursor(_CLASS_Q).matches(tree.root_node)
+        if 'class_name' in captures and 'class' in captures
+    ]
 
-    for php_file in app_path.rglob('*.php'):
-        tree, code = parse_php(php_file)
-        cursor = QueryCursor(class_query)
 
-        for _, captures in cursor.matches(tree.root_node):
-            if 'class_name' in captures and 'class' in captures:
-                class_name_node = captures['class_name'][0]
-                class_node = captures['class'][0]
+def open_class_cache(cache_file=CACHE_FILE):
+    """
+    SQLite кеш імен класів: path → (sha256 вмісту, class names)
+    tree-sitter не серіалізує Tree, тому кешується результат індексації файлу, а не дерево
+    """
+    cache = sqlite3.connect(cache_file)
+    cache.execute('CREATE TABLE IF NOT EXISTS classes (path TEXT PRIMARY KEY, sha BLOB, names TEXT)')
+    return cache
 
-                class_name = class_name_node.text.decode('utf-8')
-                # Точна відповідність
-                if class_name == controller_name:
-                    return php_file, class_node, code
 
-    return None, None, None
+def file_sha256(file_path):
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def class_names_per_file(php_files, executor=None, cache=None):
+    """
+    Імена класів кожного файлу (в порядку php_files)
+    cache - з open_class_cache(): парсяться тільки нові/змінені файли (sha256 не збігається)
+    """
+    names = {}
+    digests = {}
+
+    if cache is not None:
+        for php_file in php_files:
+            digests[php_file] = digest = file_sha256(php_file)
+            row = cache.execute('SELECT sha, names FROM classes WHERE path = ?', (os.path.abspath(php_file),)).fetchone()
+            if row is not None and row[0] == digest:
+                names[php_file] = json.loads(row[1])
+
+    to_parse = [php_file for php_file in php_files if php_file not in names]
+    if executor is not None:
+        names.update(zip(to_parse, executor.map(class_names_in_file, to_parse, chunksize=8)))
+    else:
+        names.update(zip(to_parse, map(class_names_in_file, to_parse)))
+
+    if cache is not None and to_parse:
+        with cache:
+            cache.executemany('INSERT OR REPLACE INTO classes VALUES (?, ?, ?)', [
+                (os.path.abspath(php_file), digests[php_file], json.dumps(names[php_file]))
+                for php_file in to_parse
+            ])
+
+    return [names[php_file] for php_file in php_files]
+
+
+def build_class_index(app_path, executor=None, cache=None):
+    """
+    Індекс класів каталогу одним проходом: class_name → {'file': ...}
+    (class_node/code/methods додає class_entry при першому зверненні)
+    Перший знайдений клас з таким ім'ям виграє (як при лінійному пошуку)
+    executor - ProcessPoolExecutor: файли парсяться у воркерах, порядок зберігається (map)
+    cache - SQLite кеш імен класів між запусками (--cache)
+    """
+    index = {}
+    app_path = Path(app_path)
 
+    if not app_path.exists():
+        return index
+
+    php_files = list(iter_php(app_path))
+    names_per_file = class_names_per_file(php_files, executor, cache)
+
+    for php_file, class_names in zip(php_files, names_per_file):
+        for class_name in class_names:
+            if class_name not in index:
+                index[class_name] = {'file': php_file}
+
+    return index
+
+
+def class_entry(class_name, class_index):
+    """
+    Запис індексу класу: {'file', 'class_node', 'code', 'methods'}
+    Клас шукається у файлі (парситься тільки цей файл) при першому зверненні, далі - з індексу
+    None - класу немає в індексі
+    """
+    entry = class_index.get(class_name)
+    if entry is None or 'class_node' in entry:
+        return entry
+
+    tree, code = parse_php(entry['file'])
+    entry['class_node'] = None
+    entry['code'] = code
+    entry['methods'] = {}
+
+    class_name_bytes = class_name.encode('utf-8')
+    for node in walk_tree(tree.root_node):
+        if node.type == 'class_declaration':
+            name_node = node.child_by_field_name('name')
+            if name_node is not None and name_node.type == 'name' and name_node.text == class_name_bytes:
+                entry['class_node'] = node
+                entry['methods'] = class_methods(node)
+                break
 
-def find_method(class_node, method_name, code):
-    """Знайти метод через Query API"""
-    method_query = Query(PHP_LANGUAGE, """
-        (method_declaration
-          name: (name) @method_name
-        ) @method
-    """)
+    return entry
 
-    cursor = QueryCursor(method_query)
 
-    for _, captures in cursor.matches(class_node):
-        if 'method_name' in captures and 'method' in captures:
-            name_node = captures['method_name'][0]
-            method_node = captures['method'][0]
+def find_class(class_name, class_index):
+    """Знайти клас за індексом → (file, class_node, code)"""
+    entry = class_entry(class_name, class_index)
+    if entry is None or entry['class_node'] is None:
+        return None, None, None
+    return entry['file'], entry['class_node'], entry['code']
 
-            name = name_node.text.decode('utf-8')
-            if name == method_name:
-                return method_node
 
-    return None
+def find_method(class_node, method_name, code):
+    """Знайти метод - перший method_declaration з таким ім'ям"""
+    return class_methods(class_node).get(method_name)
+
+
+def class_methods(class_node):
+    """
+    Всі методи класу: {method_name: method_node} - один DFS на клас, далі з кешу
+    Перший метод з таким ім'ям виграє (порядок документа)
+    """
+    cached = _methods_cache.get(class_node.id)
+    if cached is not None:
+        return cached[1]
+
+    methods = {}
+    _methods_cache[class_node.id] = (class_node, methods)
+    for node in walk_tree(class_node):
+        if node.type == 'method_declaration':
+            name_node = node.child_by_field_name('name')
+            if name_node is not None and name_node.type == 'name':
+                methods.setdefault(name_node.text.decode('utf-8'), node)
+    return methods
 
 
 def find_response_calls(method_node, code):
-    """Знайти $this->...Response() через Query API"""
-    call_query = Query(PHP_LANGUAGE, """
-        (member_call_expression
-          object: (variable_name) @object
-          name: (name) @method_name
-        )
-    """)
-
-    cursor = QueryCursor(call_query)
+    """Знайти $this->...Response() одним DFS через TreeCursor"""
     calls = []
 
-    for _, captures in cursor.matches(method_node):
-        if 'object' in captures and 'method_name' in captures:
-            obj_node = captures['object'][0]
-            method_name_node = captures['method_name'][0]
+    for node in walk_tree(method_node):
+        if node.type == 'member_call_expression':
+            obj_node = node.child_by_field_name('object')
+            name_node = node.child_by_field_name('name')
+            if obj_node is None or name_node is None:
+                continue
+            if obj_node.type != 'variable_name' or name_node.type != 'name':
+                continue
 
-            obj = obj_node.text.decode('utf-8')
-            method = method_name_node.text.decode('utf-8')
-
-            if obj == '$this' and 'response' in method.lower():
-                calls.append(method)
+            method = name_node.text
+            if obj_node.text == b'$this' and b'response' in method.lower():
+                calls.append(method.decode('utf-8'))
 
     return calls
 
@@ -187,17 +441,14 @@ def extract_response(method_node, class_node, code):
 def parse_return_array(method_node, code):
     """Парсити return array через Query API"""
     # Спочатку знайти return statements
-    return_query = Query(PHP_LANGUAGE, "(return_statement) @return")
-    cursor = QueryCursor(return_query)
+    cursor = query_cursor(_RETURN_Q)
+    # Шукати array всередині кожного return
+    cursor2 = query_cursor(_ARRAY_Q)
 
     for _, captures in cursor.matches(method_node):
         if 'return' in captures:
             return_node = captures['return'][0]
 
-            # Шукати array всередині цього return
-            array_query = Query(PHP_LANGUAGE, "(array_creation_expression) @array")
-            cursor2 = QueryCursor(array_query)
-
             for _, array_captures in cursor2.matches(return_node):
                 if 'array' in array_captures:
                     array_node = array_captures['array'][0]
@@ -209,37 +460,36 @@ def parse_return_array(method_node, code):
 
 
 def parse_array(array_node, code):
-    """Парсити масив через Query API"""
-    # Query для array elements
-    elem_query = Query(PHP_LANGUAGE, """
-        (array_element_initializer) @elem
-    """)
-
-    cursor = QueryCursor(elem_query)
+    """Парсити масив через Query API - елементи і їх string ключі одним запитом"""
+    cursor = query_cursor(_ELEM_STRING_Q)
     properties = {}
     required = []
 
-    for _, captures in cursor.matches(array_node):
-        if 'elem' in captures:
-            for elem_node in captures['elem']:
-                # Шукаємо string ключ
-                string_query = Query(PHP_LANGUAGE, "(string) @str")
-                cursor2 = QueryCursor(string_query)
-
-                strings = []
-                for _, str_captures in cursor2.matches(elem_node):
-                    if 'str' in str_captures:
-                        for s in str_captures['str']:
-                            strings.append(s.text.decode('utf-8').strip('"\''))
-
-                if strings:
-                    key = strings[0]
-                    value_text = elem_node.text.decode('utf-8')
-
-                    properties[key] = infer_type(key, value_text)
-
-                    if 'null' not in value_text.lower() and 'deleted_at' not in key:
-                        required.append(key)
+    # Ключ елемента - перший string всередині нього (в порядку документа).
+    # Matches йдуть в порядку документа: string дістається всім ще відкритим елементам,
+    # які його містять (вкладені елементи теж); елементи, що закінчились раніше, лишаються без ключа
+    elems = []
+    pending = []
+    for pattern_index, captures in cursor.matches(array_node):
+        if pattern_index == 0:
+            pending.append(len(elems))
+            elems.append([captures['elem'][0], None])
+        elif pending:
+            str_node = captures['str'][0]
+            key = _str_literal(str_node)
+            for i in pending:
+                if elems[i][0].end_byte >= str_node.end_byte:
+                    elems[i][1] = key
+            pending.clear()
+
+    for elem_node, key in elems:
+        if key is not None:
+            value_text = elem_node.text.decode('utf-8')
+
+            properties[key] = infer_type(key, value_text)
+
+            if 'null' not in value_text.lower() and 'deleted_at' not in key:
+                required.append(key)
 
     if not properties:
         return {}
@@ -251,11 +501,12 @@ def parse_array(array_node, code):
 
 
 def infer_type(field_name, value_text):
-    if any(x in field_name for x in ['_id', 'id', 'count', 'number', 'amount', 'quantity']):
+    # ID, counters ('_id' вже покривається 'id')
+    if _INTEGER_FIELD_RE.search(field_name):
         return {'type': 'integer'}
-    if any(x in field_name for x in ['is_', 'has_', 'can_', 'should_']):
+    if _BOOLEAN_FIELD_RE.search(field_name):
         return {'type': 'boolean'}
-    if any(x in field_name for x in ['_at', 'date', 'time']):
+    if _DATE_FIELD_RE.search(field_name):
         return {'type': 'string', 'format': 'date-time'}
     if '[' in value_text or 'array' in value_text.lower():
         return {'type': 'array', 'items': {'type': 'object'}}
@@ -264,9 +515,8 @@ def infer_type(field_name, value_text):
 
 def extract_path_parameters(path):
     """Витягти path parameters з route path"""
-    import re
     params = []
-    for match in re.finditer(r'\{(\w+)\}', path):
+    for match in _PATH_PARAM_RE.finditer(path):
         param_name = match.group(1)
         params.append({
             'name': param_name,
@@ -277,56 +527,26 @@ def extract_path_parameters(path):
     return params
 
 
-def extract_query_parameters(method_node, code, laravel_path):
+def extract_query_parameters(method_node, code, form_request_index):
     """Витягти query parameters через Query API"""
     # Знайти FormRequest параметр через Query API
-    param_query = Query(PHP_LANGUAGE, """
-        (simple_parameter
-          type: (named_type) @param_type
-          name: (variable_name) @param_name
-        )
-    """)
-
-    cursor = QueryCursor(param_query)
+    cursor = query_cursor(_PARAM_Q)
     form_request_class = None
 
     for _, captures in cursor.matches(method_node):
         if 'param_type' in captures and 'param_name' in captures:
-            type_node = captures['param_type'][0]
-            param_type = type_node.text.decode('utf-8')
+            param_type = captures['param_type'][0].text
 
             # Якщо параметр закінчується на Request - це FormRequest
-            if param_type.endswith('Request'):
-                form_request_class = param_type
+            if param_type.endswith(b'Request'):
+                form_request_class = param_type.decode('utf-8')
                 break
 
     if not form_request_class:
         return []
 
-    # Знайти FormRequest файл
-    form_request_file = find_form_request(form_request_class, laravel_path)
-    if not form_request_file:
-        return []
-
-    tree, form_code = parse_php(form_request_file)
-
-    # Знайти class через Query API
-    class_query = Query(PHP_LANGUAGE, """
-        (class_declaration
-          name: (name) @class_name
-        ) @class
-    """)
-
-    cursor = QueryCursor(class_query)
-    class_node = None
-
-    for _, captures in cursor.matches(tree.root_node):
-        if 'class_name' in captures:
-            class_name = captures['class_name'][0].text.decode('utf-8')
-            if class_name == form_request_class:
-                class_node = captures['class'][0]
-                break
-
+    # Знайти FormRequest клас в індексі
+    form_request_file, class_node, form_code = find_form_request(form_request_class, form_request_index)
     if not class_node:
         return []
 
@@ -339,69 +559,40 @@ def extract_query_parameters(method_node, code, laravel_path):
     return parse_validation_rules(rules_method, form_code)
 
 
-def find_form_request(class_name, laravel_path):
-    """Знайти FormRequest файл"""
-    app_path = Path(laravel_path) / 'app' / 'Http' / 'Requests'
-
-    if not app_path.exists():
-        return None
-
-    for php_file in app_path.rglob('*.php'):
-        tree, code = parse_php(php_file)
-
-        class_query = Query(PHP_LANGUAGE, """
-            (class_declaration
-              name: (name) @class_name
-            )
-        """)
-
-        cursor = QueryCursor(class_query)
-
-        for _, captures in cursor.matches(tree.root_node):
-            if 'class_name' in captures:
-                found_class = captures['class_name'][0].text.decode('utf-8')
-                if found_class == class_name:
-                    return php_file
-
-    return None
+def find_form_request(class_name, form_request_index):
+    """Знайти FormRequest клас в індексі → (file, class_node, code)"""
+    return find_class(class_name, form_request_index)
 
 
 def parse_validation_rules(rules_method, code):
     """Парсити validation rules через Query API"""
     params = []
 
-    # Знайти return statement
-    return_query = Query(PHP_LANGUAGE, "(return_statement) @return")
-    cursor = QueryCursor(return_query)
+    # Знайти return statement → array → elements → string ключ
+    cursor = query_cursor(_RETURN_Q)
+    cursor2 = query_cursor(_ARRAY_Q)
+    cursor3 = query_cursor(_ELEM_Q)
+    cursor4 = query_cursor(_STRING_Q)
 
     for _, captures in cursor.matches(rules_method):
         if 'return' in captures:
             return_node = captures['return'][0]
 
             # Знайти array
-            array_query = Query(PHP_LANGUAGE, "(array_creation_expression) @array")
-            cursor2 = QueryCursor(array_query)
-
             for _, array_captures in cursor2.matches(return_node):
                 if 'array' in array_captures:
                     array_node = array_captures['array'][0]
 
                     # Парсити array elements
-                    elem_query = Query(PHP_LANGUAGE, "(array_element_initializer) @elem")
-                    cursor3 = QueryCursor(elem_query)
-
                     for _, elem_captures in cursor3.matches(array_node):
                         if 'elem' in elem_captures:
                             for elem_node in elem_captures['elem']:
                                 # Витягти ключ (назва поля)
-                                string_query = Query(PHP_LANGUAGE, "(string) @str")
-                                cursor4 = QueryCursor(string_query)
-
                                 strings = []
                                 for _, str_captures in cursor4.matches(elem_node):
                                     if 'str' in str_captures:
                                         for s in str_captures['str']:
-                                            strings.append(s.text.decode('utf-8').strip('"\''))
+                                            strings.append(_str_literal(s))
 
                                 if strings:
                                     field_name = strings[0]
@@ -436,31 +627,60 @@ def infer_param_type(field_name, validation_text):
     return {'type': 'string'}
 
 
-def link_routes(routes, laravel_path):
+def extract_action(controller_name, action, controller_index, form_request_index):
+    """
+    Response schema і query parameters дії контролера → (response, query_params)
+    None - контролер або метод не знайдено
+    """
+    entry = class_entry(controller_name, controller_index)
+
+    if entry is None or entry['class_node'] is None:
+        return None
+
+    # Методи класу зібрані один раз на контролер - без пошуку на кожен route
+    method_node = entry['methods'].get(action)
+
+    if not method_node:
+        return None
+
+    class_node = entry['class_node']
+    code = entry['code']
+    response = extract_response(method_node, class_node, code)
+    query_params = extract_query_parameters(method_node, code, form_request_index)
+    return response, query_params
+
+
+def link_routes(routes, laravel_path, executor=None, cache=None):
     print(f"[*] Linking {len(routes)} routes...")
+    # id нод дерев попереднього запуску можуть збігтися з новими
+    _methods_cache.clear()
     linked = []
 
+    # Контролери і FormRequest-и індексуються один раз, а не скануються на кожен route
+    http_path = Path(laravel_path) / 'app' / 'Http'
+    controller_index = build_class_index(http_path / 'Controllers', executor, cache)
+    form_request_index = build_class_index(http_path / 'Requests', executor, cache)
+
+    # Результат по (controller, action) - routes на ту саму дію не аналізуються повторно
+    extracted = {}
+
     for i, route in enumerate(routes):
         if (i+1) % 20 == 0:
             print(f"    {i+1}/{len(routes)}...")
 
-        controller_file, class_node, code = find_controller(route['controller'], laravel_path)
+        key = (route['controller'], route['action'])
+        if key not in extracted:
+            extracted[key] = extract_action(route['controller'], route['action'], controller_index, form_request_index)
+        result = extracted[key]
 
-        if not controller_file:
+        if result is None:
             linked.append({**route, 'response': {}, 'parameters': []})
             continue
 
-        method_node = find_method(class_node, route['action'], code)
+        response, query_params = result
 
-        if not method_node:
-            linked.append({**route, 'response': {}, 'parameters': []})
-            continue
-
-        response = extract_response(method_node, class_node, code)
-
-        # Extract request parameters
+        # Path parameters залежать від path, а не від дії - рахуються на кожен route
         path_params = extract_path_parameters(route['path'])
-        query_params = extract_query_parameters(method_node, code, laravel_path)
 
         all_params = path_params + query_params
 
@@ -508,18 +728,49 @@ def generate_openapi(routes):
     }
 
 
+def save_json(data, output):
+    """JSON у файл (спершу серіалізація, потім запис); глибше ~128 рівнів orjson не вміє - тоді stdlib json"""
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            encoded = None
+        if encoded is not None:
+            with open(output, 'wb') as f:
+                f.write(encoded)
+            return
+
+    encoded = json.dumps(data, indent=2, ensure_ascii=False)
+    with open(output, 'w', encoding='utf-8') as f:
+        f.write(encoded)
+
+
 if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print("Usage: python linker_query_correct.py <laravel_path>")
+    # --parallel - індексація контролерів/FormRequest-ів у воркер-процесах
+    # --cache - імена класів файлів зберігаються в .ast_cache.sqlite між запусками
+    flags = {a for a in sys.argv[1:] if a.startswith('--')}
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+
+    if not args:
+        print("Usage: python linker_query_correct.py <laravel_path> [--parallel] [--cache]")
         sys.exit(1)
 
-    laravel_path = sys.argv[1]
+    laravel_path = args[0]
 
     print("[*] Finding GET routes...")
     routes = find_routes(laravel_path)
     print(f"[*] Found {len(routes)} routes")
 
-    linked = link_routes(routes, laravel_path)
+    cache = open_class_cache() if '--cache' in flags else None
+
+    if '--parallel' in flags:
+        with ProcessPoolExecutor() as executor:
+            linked = link_routes(routes, laravel_path, executor, cache)
+    else:
+        linked = link_routes(routes, laravel_path, cache=cache)
+
+    if cache is not None:
+        cache.close()
     print(f"[*] Linked {len(linked)} routes")
 
     with_response = sum(1 for r in linked if r.get('response') and r['response'].get('properties'))
@@ -535,8 +786,7 @@ if __name__ == '__main__':
     openapi = generate_openapi(linked)
 
     output = 'openapi_query.json'
-    with open(output, 'w', encoding='utf-8') as f:
-        json.dump(openapi, f, indent=2, ensure_ascii=False)
+    save_json(openapi, output)
 
     print(f"\n[+] Done! {output}")
     print(f"    GET endpoints: {len(linked)}")
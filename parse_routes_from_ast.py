@@ -2,11 +2,41 @@
 """
 Парсер routes з повного AST (ast_generic.json)
 Працює ТІЛЬКИ з dict traversal - БЕЗ вигадок
+Або напряму з routes .php файлу - tree-sitter Query, без ast_generic.json
 """
 
 import json
 import sys
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+    from ijson.common import ObjectBuilder
+except ImportError:
+    ijson = None
+
+try:
+    from tree_sitter import Language, Parser, Query, QueryCursor
+    import tree_sitter_php
+except ImportError:
+    tree_sitter_php = None
+
+if tree_sitter_php is not None:
+    PHP_LANGUAGE = Language(tree_sitter_php.language_php())
+
+    # Route::method(...) - фільтр scope виконується в Query (C), Python бачить тільки Route:: виклики
+    ROUTE_CALL_QUERY = Query(PHP_LANGUAGE, """
+        (scoped_call_expression
+          scope: (_) @scope
+          (#eq? @scope "Route")
+          name: (_) @method
+        ) @call
+    """)
+
 
 def get_text_from_node(node):
     """Отримати текст з ноди"""
@@ -57,6 +87,137 @@ def find_all_routes(root_node):
     return routes
 
 
+def iter_routes_from_json(json_file):
+    """
+    Потоково знайти Route:: виклики в ast_generic.json (ijson події, без json.load)
+
+    В dict матеріалізується тільки піддерево scoped_call_expression -
+    решта AST проходить як події і відкидається, пам'ять O(глибина дерева).
+    Скалярні поля ноди до 'type' (dump_ast_v2 пише 'type' першим) запам'ятовуються
+    і переносяться в побудований dict.
+    """
+    with open(json_file, 'rb') as f:
+        frames = []      # скалярні поля кожної відкритої ноди (поза піддеревом)
+        key = None
+        builder = None
+        depth = 0
+
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if builder is not None:
+                # Всередині Route-кандидата - будувати dict до закриття його ноди
+                builder.event(event, value)
+                if event == 'start_map' or event == 'start_array':
+                    depth += 1
+                elif event == 'end_map' or event == 'end_array':
+                    depth -= 1
+                    if depth == 0:
+                        frames.pop()
+                        yield from find_all_routes(builder.value)
+                        builder = None
+                continue
+
+            if prefix != 'ast' and not prefix.startswith('ast.'):
+                continue
+
+            if event == 'start_map':
+                frames.append({})
+            elif event == 'end_map':
+                frames.pop()
+            elif event == 'map_key':
+                key = value
+            elif event != 'start_array' and event != 'end_array':
+                frames[-1][key] = value
+                if key == 'type' and value == 'scoped_call_expression':
+                    builder = ObjectBuilder()
+                    builder.event('start_map', None)
+                    for k, v in frames[-1].items():
+                        builder.event('map_key', k)
+                        builder.event('string', v)
+                    depth = 1
+
+
+def find_all_routes_in_tree(root_node):
+    """Знайти всі Route:: виклики в tree-sitter дереві одним Query (в порядку документа)"""
+    routes = []
+
+    for _, captures in QueryCursor(ROUTE_CALL_QUERY).matches(root_node):
+        call_node = captures['call'][0]
+        args_node = call_node.child_by_field_name('arguments')
+
+        method_text = captures['method'][0].text.decode('utf-8', errors='ignore')
+        route_info = parse_route_call_node(method_text, args_node, call_node.start_point[0] + 1)
+        if route_info:
+            routes.append(route_info)
+
+    return routes
+
+
+def parse_route_call_node(method, args_node, line):
+    """parse_route_call для tree-sitter ноди arguments - та сама логіка, без dict"""
+    if args_node is None:
+        return None
+
+    route = {
+        'method': method.upper(),
+        'line': line
+    }
+
+    arguments = [c for c in args_node.children if c.type == 'argument']
+
+    # Перший аргумент - path (string)
+    if len(arguments) >= 1:
+        for child in arguments[0].children:
+            if child.type == 'string':
+                path = child.text.decode('utf-8', errors='ignore').strip('"\'')
+                if path:
+                    route['path'] = path
+                break
+
+    # Другий аргумент - controller (array [Controller::class, 'method'])
+    if len(arguments) >= 2:
+        for child in arguments[1].children:
+            if child.type == 'array_creation_expression':
+                controller_info = parse_controller_array_node(child)
+                if controller_info:
+                    route.update(controller_info)
+                break
+
+    return route
+
+
+def parse_controller_array_node(array_node):
+    """parse_controller_array для tree-sitter ноди"""
+    controller = None
+    action = None
+
+    for elem in array_node.children:
+        if elem.type != 'array_element_initializer':
+            continue
+        for child in elem.children:
+            if child.type == 'class_constant_access_expression':
+                # Controller::class - перший named child
+                named = child.named_children
+                controller = named[0].text.decode('utf-8', errors='ignore') if named else None
+            elif child.type == 'string':
+                action = child.text.decode('utf-8', errors='ignore').strip('"\'')
+
+    result = {}
+    if controller:
+        result['controller'] = controller
+    if action:
+        result['action'] = action
+
+    return result if result else None
+
+
+def find_routes_in_php(php_file):
+    """Routes напряму з .php файлу - без ast_generic.json"""
+    with open(php_file, 'rb') as f:
+        code = f.read()
+    tree = Parser(PHP_LANGUAGE).parse(code)
+    return find_all_routes_in_tree(tree.root_node)
+
+
 def parse_route_call(method, args_node, line):
     """Парсити Route::method(...) виклик"""
     if not args_node:
@@ -181,19 +342,59 @@ def generate_openapi(routes):
     }
 
 
+def save_json(data, output_file):
+    """
+    Зберегти JSON з відступом 2 - orjson якщо встановлений, інакше stdlib json
+
+    orjson не серіалізує вкладеність глибше ~128 рівнів - тоді той самий вивід дає stdlib json.
+    Дані серіалізуються до відкриття файлу - помилка не лишає порожній файл
+    """
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            encoded = None
+        if encoded is not None:
+            with open(output_file, 'wb') as f:
+                f.write(encoded)
+            return
+
+    encoded = json.dumps(data, indent=2, ensure_ascii=False)
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(encoded)
+
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python parse_routes_from_ast.py <ast_generic.json>")
+        print("Usage: python parse_routes_from_ast.py <ast_generic.json | routes.php>")
         sys.exit(1)
 
     json_file = sys.argv[1]
 
-    print(f"[*] Loading AST from {json_file}...")
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    print(f"[*] Parsing routes...")
-    routes = find_all_routes(data['ast'])
+    if json_file.endswith('.php'):
+        # PHP файл - tree-sitter Query напряму, AST dump не потрібен
+        if tree_sitter_php is None:
+            print("Error: .php input requires tree-sitter and tree-sitter-php")
+            sys.exit(1)
+
+        print(f"[*] Parsing routes from {json_file}...")
+        routes = find_routes_in_php(json_file)
+    else:
+        print(f"[*] Loading AST from {json_file}...")
+        if ijson is not None:
+            # Потоково - весь AST в пам'ять не завантажується
+            print("[*] Parsing routes...")
+            routes = list(iter_routes_from_json(json_file))
+        else:
+            if orjson is not None:
+                with open(json_file, 'rb') as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+
+            print("[*] Parsing routes...")
+            routes = find_all_routes(data['ast'])
 
     print(f"[*] Found {len(routes)} routes")
 
@@ -217,8 +418,7 @@ def main():
     openapi = generate_openapi(routes)
 
     output_file = 'openapi_from_ast.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(openapi, f, indent=2, ensure_ascii=False)
+    save_json(openapi, output_file)
 
     print(f"\n[+] Done!")
     print(f"    Output: {output_file}")
@@ -5,67 +5,352 @@ Parses routes file and all dependencies, creates detailed index for API document
 """
 
 import os
-import json
+import io
 import re
+import sys
+import json
 import gc
+import contextlib
+from array import array
+from json.encoder import encode_basestring
+from sys import intern
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from tree_sitter import Language, Parser
+from tree_sitter import Language, Parser, Query, QueryCursor
 import tree_sitter_php as tsphp
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Escapes inside a single-quoted PHP string: only \\ and \' are special
+SINGLE_QUOTED_ESCAPE_RE = re.compile(r"\\([\\'])")
+
+# Nodes that can hold namespace use declarations - PHP only allows 'use' at file/namespace level,
+# so class, function and statement bodies are never entered
+USE_CONTAINER_TYPES = {'program', 'namespace_definition', 'compound_statement', 'ERROR'}
+
+
+def read_json(path):
+    """Load JSON file - orjson if installed, stdlib json otherwise"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_json(path, data):
+    """Save JSON file with 2-space indent - orjson if installed, stdlib json otherwise
+
+    orjson can't encode nesting deeper than ~128 levels (e.g. rules_ast of a long '.' concatenation),
+    then stdlib json writes the same output. Data is encoded before the file is opened,
+    so a failure never leaves an empty file behind.
+    """
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            encoded = None
+        if encoded is not None:
+            with open(path, 'wb') as f:
+                f.write(encoded)
+            return
+
+    encoded = json.dumps(data, indent=2, ensure_ascii=False)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(encoded)
+
+
+def string_literal_value(text):
+    """Value of a PHP string literal: quotes stripped, \\\\ and \\' unescaped in single-quoted strings"""
+    if len(text) >= 2 and text[0] == text[-1] == "'":
+        return SINGLE_QUOTED_ESCAPE_RE.sub(r'\1', text[1:-1])
+    return text.strip('"\'')
+
+
+BASE_FIELDS = ('file', 'ast_file', 'line', 'parent')
+METHOD_FIELDS = ('name', 'line', 'parameters', 'visibility', 'start_byte', 'end_byte')
+
+# Numeric columns packed into array.array instead of a list of int objects
+NUMERIC_FIELDS = {'line': 'i', 'start_byte': 'I', 'end_byte': 'I'}
+
+
+class ClassTable:
+    """
+    One api_index category (or methods of one class) stored column-wise (SoA)
+
+    Each field is a parallel list (line numbers and byte offsets - array.array), a row per class.
+    Rows are joined back into per-class dicts only in to_dict() when saving.
+    Adding an existing class name overwrites its row in place, like dict assignment.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.rows = {}
+        self.names = []
+        self.columns = {
+            field: array(NUMERIC_FIELDS[field]) if field in NUMERIC_FIELDS else []
+            for field in fields
+        }
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name, /, **values):
+        """Add (or replace) class row - values must have every field of the table"""
+        row = self.rows.get(name)
+        if row is None:
+            self.rows[name] = len(self.names)
+            self.names.append(name)
+            for field in self.fields:
+                self.columns[field].append(values[field])
+        else:
+            for field in self.fields:
+                self.columns[field][row] = values[field]
+
+    def merge(self, other):
+        """Add all rows of another table (same fields) in its order"""
+        columns = [(field, other.columns[field]) for field in self.fields]
+        for row, name in enumerate(other.names):
+            self.add(name, **{field: column[row] for field, column in columns})
+
+    def to_dict(self):
+        """Convert back to {class_name: {field: value}} for JSON output (nested tables too)"""
+        columns = [(field, self.columns[field]) for field in self.fields]
+        return {
+            name: {
+                field: value.to_dict() if isinstance(value, ClassTable) else value
+                for field, value in ((field, column[row]) for field, column in columns)
+            }
+            for row, name in enumerate(self.names)
+        }
+
+
+def empty_api_index():
+    """Empty api_index - one ClassTable per category"""
+    return {
+        'controllers': ClassTable(BASE_FIELDS + ('methods',)),
+        'requests': ClassTable(BASE_FIELDS + ('methods', 'rules', 'traits', 'rules_ast')),
+        'resources': ClassTable(BASE_FIELDS + ('methods',)),
+        'models': ClassTable(BASE_FIELDS + ('properties', 'fillable', 'casts', 'methods')),
+        'enums': ClassTable(('file', 'ast_file', 'line', 'cases')),
+        'traits': ClassTable(('file', 'ast_file', 'line', 'methods')),
+        'interfaces': ClassTable(BASE_FIELDS + ('methods',))
+    }
+
+
+# Node type -> its JSON string literal; a few hundred node kinds, encoded once each
+_TYPE_JSON = {}
+
+
+# Parser instance of a worker process (--parallel)
+_worker_parser = None
+
+
+def _init_worker(project_root, routes_file, persist_ast):
+    """Worker process initializer - own DetailedASTParser (tree-sitter Parser is not picklable)"""
+    global _worker_parser
+    _worker_parser = DetailedASTParser(project_root, routes_file, persist_ast)
+
+
+def _parse_in_worker(file_path):
+    """Parse one file in worker process - see DetailedASTParser.parse_isolated"""
+    return _worker_parser.parse_isolated(file_path)
+
+
 class DetailedASTParser:
-    def __init__(self, project_root, routes_file):
+    def __init__(self, project_root, routes_file, persist_ast=True):
         self.project_root = Path(project_root)
         self.routes_file = Path(routes_file)
         self.ast_dir = Path(__file__).parent / 'AST'
 
+        # False: skip node_to_dict for the whole file, save only file info and dependencies (.meta.json).
+        # build_api_structure_v3 still needs AST files for requests with traits
+        self.persist_ast = persist_ast
+
         self.ast_dir.mkdir(exist_ok=True)
 
         self.parser = Parser()
         PHP_LANGUAGE = Language(tsphp.language_php())
         self.parser.language = PHP_LANGUAGE
 
+        # All class/enum/trait declarations in one native pass, in document order
+        self.structure_query = Query(PHP_LANGUAGE, """
+            [(class_declaration) (enum_declaration) (trait_declaration)] @declaration
+        """)
+        # Keys of 'key' => value array elements (single-quoted string keys), in document order
+        self.array_key_query = Query(PHP_LANGUAGE, """
+            (array_element_initializer . (string) @key . "=>")
+        """)
+
+        # Declaration type -> handler(node, file_path, name)
+        self.structure_handlers = {
+            'class_declaration': self.analyze_class_structure,
+            'enum_declaration': self.analyze_enum_structure,
+            'trait_declaration': self.analyze_trait_structure
+        }
+
         self.processed_files = set()
-        self.files_to_process = []
+        self.files_to_process = deque()
+        self._paths_cache = {}
+        self._namespace_files = {}
+
+        # relative_path -> {mtime, dependencies} from the previous run; the skip path reads
+        # dependencies from here instead of the whole AST file while the PHP file is unchanged
+        self.deps_cache_file = Path(__file__).parent / 'deps_cache.json'
+        self.deps_cache = self.load_deps_cache()
+        self.deps_updates = {}
 
         self.dependency_tree = {}
 
         # Detailed API index
-        self.api_index = {
-            'controllers': {},
-            'requests': {},
-            'resources': {},
-            'models': {},
-            'enums': {},
-            'traits': {},
-            'interfaces': {}
-        }
+        self.api_index = empty_api_index()
+
+    def file_paths(self, php_file_path):
+        """
+        Get (relative_path, ast_file, ast_file relative to script dir) for PHP file
+
+        Memoized by path string - called for the file itself and for every class/enum/trait in it
+        """
+        key = os.fspath(php_file_path)
+        paths = self._paths_cache.get(key)
+        if paths is None:
+            relative = Path(php_file_path).relative_to(self.project_root)
+            safe_name = str(relative).replace('/', '_').replace('\\', '_')
+            ast_file = self.ast_dir / f"{safe_name}.json"
+            paths = (str(relative), ast_file, str(ast_file.relative_to(Path(__file__).parent)))
+            self._paths_cache[key] = paths
+        return paths
+
+    def load_deps_cache(self):
+        """Load deps_cache.json ({} if missing or unreadable)"""
+        try:
+            return read_json(self.deps_cache_file)
+        except (OSError, ValueError):
+            return {}
 
     def get_ast_file_path(self, php_file_path):
         """Get AST JSON file path for PHP file"""
-        relative = php_file_path.relative_to(self.project_root)
-        safe_name = str(relative).replace('/', '_').replace('\\', '_')
-        return self.ast_dir / f"{safe_name}.json"
+        return self.file_paths(php_file_path)[1]
+
+    def get_meta_file_path(self, php_file_path):
+        """Get metadata JSON file path for PHP file (file info and dependencies, no AST)"""
+        relative = self.file_paths(php_file_path)[0]
+        safe_name = relative.replace('/', '_').replace('\\', '_')
+        return self.ast_dir / f"{safe_name}.meta.json"
 
     def ast_exists(self, php_file_path):
         """Check if AST file already exists"""
         return self.get_ast_file_path(php_file_path).exists()
 
-    def node_to_dict(self, node):
-        """Convert tree-sitter node to dictionary"""
+    def find_saved_file(self, php_file_path):
+        """Find previously saved file with dependencies - AST file, or metadata file when AST is not persisted"""
+        ast_file = self.get_ast_file_path(php_file_path)
+        if ast_file.exists():
+            return ast_file
+        if not self.persist_ast:
+            meta_file = self.get_meta_file_path(php_file_path)
+            if meta_file.exists():
+                return meta_file
+        return None
+
+    def node_to_dict(self, node, source_text=None):
+        """Convert tree-sitter node to dictionary
+
+        source_text: whole file decoded once, only for pure ASCII source - byte offsets
+        are then character offsets, so node text is a str slice instead of bytes copy + decode
+        """
+        start_byte = node.start_byte
+        end_byte = node.end_byte
+        if source_text is not None:
+            text = source_text[start_byte:end_byte] or None
+        else:
+            text = node.text.decode('utf-8') if node.text else None
+
         result = {
-            'type': node.type,
+            'type': intern(node.type),
             'start_point': {'row': node.start_point[0], 'column': node.start_point[1]},
             'end_point': {'row': node.end_point[0], 'column': node.end_point[1]},
-            'start_byte': node.start_byte,
-            'end_byte': node.end_byte,
-            'text': node.text.decode('utf-8') if node.text else None,
+            'start_byte': start_byte,
+            'end_byte': end_byte,
+            'text': text,
         }
 
         if node.child_count > 0:
-            result['children'] = [self.node_to_dict(child) for child in node.children]
+            result['children'] = [self.node_to_dict(child, source_text) for child in node.children]
 
         return result
 
+    def write_node_json(self, write, node, source_text, pad):
+        """
+        Write node_to_dict(node) as JSON piece by piece - same text as write_json(indent=2)
+
+        pad: indentation of the node's opening line; children are written recursively,
+        so no dict for the tree is ever built
+        """
+        start_byte = node.start_byte
+        end_byte = node.end_byte
+        if source_text is not None:
+            text = source_text[start_byte:end_byte] or None
+        else:
+            text = node.text.decode('utf-8') if node.text else None
+
+        node_type = node.type
+        type_json = _TYPE_JSON.get(node_type)
+        if type_json is None:
+            type_json = _TYPE_JSON[node_type] = encode_basestring(node_type)
+
+        inner = pad + '  '
+        point = inner + '  '
+        start_row, start_column = node.start_point
+        end_row, end_column = node.end_point
+
+        write(
+            f'{{\n{inner}"type": {type_json},'
+            f'\n{inner}"start_point": {{\n{point}"row": {start_row},\n{point}"column": {start_column}\n{inner}}},'
+            f'\n{inner}"end_point": {{\n{point}"row": {end_row},\n{point}"column": {end_column}\n{inner}}},'
+            f'\n{inner}"start_byte": {start_byte},\n{inner}"end_byte": {end_byte},'
+            f'\n{inner}"text": {"null" if text is None else encode_basestring(text)}'
+        )
+
+        if node.child_count > 0:
+            write(f',\n{inner}"children": [\n{point}')
+            separator = f',\n{point}'
+            for i, child in enumerate(node.children):
+                if i:
+                    write(separator)
+                self.write_node_json(write, child, source_text, point)
+            write(f'\n{inner}]')
+
+        write(f'\n{pad}}}')
+
+    def write_ast_json(self, path, ast_data, source_text):
+        """
+        Save ast_data like write_json, but its 'ast' value is the live tree-sitter root node,
+        streamed with write_node_json - the AST dict and its encoded copy never coexist in memory
+        """
+        tmp_path = path.with_name(path.name + '.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                write = f.write
+                separator = '{'
+                for key, value in ast_data.items():
+                    write(f'{separator}\n  {encode_basestring(key)}: ')
+                    separator = ','
+                    if key == 'ast':
+                        self.write_node_json(write, value, source_text, '  ')
+                    else:
+                        write(json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n  '))
+                write('\n}')
+            os.replace(tmp_path, path)
+        except BaseException:
+            # No partial AST file - the skip path would trust it on the next run
+            tmp_path.unlink(missing_ok=True)
+            raise
+
     def get_node_text(self, node):
         """Get text from node"""
         return node.text.decode('utf-8') if node.text else ''
@@ -81,9 +366,14 @@ class DetailedASTParser:
         """Find all children with specific type"""
         return [child for child in node.children if child.type == node_type]
 
+    def find_declaration_list(self, node):
+        """Find class/trait body - 'body' field lookup in C instead of scanning children"""
+        body = node.child_by_field_name('body')
+        return body if body is not None and body.type == 'declaration_list' else None
+
     def extract_class_name(self, class_node):
         """Extract class name from class_declaration node"""
-        name_node = self.find_child_by_type(class_node, 'name')
+        name_node = class_node.child_by_field_name('name')
         return self.get_node_text(name_node) if name_node else None
 
     def extract_parent_class(self, class_node):
@@ -96,10 +386,10 @@ class DetailedASTParser:
         return None
 
     def extract_class_methods(self, class_node):
-        """Extract all methods from class"""
-        methods = {}
+        """Extract all methods from class (ClassTable keyed by method name)"""
+        methods = ClassTable(METHOD_FIELDS)
 
-        declaration_list = self.find_child_by_type(class_node, 'declaration_list')
+        declaration_list = self.find_declaration_list(class_node)
         if not declaration_list:
             return methods
 
@@ -107,13 +397,13 @@ class DetailedASTParser:
             if child.type == 'method_declaration':
                 method_info = self.extract_method_details(child)
                 if method_info:
-                    methods[method_info['name']] = method_info
+                    methods.add(method_info['name'], **method_info)
 
         return methods
 
     def extract_method_details(self, method_node):
         """Extract method name, parameters, return type"""
-        name_node = self.find_child_by_type(method_node, 'name')
+        name_node = method_node.child_by_field_name('name')
         if not name_node:
             return None
 
@@ -121,7 +411,7 @@ class DetailedASTParser:
 
         # Extract parameters
         parameters = []
-        formal_params = self.find_child_by_type(method_node, 'formal_parameters')
+        formal_params = method_node.child_by_field_name('parameters')
         if formal_params:
             for param in formal_params.children:
                 if param.type == 'simple_parameter':
@@ -141,7 +431,9 @@ class DetailedASTParser:
             'line': method_node.start_point[0] + 1,
             'parameters': parameters,
             'visibility': visibility,
-            'text': self.get_node_text(method_node)
+            # Method source is [start_byte:end_byte] of the PHP file (file_path) - not copied into the index
+            'start_byte': method_node.start_byte,
+            'end_byte': method_node.end_byte
         }
 
     def extract_parameter_info(self, param_node):
@@ -163,11 +455,40 @@ class DetailedASTParser:
             }
         return None
 
+    def find_method_node(self, class_node, method_name):
+        """Find method_declaration node by name in class body"""
+        declaration_list = self.find_declaration_list(class_node)
+        if not declaration_list:
+            return None
+
+        for child in declaration_list.children:
+            if child.type == 'method_declaration':
+                name_node = child.child_by_field_name('name')
+                if name_node and self.get_node_text(name_node) == method_name:
+                    return child
+        return None
+
+    def extract_class_traits(self, class_node):
+        """Extract trait names from 'use TraitName;' in class body"""
+        traits = []
+
+        declaration_list = self.find_declaration_list(class_node)
+        if not declaration_list:
+            return traits
+
+        for child in declaration_list.children:
+            if child.type == 'use_declaration':
+                for name_node in child.children:
+                    if name_node.type in ['name', 'qualified_name']:
+                        traits.append(self.get_node_text(name_node))
+
+        return traits
+
     def extract_class_properties(self, class_node):
         """Extract class properties (fillable, casts, etc)"""
         properties = {}
 
-        declaration_list = self.find_child_by_type(class_node, 'declaration_list')
+        declaration_list = self.find_declaration_list(class_node)
         if not declaration_list:
             return properties
 
@@ -220,11 +541,22 @@ class DetailedASTParser:
 
         return values
 
+    def extract_array_keys(self, node):
+        """Extract string keys of all arrays under node (e.g. field names in rules())"""
+        keys = []
+
+        for _, captures in QueryCursor(self.array_key_query).matches(node):
+            key = string_literal_value(self.get_node_text(captures['key'][0]))
+            if key:
+                keys.append(key)
+
+        return keys
+
     def extract_enum_cases(self, enum_node):
         """Extract enum cases"""
         cases = []
 
-        declaration_list = self.find_child_by_type(enum_node, 'declaration_list')
+        declaration_list = self.find_declaration_list(enum_node)
         if not declaration_list:
             return cases
 
@@ -250,8 +582,7 @@ class DetailedASTParser:
 
     def analyze_class_structure(self, class_node, file_path, class_name):
         """Analyze class and add to appropriate index"""
-        relative_path = str(file_path.relative_to(self.project_root))
-        ast_file = str(self.get_ast_file_path(file_path).relative_to(Path(__file__).parent))
+        relative_path, _, ast_file = self.file_paths(file_path)
 
         parent_class = self.extract_parent_class(class_node)
         methods = self.extract_class_methods(class_node)
@@ -266,32 +597,35 @@ class DetailedASTParser:
 
         # Classify by file path or parent class
         if 'Controller' in class_name or '/Controllers/' in relative_path:
-            self.api_index['controllers'][class_name] = {
+            self.api_index['controllers'].add(
+                class_name,
                 **base_info,
-                'methods': methods
-            }
+                methods=methods
+            )
             print(f"      [CONTROLLER] {class_name} with {len(methods)} methods")
 
         elif 'Request' in class_name or '/Requests/' in relative_path:
-            # Extract rules from rules() method
-            rules = []
-            if 'rules' in methods:
-                rules_method_text = methods['rules'].get('text', '')
-                # Simple extraction of array keys (can be improved)
-                rules = re.findall(r"'([^']+)'\s*=>", rules_method_text)
-
-            self.api_index['requests'][class_name] = {
+            # Extract rules (array keys) from rules() method
+            rules_method_node = self.find_method_node(class_node, 'rules')
+            rules = self.extract_array_keys(rules_method_node) if rules_method_node else []
+
+            # rules() AST + traits - lets build_api_structure_v3 skip loading the AST file
+            self.api_index['requests'].add(
+                class_name,
                 **base_info,
-                'methods': methods,
-                'rules': rules
-            }
+                methods=methods,
+                rules=rules,
+                traits=self.extract_class_traits(class_node),
+                rules_ast=self.node_to_dict(rules_method_node) if rules_method_node else None
+            )
             print(f"      [REQUEST] {class_name} with {len(rules)} rules")
 
         elif 'Resource' in class_name or '/Resources/' in relative_path:
-            self.api_index['resources'][class_name] = {
+            self.api_index['resources'].add(
+                class_name,
                 **base_info,
-                'methods': methods
-            }
+                methods=methods
+            )
             print(f"      [RESOURCE] {class_name}")
 
         elif parent_class == 'Model' or '/Models/' in relative_path:
@@ -299,105 +633,122 @@ class DetailedASTParser:
             fillable = properties.get('fillable', {}).get('value', [])
             casts = properties.get('casts', {}).get('value', [])
 
-            self.api_index['models'][class_name] = {
+            self.api_index['models'].add(
+                class_name,
                 **base_info,
-                'properties': properties,
-                'fillable': fillable,
-                'casts': casts,
-                'methods': methods
-            }
+                properties=properties,
+                fillable=fillable,
+                casts=casts,
+                methods=methods
+            )
             print(f"      [MODEL] {class_name} with {len(fillable)} fillable fields")
 
         else:
             # Generic class - skip or add to general index
             pass
 
+    def analyze_enum_structure(self, enum_node, file_path, enum_name):
+        """Analyze enum and add to index"""
+        relative_path, _, ast_file = self.file_paths(file_path)
+        cases = self.extract_enum_cases(enum_node)
+
+        self.api_index['enums'].add(
+            enum_name,
+            file=relative_path,
+            ast_file=ast_file,
+            line=enum_node.start_point[0] + 1,
+            cases=cases
+        )
+        print(f"      [ENUM] {enum_name} with {len(cases)} cases")
+
+    def analyze_trait_structure(self, trait_node, file_path, trait_name):
+        """Analyze trait and add to index"""
+        relative_path, _, ast_file = self.file_paths(file_path)
+        methods = self.extract_class_methods(trait_node)
+
+        self.api_index['traits'].add(
+            trait_name,
+            file=relative_path,
+            ast_file=ast_file,
+            line=trait_node.start_point[0] + 1,
+            methods=methods
+        )
+        print(f"      [TRAIT] {trait_name}")
+
     def analyze_structures(self, root_node, file_path):
         """Analyze all structures in file and add to index"""
-        relative_path = str(file_path.relative_to(self.project_root))
-
-        def traverse(node):
-            # Class declaration
-            if node.type == 'class_declaration':
-                class_name = self.extract_class_name(node)
-                if class_name:
-                    self.analyze_class_structure(node, file_path, class_name)
-
-            # Enum declaration
-            elif node.type == 'enum_declaration':
-                enum_name = self.extract_class_name(node)
-                if enum_name:
-                    cases = self.extract_enum_cases(node)
-                    ast_file = str(self.get_ast_file_path(file_path).relative_to(Path(__file__).parent))
-
-                    self.api_index['enums'][enum_name] = {
-                        'file': relative_path,
-                        'ast_file': ast_file,
-                        'line': node.start_point[0] + 1,
-                        'cases': cases
-                    }
-                    print(f"      [ENUM] {enum_name} with {len(cases)} cases")
-
-            # Trait declaration
-            elif node.type == 'trait_declaration':
-                trait_name = self.extract_class_name(node)
-                if trait_name:
-                    methods = self.extract_class_methods(node)
-                    ast_file = str(self.get_ast_file_path(file_path).relative_to(Path(__file__).parent))
-
-                    self.api_index['traits'][trait_name] = {
-                        'file': relative_path,
-                        'ast_file': ast_file,
-                        'line': node.start_point[0] + 1,
-                        'methods': methods
-                    }
-                    print(f"      [TRAIT] {trait_name}")
-
-            # Recursively traverse children
-            for child in node.children:
-                traverse(child)
+        handlers = self.structure_handlers
 
-        traverse(root_node)
+        for _, captures in QueryCursor(self.structure_query).matches(root_node):
+            node = captures['declaration'][0]
+            name = self.extract_class_name(node)
+            if name:
+                handlers[node.type](node, file_path, name)
 
-    def extract_use_statements(self, node, use_statements=None):
-        """Extract all use statements"""
-        if use_statements is None:
-            use_statements = []
+    def extract_use_statements(self, node, namespaces=None):
+        """Extract namespaces imported by all use statements"""
+        if namespaces is None:
+            namespaces = []
 
         if node.type == 'namespace_use_declaration':
-            text = self.get_node_text(node)
-            use_statements.append(text)
+            namespaces.extend(self.parse_use_declaration(node))
 
-        for child in node.children:
-            self.extract_use_statements(child, use_statements)
+        elif node.type in USE_CONTAINER_TYPES:
+            for child in node.children:
+                self.extract_use_statements(child, namespaces)
 
-        return use_statements
+        return namespaces
 
-    def parse_use_statement(self, use_text):
-        """Parse use statement to extract namespaces"""
-        use_text = use_text.strip()
-        use_text = re.sub(r'^use\s+', '', use_text)
-        use_text = re.sub(r';$', '', use_text)
+    def parse_use_declaration(self, use_node):
+        """Extract namespaces from namespace_use_declaration children (clauses or prefix + group)"""
+        # 'use function ...;' / 'use const ...;' import functions and constants, not classes
+        if use_node.child_by_field_name('type') is not None:
+            return []
+
+        group = use_node.child_by_field_name('body')
+        if group is None:
+            clauses = self.find_children_by_type(use_node, 'namespace_use_clause')
+            if clauses and clauses[0].child_by_field_name('type') is not None:
+                return []
+            names = [self.extract_use_clause_name(clause) for clause in clauses]
+            return [name for name in names if name]
+
+        # Group prefix - everything between 'use' and '{', e.g. 'App\Models\'
+        prefix_start = use_node.children[1].start_byte - use_node.start_byte
+        prefix_end = group.start_byte - use_node.start_byte
+        base = use_node.text[prefix_start:prefix_end].decode('utf-8').strip().rstrip('\\')
 
         namespaces = []
-
-        if '{' in use_text and '}' in use_text:
-            match = re.match(r'(.+?)\{(.+?)\}', use_text)
-            if match:
-                base = match.group(1).strip().rstrip('\\')
-                items = match.group(2).split(',')
-                for item in items:
-                    item = item.strip()
-                    item = re.sub(r'\s+as\s+.*$', '', item)
-                    namespaces.append(f"{base}\\{item}")
-        else:
-            use_text = re.sub(r'\s+as\s+.*$', '', use_text)
-            namespaces.append(use_text.strip())
-
+        for clause in self.find_children_by_type(group, 'namespace_use_clause'):
+            if clause.child_by_field_name('type') is not None:
+                continue
+            name = self.extract_use_clause_name(clause)
+            if name:
+                namespaces.append(f"{base}\\{name}")
         return namespaces
 
+    def extract_use_clause_name(self, clause_node):
+        """Imported name of namespace_use_clause without alias"""
+        for child in clause_node.children:
+            if child.type in ('name', 'qualified_name'):
+                return self.get_node_text(child)
+        return None
+
     def namespace_to_file(self, namespace):
-        """Convert namespace to file path"""
+        """Convert namespace to file path (None if file doesn't exist)
+
+        Memoized per namespace - the same classes are imported by many files,
+        so each candidate path is stat'ed once per run
+        """
+        if namespace in self._namespace_files:
+            return self._namespace_files[namespace]
+
+        full_path = self.resolve_namespace_file(namespace)
+        self._namespace_files[namespace] = full_path
+        return full_path
+
+    def resolve_namespace_file(self, namespace):
+        """Map namespace to file path under project root (PSR-4 style) - single existence check"""
         namespace = namespace.lstrip('\\')
         path = namespace.replace('\\', '/')
 
@@ -419,31 +770,36 @@ class DetailedASTParser:
     def parse_and_save_file(self, file_path):
         """Parse PHP file and save AST"""
         file_path = Path(file_path)
-        relative_path = str(file_path.relative_to(self.project_root))
+        relative_path = self.file_paths(file_path)[0]
 
         if str(file_path) in self.processed_files:
             return
 
-        if self.ast_exists(file_path):
+        ast_file = self.find_saved_file(file_path)
+        if ast_file is not None:
             print(f"[SKIP] AST exists: {relative_path}")
             self.processed_files.add(str(file_path))
 
-            # Load and process dependencies
-            ast_file = self.get_ast_file_path(file_path)
-            with open(ast_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Dependencies from deps_cache.json if the PHP file is unchanged, else from saved file
+            mtime = os.stat(file_path).st_mtime_ns
+            cached = self.deps_cache.get(relative_path)
+            if cached is not None and cached.get('mtime') == mtime:
+                dependencies = cached['dependencies']
+            else:
+                data = read_json(ast_file)
                 dependencies = data.get('dependencies', [])
+            self.deps_updates[relative_path] = {'mtime': mtime, 'dependencies': dependencies}
 
-                self.dependency_tree[relative_path] = {
-                    'dependencies': dependencies,
-                    'ast_file': str(ast_file.relative_to(Path(__file__).parent))
-                }
+            self.dependency_tree[relative_path] = {
+                'dependencies': dependencies,
+                'ast_file': str(ast_file.relative_to(Path(__file__).parent))
+            }
 
-                for namespace in dependencies:
-                    dep_file = self.namespace_to_file(namespace)
-                    if dep_file and dep_file.exists():
-                        if str(dep_file) not in self.processed_files:
-                            self.files_to_process.append(dep_file)
+            for namespace in dependencies:
+                dep_file = self.namespace_to_file(namespace)
+                if dep_file:
+                    if str(dep_file) not in self.processed_files:
+                        self.files_to_process.append(dep_file)
             return
 
         print(f"[PARSE] {relative_path}")
@@ -451,34 +807,38 @@ class DetailedASTParser:
         try:
             with open(file_path, 'rb') as f:
                 source_code = f.read()
+                mtime = os.fstat(f.fileno()).st_mtime_ns
 
             tree = self.parser.parse(source_code)
             root_node = tree.root_node
 
             # Extract use statements
-            use_statements = self.extract_use_statements(root_node)
-            dependencies = []
-            for use_text in use_statements:
-                namespaces = self.parse_use_statement(use_text)
-                dependencies.extend(namespaces)
+            dependencies = self.extract_use_statements(root_node)
 
             # Analyze structures for API index
             print(f"    Analyzing structures...")
             self.analyze_structures(root_node, file_path)
 
-            # Build and save AST
+            # Build and save AST (or only metadata without AST).
+            # Source is not copied - readers open file_path when they need it
             ast_data = {
                 'file_path': str(file_path),
                 'relative_path': relative_path,
-                'file_size': len(source_code),
-                'ast': self.node_to_dict(root_node),
-                'source_code': source_code.decode('utf-8', errors='replace'),
-                'dependencies': dependencies
+                'file_size': len(source_code)
             }
-
-            ast_file = self.get_ast_file_path(file_path)
-            with open(ast_file, 'w', encoding='utf-8') as f:
-                json.dump(ast_data, f, indent=2, ensure_ascii=False)
+            if self.persist_ast:
+                # Written node by node from the tree - see write_ast_json
+                ast_data['ast'] = root_node
+                ast_file = self.get_ast_file_path(file_path)
+            else:
+                ast_file = self.get_meta_file_path(file_path)
+            ast_data['dependencies'] = dependencies
+
+            if self.persist_ast:
+                source_text = source_code.decode('ascii') if source_code.isascii() else None
+                self.write_ast_json(ast_file, ast_data, source_text)
+            else:
+                write_json(ast_file, ast_data)
 
             print(f"    -> Saved: {ast_file.name} ({len(source_code)} bytes)")
             print(f"    -> Dependencies: {len(dependencies)}")
@@ -489,12 +849,14 @@ class DetailedASTParser:
                 'ast_file': str(ast_file.relative_to(Path(__file__).parent))
             }
 
+            self.deps_updates[relative_path] = {'mtime': mtime, 'dependencies': dependencies}
+
             self.processed_files.add(str(file_path))
 
             # Add dependencies to queue
             for namespace in dependencies:
                 dep_file = self.namespace_to_file(namespace)
-                if dep_file and dep_file.exists():
+                if dep_file:
                     if str(dep_file) not in self.processed_files:
                         self.files_to_process.append(dep_file)
 
@@ -508,8 +870,68 @@ class DetailedASTParser:
         except Exception as e:
             print(f"    [ERROR] {e}")
 
-    def process_routes(self):
-        """Process routes file and all dependencies"""
+    def parse_isolated(self, file_path):
+        """
+        Run parse_and_save_file with empty state (in a worker process)
+
+        Returns everything it produced - printed output, api_index rows, dependency tree entry,
+        deps cache entry, queued dependencies and whether the file counts as processed - for merge_parsed.
+        """
+        self.api_index = empty_api_index()
+        self.dependency_tree = {}
+        self.deps_updates = {}
+        self.files_to_process = deque()
+        self.processed_files = set()
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.parse_and_save_file(file_path)
+
+        return (output.getvalue(), self.api_index, self.dependency_tree, self.deps_updates,
+                list(self.files_to_process), bool(self.processed_files))
+
+    def merge_parsed(self, file_path, result):
+        """Apply parse_isolated result as if parse_and_save_file ran here"""
+        output, api_index, dependency_tree, deps_updates, dependencies, processed = result
+
+        sys.stdout.write(output)
+        for category, table in api_index.items():
+            self.api_index[category].merge(table)
+        self.dependency_tree.update(dependency_tree)
+        self.deps_updates.update(deps_updates)
+
+        if processed:
+            self.processed_files.add(str(file_path))
+
+        for dep_file in dependencies:
+            if str(dep_file) not in self.processed_files:
+                self.files_to_process.append(dep_file)
+
+    def process_wave(self, executor):
+        """
+        Parse whole queue in worker processes, then merge results in queue order
+
+        Dependencies found while merging go to the queue for the next wave, so files are
+        merged in the same BFS order as serial processing and the output is identical.
+        """
+        wave = list(self.files_to_process)
+        self.files_to_process.clear()
+
+        pending = {}
+        for file_path in wave:
+            key = str(file_path)
+            if key not in self.processed_files and key not in pending:
+                pending[key] = file_path
+
+        results = dict(zip(pending, executor.map(_parse_in_worker, pending.values())))
+
+        for file_path in wave:
+            if str(file_path) in self.processed_files:
+                continue
+            self.merge_parsed(file_path, results[str(file_path)])
+
+    def process_routes(self, executor=None):
+        """Process routes file and all dependencies (executor - parse files in worker processes)"""
         print("=" * 80)
         print("PHP Routes AST Parser v2 - Detailed API Index")
         print("=" * 80)
@@ -526,7 +948,10 @@ class DetailedASTParser:
         self.files_to_process.append(self.routes_file)
 
         while self.files_to_process:
-            file_path = self.files_to_process.pop(0)
+            if executor is not None:
+                self.process_wave(executor)
+                continue
+            file_path = self.files_to_process.popleft()
             self.parse_and_save_file(file_path)
 
         print()
@@ -540,8 +965,10 @@ class DetailedASTParser:
         tree_file = Path(__file__).parent / 'dependency_tree.json'
         print(f"\nSaving dependency tree: {tree_file.name}")
 
-        with open(tree_file, 'w', encoding='utf-8') as f:
-            json.dump(self.dependency_tree, f, indent=2, ensure_ascii=False)
+        write_json(tree_file, self.dependency_tree)
+
+        # Entries of files not visited this run stay - they are still checked by mtime
+        write_json(self.deps_cache_file, {**self.deps_cache, **self.deps_updates})
 
         print(f"  -> {len(self.dependency_tree)} files in tree")
 
@@ -562,11 +989,10 @@ class DetailedASTParser:
 
         index_data = {
             'statistics': stats,
-            'index': self.api_index
+            'index': {category: table.to_dict() for category, table in self.api_index.items()}
         }
 
-        with open(index_file, 'w', encoding='utf-8') as f:
-            json.dump(index_data, f, indent=2, ensure_ascii=False)
+        write_json(index_file, index_data)
 
         print(f"  -> Controllers: {stats['controllers']}")
         print(f"  -> Requests: {stats['requests']}")
@@ -577,22 +1003,31 @@ class DetailedASTParser:
 
 
 def main():
-    import sys
-
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
 
-    if len(sys.argv) < 2:
-        print("Usage: python parse_routes_v2.py <routes_file>")
+    flags = {a for a in sys.argv[1:] if a.startswith('--')}
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+
+    if len(args) < 1:
+        print("Usage: python parse_routes_v2.py <routes_file> [--no-ast] [--parallel]")
         print("Example: python parse_routes_v2.py routes/api.php")
         sys.exit(1)
 
-    routes_file = Path(sys.argv[1])
+    routes_file = Path(args[0])
     if not routes_file.is_absolute():
         routes_file = project_root / routes_file
 
-    parser = DetailedASTParser(project_root, routes_file)
-    parser.process_routes()
+    persist_ast = '--no-ast' not in flags
+    parser = DetailedASTParser(project_root, routes_file, persist_ast=persist_ast)
+
+    if '--parallel' in flags:
+        # Files of one BFS level are parsed in worker processes, merged in serial order
+        with ProcessPoolExecutor(initializer=_init_worker,
+                                 initargs=(project_root, routes_file, persist_ast)) as executor:
+            parser.process_routes(executor)
+    else:
+        parser.process_routes()
     parser.save_dependency_tree()
     parser.save_api_index()
 
@@ -0,0 +1,76 @@
+"""dump_ast_v2 regressions: AST deeper than orjson's nesting limit, --api-only use resolution"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import dump_ast_v2
+
+
+def write_deep_php(path, terms=150):
+    """PHP file with one long '.' concatenation - each term nests the AST one level deeper"""
+    path.write_text("<?php\n$x = " + " . ".join("'a'" for _ in range(terms)) + ";\n")
+    return path
+
+
+def test_dump_json_bytes_deep_expression(tmp_path):
+    file_data = dump_ast_v2.process_file(write_deep_php(tmp_path / 'Deep.php'))
+
+    for indent in (True, False):
+        assert json.loads(dump_ast_v2.dump_json_bytes(file_data, indent=indent)) == file_data
+
+
+def test_main_deep_expression(tmp_path, monkeypatch):
+    project = tmp_path / 'project'
+    (project / 'app').mkdir(parents=True)
+    write_deep_php(project / 'app' / 'Deep.php')
+    (project / 'app' / 'Ok.php').write_text("<?php\nclass Ok {}\n")
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, 'argv', ['dump_ast_v2.py', str(project)])
+    dump_ast_v2.main()
+
+    data = json.loads((tmp_path / 'ast_full.json').read_bytes())
+    assert sorted(Path(f['file']).name for f in data['files']) == ['Deep.php', 'Ok.php']
+
+
+def test_use_app_names_alias_and_group():
+    code = b"""<?php
+use App\\Models\\User;
+use App\\Models\\Post as BlogPost;
+use \\App\\Http\\Resources\\{UserResource, PostResource as PR,
+    Sub\\Item};
+use App\\Enums\\A, Illuminate\\Support\\Str, App\\Enums\\B;
+use function App\\Helpers\\format;
+class X {
+    use App\\Traits\\Ignored;
+}
+"""
+    assert dump_ast_v2.use_app_names(code) == [
+        'Models\\User', 'Models\\Post',
+        'Http\\Resources\\UserResource', 'Http\\Resources\\PostResource', 'Http\\Resources\\Sub\\Item',
+        'Enums\\A', 'Enums\\B',
+    ]
+
+
+def test_select_api_files_follows_aliased_and_grouped_use(tmp_path):
+    app = tmp_path / 'app'
+    for rel, source in {
+        'Http/Controllers/UserController.php': "<?php\nuse App\\Models\\User as U;\nuse App\\Http\\Resources\\{UserResource};\n",
+        'Http/Resources/UserResource.php': "<?php\nuse App\\Enums\\{Role, Status as S};\n",
+        'Models/User.php': "<?php\n",
+        'Enums/Role.php': "<?php\n",
+        'Enums/Status.php': "<?php\n",
+        'Models/Unused.php': "<?php\n",
+    }.items():
+        (app / rel).parent.mkdir(parents=True, exist_ok=True)
+        (app / rel).write_text(source)
+
+    php_files = sorted(app.rglob('*.php'))
+    selected = dump_ast_v2.select_api_files(app, php_files)
+    assert sorted(p.relative_to(app).as_posix() for p in selected) == [
+        'Enums/Role.php', 'Enums/Status.php',
+        'Http/Controllers/UserController.php', 'Http/Resources/UserResource.php', 'Models/User.php',
+    ]
@@ -0,0 +1,32 @@
+"""Regression: GET route handlers are read only from a literal [Controller::class, 'method'] array"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import dump_ast_v2
+import linker_get
+
+
+def get_routes(tmp_path, source):
+    """GET routes (path, controller, action) of a routes/api.php with the given source"""
+    path = tmp_path / 'routes' / 'api.php'
+    path.parent.mkdir()
+    path.write_text(source)
+    file_data = dump_ast_v2.process_file(path)
+    return [(r.path, r.controller, r.action) for r in linker_get.routes_in_file(file_data)]
+
+
+def test_array_handler(tmp_path):
+    routes = get_routes(tmp_path, "<?php\nRoute::get('/x', [UserController::class, 'index']);\n")
+    assert routes == [('/x', 'UserController', 'index')]
+
+
+def test_nested_handlers_are_skipped(tmp_path):
+    routes = get_routes(tmp_path, """<?php
+Route::get('/cond', cond() ? [A::class, 'x'] : [B::class, 'y']);
+Route::get('/wrap', wrap('z', [A::class, 'x']));
+Route::get('/closure', function () { return [A::class, 'x']; });
+""")
+    assert routes == []
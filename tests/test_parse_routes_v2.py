@@ -0,0 +1,45 @@
+"""parse_routes_v2 regressions: write_json past orjson's nesting limit, PHP string literal keys"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import parse_routes_v2
+
+
+def nested(depth):
+    """rules_ast-like dict nested depth levels deep"""
+    node = {'type': 'string', 'text': "'a'"}
+    for _ in range(depth):
+        node = {'type': 'binary_expression', 'children': [node]}
+    return node
+
+
+def test_write_json_deep_nesting(tmp_path):
+    data = {'index': {'requests': {'R': {'rules_ast': nested(200)}}}}
+    path = tmp_path / 'api_index.json'
+
+    parse_routes_v2.write_json(path, data)
+
+    assert json.loads(path.read_bytes()) == data
+    assert path.read_text(encoding='utf-8') == json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def test_write_json_failure_leaves_no_file(tmp_path):
+    path = tmp_path / 'api_index.json'
+
+    with pytest.raises((TypeError, ValueError)):
+        parse_routes_v2.write_json(path, {'bad': object()})
+
+    assert not path.exists()
+
+
+def test_string_literal_value_unescapes_single_quoted():
+    assert parse_routes_v2.string_literal_value(r"'it\'s'") == "it's"
+    assert parse_routes_v2.string_literal_value(r"'a\\b'") == 'a\\b'
+    assert parse_routes_v2.string_literal_value(r"'a\nb'") == r'a\nb'
+    assert parse_routes_v2.string_literal_value('"name"') == 'name'